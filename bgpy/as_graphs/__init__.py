@@ -2,22 +2,38 @@ from .base import (
     AS,
     ASGraph,
     ASGraphCollector,
+    ASGraphCones,
+    ASGraphCSR,
     ASGraphInfo,
+    ASGraphInfoDiff,
     CustomerProviderLink,
     Link,
     PeerLink,
 )
 from .caida_as_graph import CAIDAASGraph, CAIDAASGraphCollector, CAIDAASGraphConstructor
+from .synthetic_as_graph import (
+    SyntheticASGraph,
+    SyntheticASGraphCollector,
+    SyntheticASGraphConstructor,
+    SyntheticTopology,
+)
 
 __all__ = [
     "ASGraph",
     "AS",
     "ASGraphCollector",
+    "ASGraphCones",
+    "ASGraphCSR",
     "ASGraphInfo",
+    "ASGraphInfoDiff",
     "CustomerProviderLink",
     "Link",
     "PeerLink",
     "CAIDAASGraphCollector",
     "CAIDAASGraphConstructor",
     "CAIDAASGraph",
+    "SyntheticASGraphCollector",
+    "SyntheticASGraphConstructor",
+    "SyntheticASGraph",
+    "SyntheticTopology",
 ]
@@ -1,15 +1,19 @@
-from .as_graph import AS, ASGraph
+from .as_graph import AS, ASGraph, ASGraphCones, ASGraphCSR
 from .as_graph_collector import ASGraphCollector
 from .as_graph_constructor import ASGraphConstructor
 from .as_graph_info import ASGraphInfo
+from .as_graph_info_diff import ASGraphInfoDiff
 from .links import CustomerProviderLink, Link, PeerLink
 
 __all__ = [
     "ASGraph",
     "AS",
+    "ASGraphCones",
+    "ASGraphCSR",
     "ASGraphCollector",
     "ASGraphConstructor",
     "ASGraphInfo",
+    "ASGraphInfoDiff",
     "CustomerProviderLink",
     "Link",
     "PeerLink",
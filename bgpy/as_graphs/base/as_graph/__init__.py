@@ -1,4 +1,6 @@
 from .as_graph import ASGraph
+from .as_graph_cones import ASGraphCones
+from .as_graph_csr import ASGraphCSR
 from .base_as import AS
 
-__all__ = ["AS", "ASGraph"]
+__all__ = ["AS", "ASGraph", "ASGraphCones", "ASGraphCSR"]
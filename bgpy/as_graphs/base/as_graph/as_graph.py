@@ -8,14 +8,11 @@ import bgpy
 from bgpy.as_graphs.base.as_graph_info import ASGraphInfo
 from bgpy.shared.enums import ASGroups, Relationships
 
+from .as_graph_cones import ASGraphCones
+from .as_graph_csr import ASGraphCSR
 from .base_as import AS
-from .cone_funcs import (
-    _get_and_store_customer_cone_and_set_size,
-    _get_and_store_provider_cone_and_set_size,
-    _get_as_rank,
-    _get_cone_helper,
-    _get_size_of_and_store_cone,
-)
+from .cone_funcs import _get_as_rank, _set_cones
+from .csr_funcs import _get_csr_arrays, _set_csr
 
 # can't import into class due to mypy issue
 # https://github.com/python/mypy/issues/7045
@@ -24,14 +21,29 @@ from .graph_building_funcs import (
     _add_relationships,
     _gen_graph,
     _make_relationships_tuples,
+    _set_relationships,
+)
+from .graph_update_funcs import (
+    _get_updated_propagation_ranks,
+    _get_updated_relationships,
+    _update_as_groups,
+    _update_propagation_ranks,
+    update,
+)
+from .hidden_as_funcs import _hide_ases
+from .leaf_compression_funcs import (
+    compress_leaves,
+    get_leaf_equivalence_classes,
+    uncompress_leaves,
 )
 
 # propagation rank building funcs
 from .propagation_rank_funcs import (
     _assign_propagation_ranks,
-    _assign_ranks_helper,
+    _get_customer_provider_cycle,
     _get_propagation_ranks,
 )
+from .stub_folding_funcs import fold_stubs, unfold_stubs
 
 
 @yaml_info(yaml_tag="ASGraph")
@@ -42,26 +54,40 @@ class ASGraph(YamlAble):
     _gen_graph = _gen_graph
     _add_relationships = _add_relationships
     _make_relationships_tuples = _make_relationships_tuples
+    _set_relationships = _set_relationships
 
     # propagation rank building funcs
     _assign_propagation_ranks = _assign_propagation_ranks
-    _assign_ranks_helper = _assign_ranks_helper
+    _get_customer_provider_cycle = _get_customer_provider_cycle
     _get_propagation_ranks = _get_propagation_ranks
 
     # Cone funcs
-    _get_size_of_and_store_cone = _get_size_of_and_store_cone
-    _get_and_store_customer_cone_and_set_size = (
-        _get_and_store_customer_cone_and_set_size
-    )
-    _get_and_store_provider_cone_and_set_size = (
-        _get_and_store_provider_cone_and_set_size
-    )
-    _get_and_store_provider_cone_and_set_size = (
-        _get_and_store_provider_cone_and_set_size
-    )
-    _get_cone_helper = _get_cone_helper
+    _set_cones = _set_cones
     _get_as_rank = _get_as_rank
 
+    # CSR funcs
+    _set_csr = _set_csr
+    _get_csr_arrays = _get_csr_arrays
+
+    # Graph update funcs
+    update = update
+    _get_updated_relationships = _get_updated_relationships
+    _get_updated_propagation_ranks = _get_updated_propagation_ranks
+    _update_propagation_ranks = _update_propagation_ranks
+    _update_as_groups = _update_as_groups
+
+    # Hidden AS funcs
+    _hide_ases = _hide_ases
+
+    # Stub folding funcs
+    fold_stubs = fold_stubs
+    unfold_stubs = unfold_stubs
+
+    # Leaf compression funcs
+    get_leaf_equivalence_classes = get_leaf_equivalence_classes
+    compress_leaves = compress_leaves
+    uncompress_leaves = uncompress_leaves
+
     def __init_subclass__(cls, *args, **kwargs):
         """This method essentially creates a list of all subclasses
         This is allows us to easily assign yaml tags
@@ -82,6 +108,9 @@ class ASGraph(YamlAble):
         store_provider_cone_asns: bool = False,
         yaml_as_dict: frozendict[int, AS] | None = None,
         yaml_ixp_asns: frozenset[int] = frozenset(),
+        # CSR of the yaml_as_dict, if its ASes already have their indices and
+        # relationships as refs, such as from the binary cache
+        yaml_csr: ASGraphCSR | None = None,
         # Users can pass in any additional AS groups they want to keep track of
         additional_as_group_filters: frozendict[
             str, Callable[["ASGraph"], frozenset[AS]]
@@ -89,9 +118,18 @@ class ASGraph(YamlAble):
     ):
         """Reads in relationship data from a TSV and generate graph"""
 
+        # Used for ASes added by update
+        self.BaseASCls: type[AS] = BaseASCls
+        self.BasePolicyCls: type[bgpy.simulation_engine.Policy] = BasePolicyCls
         if yaml_as_dict is not None:
             # We are coming from YAML, so init from YAML (for testing)
-            self._set_yaml_attrs(yaml_as_dict, yaml_ixp_asns)
+            self._set_yaml_attrs(
+                yaml_as_dict,
+                yaml_ixp_asns,
+                yaml_csr,
+                store_customer_cone_asns,
+                store_provider_cone_asns,
+            )
         else:
             # init as normal, through the as_graph_info
             self._set_non_yaml_attrs(
@@ -105,6 +143,15 @@ class ASGraph(YamlAble):
             )
         # Set the AS and ASN group groups
         self._set_as_groups(additional_as_group_filters)
+        # Stub ASN -> provider ASN for stubs left out of propagation
+        self.folded_stub_provider_asns: dict[int, int] = dict()
+        # Member ASN -> representative ASN for leaves left out of propagation
+        self.compressed_leaf_representative_asns: dict[int, int] = dict()
+        # ASNs of the folded stubs and compressed leaves
+        self._hidden_asns: set[int] = set()
+        # Neighbor ASN -> (peers, customers), for neighbors of hidden ASes
+        self._unhidden_neighbors: dict[int, tuple[tuple[AS, ...], ...]] = dict()
+        self._leaf_equivalence_classes: tuple[tuple[int, ...], ...] | None = None
 
     def __eq__(self, other) -> bool:
         if isinstance(other, ASGraph):
@@ -120,22 +167,62 @@ class ASGraph(YamlAble):
         self,
         yaml_as_dict: frozendict[int, AS],
         yaml_ixp_asns: frozenset[int],
+        yaml_csr: ASGraphCSR | None = None,
+        store_customer_cone_asns: bool = False,
+        store_provider_cone_asns: bool = False,
     ) -> None:
-        """Generates the AS Graph from YAML"""
+        """Generates the AS Graph from YAML
+
+        If yaml_csr is set, the ASes already have their relationships as refs,
+        so the propagation ranks and CSR arrays are taken from it as is
+        """
 
         self.ixp_asns: frozenset[int] = yaml_ixp_asns
         self.as_dict: frozendict[int, AS] = yaml_as_dict
-        # Convert ASNs to refs
+        as_graph_proxy = proxy(self)
         for as_obj in self.as_dict.values():
-            as_obj.as_graph = proxy(self)
-            as_obj.peers = tuple([self.as_dict[asn] for asn in as_obj.peers])
-            as_obj.customers = tuple([self.as_dict[asn] for asn in as_obj.customers])
-            as_obj.providers = tuple([self.as_dict[asn] for asn in as_obj.providers])
+            as_obj.as_graph = as_graph_proxy
+            if yaml_csr is None:
+                # Convert ASNs to refs
+                as_obj.peers = tuple([self.as_dict[asn] for asn in as_obj.peers])
+                as_obj.customers = tuple(
+                    [self.as_dict[asn] for asn in as_obj.customers]
+                )
+                as_obj.providers = tuple(
+                    [self.as_dict[asn] for asn in as_obj.providers]
+                )
+            as_obj.finalize_relationships()
 
         # Used for iteration
         self.ases: tuple[AS, ...] = tuple(self.as_dict.values())
-        self.propagation_ranks: tuple[tuple[AS, ...], ...] = (
-            self._get_propagation_ranks()
+        if yaml_csr is None:
+            self.propagation_ranks: tuple[tuple[AS, ...], ...] = (
+                self._get_propagation_ranks()
+            )
+            # Array-backed view of the topology, indexed by AS.index
+            self._set_csr()
+        else:
+            ases_by_index = [self.as_dict[asn] for asn in yaml_csr.asns]
+            self.propagation_ranks = tuple(
+                [
+                    tuple(ases_by_index[rank_range.start : rank_range.stop])
+                    for rank_range in yaml_csr.propagation_rank_ranges
+                ]
+            )
+            self.csr: ASGraphCSR = yaml_csr
+        # Cone sizes come from the ASes, but cone bitsets must be recomputed
+        self.cones: ASGraphCones = ASGraphCones(
+            csr=self.csr,
+            customer_cones=(
+                tuple(ASGraphCones.get_bitsets(self.csr, Relationships.CUSTOMERS))
+                if store_customer_cone_asns
+                else None
+            ),
+            provider_cones=(
+                tuple(ASGraphCones.get_bitsets(self.csr, Relationships.PROVIDERS))
+                if store_provider_cone_asns
+                else None
+            ),
         )
 
     def _set_non_yaml_attrs(
@@ -165,30 +252,24 @@ class ASGraph(YamlAble):
         # as group filters will be broken then
         self.as_dict = frozendict(self.as_dict)
         # Adds references to all relationships
-        self._add_relationships(as_graph_info)
+        rels = self._add_relationships(as_graph_info)
         # Used for iteration
         self.ases = tuple(self.as_dict.values())
         # Remove duplicates from relationships and sort
-        self._make_relationships_tuples()
+        self._make_relationships_tuples(rels)
         # Assign propagation rank to each AS
         self._assign_propagation_ranks()
         # Get the ranks for the graph
         self.propagation_ranks = self._get_propagation_ranks()
-        # We don't run this every time since it has the runtime greater than the
-        # entire graph generation
-        if any([store_customer_cone_size, store_customer_cone_asns]):
-            # Determine customer cones of all ases
-            self._get_size_of_and_store_cone(
-                rel_attr=Relationships.CUSTOMERS.name.lower(),
-                store_cone_asns=store_customer_cone_asns,
-            )
-            self._get_as_rank()
-
-        if any([store_provider_cone_size, store_provider_cone_asns]):
-            self._get_size_of_and_store_cone(
-                rel_attr=Relationships.PROVIDERS.name.lower(),
-                store_cone_asns=store_provider_cone_asns,
-            )
+        # Array-backed view of the topology, indexed by AS.index
+        self._set_csr()
+        # Cone sizes, AS rank, and cone bitsets (if their ASNs are stored)
+        self._set_cones(
+            store_customer_cone_size,
+            store_customer_cone_asns,
+            store_provider_cone_size,
+            store_provider_cone_asns,
+        )
 
     def _set_as_groups(
         self,
@@ -208,6 +289,16 @@ class ASGraph(YamlAble):
         self.as_group_filters: frozendict[str, Callable[[ASGraph], frozenset[AS]]] = (
             frozendict(as_group_filters)
         )
+        # Groups that only depend on each AS, so update can refilter just the
+        # ASes that changed
+        self._as_group_predicates: frozendict[str, Callable[[AS], bool]] = frozendict(
+            {
+                k: v
+                for k, v in self._default_as_group_predicates.items()
+                if not additional_as_group_filters
+                or k not in additional_as_group_filters
+            }
+        )
 
         # Some helpful sets of ases for faster loops
         as_groups: dict[str, frozenset[AS]] = dict()
@@ -215,7 +306,7 @@ class ASGraph(YamlAble):
 
         for as_group_key, filter_func in self.as_group_filters.items():
             as_groups[as_group_key] = filter_func(self)
-            asn_groups[as_group_key] = frozenset(x.asn for x in filter_func(self))
+            asn_groups[as_group_key] = frozenset(x.asn for x in as_groups[as_group_key])
 
         # Turn these into frozen dicts. They shouldn't be modified
         self.as_groups: frozendict[str, frozenset[AS]] = frozendict(as_groups)
@@ -227,46 +318,61 @@ class ASGraph(YamlAble):
     ) -> frozendict[str, Callable[["ASGraph"], frozenset[AS]]]:
         """Returns the default filter functions for AS groups"""
 
-        def ixp_filter(as_graph: "ASGraph") -> frozenset[AS]:
-            return frozenset(x for x in as_graph if x.ixp)
+        def get_filter(
+            predicate: Callable[[AS], bool],
+        ) -> Callable[["ASGraph"], frozenset[AS]]:
+            def filter_func(as_graph: "ASGraph") -> frozenset[AS]:
+                return frozenset(x for x in as_graph if predicate(x))
 
-        def stub_no_ixp_filter(as_graph: "ASGraph") -> frozenset[AS]:
-            return frozenset(x for x in as_graph if x.stub and not x.ixp)
+            return filter_func
 
-        def multihomed_no_ixp_filter(as_graph: "ASGraph") -> frozenset[AS]:
-            return frozenset(x for x in as_graph if x.multihomed and not x.ixp)
+        return frozendict(
+            {
+                as_group_key: get_filter(predicate)
+                for as_group_key, predicate in self._default_as_group_predicates.items()
+            }
+        )
 
-        def stubs_or_multihomed_no_ixp_filter(as_graph: "ASGraph") -> frozenset[AS]:
-            return frozenset(
-                x for x in as_graph if (x.stub or x.multihomed) and not x.ixp
-            )
+    @property
+    def _default_as_group_predicates(self) -> frozendict[str, Callable[[AS], bool]]:
+        """Returns whether an AS is in each of the default AS groups"""
+
+        def ixp(as_obj: AS) -> bool:
+            return as_obj.ixp
+
+        def stub_no_ixp(as_obj: AS) -> bool:
+            return as_obj.stub and not as_obj.ixp
+
+        def multihomed_no_ixp(as_obj: AS) -> bool:
+            return as_obj.multihomed and not as_obj.ixp
+
+        def stubs_or_multihomed_no_ixp(as_obj: AS) -> bool:
+            return (as_obj.stub or as_obj.multihomed) and not as_obj.ixp
 
-        def input_clique_no_ixp_filter(as_graph: "ASGraph") -> frozenset[AS]:
-            return frozenset(x for x in as_graph if x.input_clique and not x.ixp)
+        def input_clique_no_ixp(as_obj: AS) -> bool:
+            return as_obj.input_clique and not as_obj.ixp
 
-        def etc_no_ixp_filter(as_graph: "ASGraph") -> frozenset[AS]:
-            return frozenset(
-                x
-                for x in as_graph
-                if not (x.stub or x.multihomed or x.input_clique or x.ixp)
+        def etc_no_ixp(as_obj: AS) -> bool:
+            return not (
+                as_obj.stub or as_obj.multihomed or as_obj.input_clique or as_obj.ixp
             )
 
-        def transit_no_ixp_filter(as_graph: "ASGraph") -> frozenset[AS]:
-            return frozenset(x for x in as_graph if x.transit and not x.ixp)
+        def transit_no_ixp(as_obj: AS) -> bool:
+            return as_obj.transit and not as_obj.ixp
 
-        def all_no_ixp_filter(as_graph: "ASGraph") -> frozenset[AS]:
-            return frozenset(list(as_graph))
+        def all_no_ixp(as_obj: AS) -> bool:
+            return True
 
         return frozendict(
             {
-                ASGroups.IXPS.value: ixp_filter,
-                ASGroups.STUBS.value: stub_no_ixp_filter,
-                ASGroups.MULTIHOMED.value: multihomed_no_ixp_filter,
-                ASGroups.STUBS_OR_MH.value: stubs_or_multihomed_no_ixp_filter,
-                ASGroups.INPUT_CLIQUE.value: input_clique_no_ixp_filter,
-                ASGroups.ETC.value: etc_no_ixp_filter,
-                ASGroups.TRANSIT.value: transit_no_ixp_filter,
-                ASGroups.ALL_WOUT_IXPS.value: all_no_ixp_filter,
+                ASGroups.IXPS.value: ixp,
+                ASGroups.STUBS.value: stub_no_ixp,
+                ASGroups.MULTIHOMED.value: multihomed_no_ixp,
+                ASGroups.STUBS_OR_MH.value: stubs_or_multihomed_no_ixp,
+                ASGroups.INPUT_CLIQUE.value: input_clique_no_ixp,
+                ASGroups.ETC.value: etc_no_ixp,
+                ASGroups.TRANSIT.value: transit_no_ixp,
+                ASGroups.ALL_WOUT_IXPS.value: all_no_ixp,
             }
         )
 
@@ -279,7 +385,8 @@ class ASGraph(YamlAble):
 
         return {
             "as_dict": dict(self.as_dict.items()),
-            "ixp_asns": list(self.ixp_asns),
+            # Sorted, so equal graphs dump the same no matter the set order
+            "ixp_asns": sorted(self.ixp_asns),
         }
 
     @classmethod
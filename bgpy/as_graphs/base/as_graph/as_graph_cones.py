@@ -0,0 +1,193 @@
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from bgpy.shared.enums import Relationships
+
+from .as_graph_csr import ASGraphCSR
+
+# Positions of the set bits in each byte value, for decoding bitsets
+_BYTE_BITS: tuple[tuple[int, ...], ...] = tuple(
+    tuple(bit for bit in range(8) if byte >> bit & 1) for byte in range(256)
+)
+
+
+@dataclass(frozen=True, slots=True)
+class ASGraphCones:
+    """Customer and provider cones of every AS, stored as bitsets
+
+    Each cone is a Python int with one bit per AS id (see ASGraphCSR). A
+    customer cone only has ASes with lower ids, and a provider cone only has
+    ASes with higher ids, so provider cones use reversed ids for their bits.
+    That way each int is only as long as the cone's furthest AS, which takes a
+    fraction of the RAM that a frozenset of ASNs per AS would.
+
+    Cones are only stored if the ASGraph's store_*_cone_asns kwargs are set.
+    Otherwise, the cone of a single AS is computed when it's asked for.
+
+    NOTE: stubs have empty customer cones, even if their one neighbor is a
+    customer, which is how customer cone sizes (and thus AS rank) always
+    worked in bgpy
+    """
+
+    csr: ASGraphCSR
+    # Cone bitsets indexed by AS.index, or None if they weren't stored
+    customer_cones: tuple[int, ...] | None = None
+    provider_cones: tuple[int, ...] | None = None
+
+    @staticmethod
+    def get_bitsets(csr: ASGraphCSR, rel: Relationships) -> list[int]:
+        """Returns the cone bitset of every AS, indexed by AS.index
+
+        Every customer has a lower id than its providers, so computing cones in
+        id order means all the cones that are unioned are already computed
+        """
+
+        num_ases = len(csr)
+        bitsets = [0] * num_ases
+        if rel == Relationships.CUSTOMERS:
+            offsets = csr.customer_offsets.tolist()
+            indices = csr.customer_indices.tolist()
+            for i in range(num_ases):
+                if not _is_stub(csr, i):
+                    bitset = 0
+                    for j in indices[offsets[i] : offsets[i + 1]]:
+                        bitset |= bitsets[j] | (1 << j)
+                    bitsets[i] = bitset
+        elif rel == Relationships.PROVIDERS:
+            offsets = csr.provider_offsets.tolist()
+            indices = csr.provider_indices.tolist()
+            for i in reversed(range(num_ases)):
+                bitset = 0
+                for j in indices[offsets[i] : offsets[i + 1]]:
+                    bitset |= bitsets[j] | (1 << (num_ases - 1 - j))
+                bitsets[i] = bitset
+        else:
+            raise NotImplementedError(f"No cones for {rel}")
+        return bitsets
+
+    ###########
+    # Queries #
+    ###########
+
+    def bitset(self, cone_asn: int, rel: Relationships) -> int:
+        """Returns the cone of the AS as a bitset"""
+
+        index = self.csr.asn_to_index[cone_asn]
+        if rel == Relationships.CUSTOMERS and self.customer_cones is not None:
+            return self.customer_cones[index]
+        elif rel == Relationships.PROVIDERS and self.provider_cones is not None:
+            return self.provider_cones[index]
+        else:
+            return self._get_single_bitset(index, rel)
+
+    def contains(self, cone_asn: int, asn: int, rel: Relationships) -> bool:
+        """Returns True if asn is in the cone of cone_asn"""
+
+        return bool(self.bitset(cone_asn, rel) >> self.get_bit(asn, rel) & 1)
+
+    def size(self, cone_asn: int, rel: Relationships) -> int:
+        """Returns the number of ASes in the cone"""
+
+        return self.bitset(cone_asn, rel).bit_count()
+
+    def asns(self, cone_asn: int, rel: Relationships) -> frozenset[int]:
+        """Returns the ASNs in the cone"""
+
+        return self._get_asns(self.bitset(cone_asn, rel), rel)
+
+    def intersection(
+        self, cone_asns: Iterable[int], rel: Relationships
+    ) -> frozenset[int]:
+        """Returns the ASNs that are in the cones of all of the cone_asns"""
+
+        return self._get_asns(self._get_intersection_bitset(cone_asns, rel), rel)
+
+    def intersection_size(self, cone_asns: Iterable[int], rel: Relationships) -> int:
+        """Returns the number of ASes in the cones of all of the cone_asns"""
+
+        return self._get_intersection_bitset(cone_asns, rel).bit_count()
+
+    def get_bit(self, asn: int, rel: Relationships) -> int:
+        """Returns the bit position of the AS within cones of this rel
+
+        Useful to check many ASNs against a single bitset
+        """
+
+        index = self.csr.asn_to_index[asn]
+        if rel == Relationships.PROVIDERS:
+            return len(self.csr) - 1 - index
+        else:
+            return index
+
+    ###########
+    # Helpers #
+    ###########
+
+    def _get_asns(self, bitset: int, rel: Relationships) -> frozenset[int]:
+        """Returns the ASNs of the set bits"""
+
+        asns = self.csr.asns
+        last_index = len(self.csr) - 1
+        reverse = rel == Relationships.PROVIDERS
+        cone_asns = list()
+        data = bitset.to_bytes((bitset.bit_length() + 7) // 8, "little")
+        for byte_index, byte in enumerate(data):
+            if byte:
+                for bit in _BYTE_BITS[byte]:
+                    position = byte_index * 8 + bit
+                    cone_asns.append(
+                        asns[last_index - position if reverse else position]
+                    )
+        return frozenset(cone_asns)
+
+    def _get_intersection_bitset(
+        self, cone_asns: Iterable[int], rel: Relationships
+    ) -> int:
+        """Returns the intersection of the cones as a bitset"""
+
+        bitset: int | None = None
+        for cone_asn in cone_asns:
+            cone = self.bitset(cone_asn, rel)
+            bitset = cone if bitset is None else bitset & cone
+        return bitset or 0
+
+    def _get_single_bitset(self, index: int, rel: Relationships) -> int:
+        """Returns the cone of a single AS by walking the CSR arrays"""
+
+        csr = self.csr
+        if rel == Relationships.CUSTOMERS:
+            if _is_stub(csr, index):
+                return 0
+            offsets, indices = csr.customer_offsets, csr.customer_indices
+        elif rel == Relationships.PROVIDERS:
+            offsets, indices = csr.provider_offsets, csr.provider_indices
+        else:
+            raise NotImplementedError(f"No cones for {rel}")
+
+        num_ases = len(csr)
+        data = bytearray((num_ases + 7) // 8)
+        visited = {index}
+        stack = [index]
+        while stack:
+            i = stack.pop()
+            for j in indices[offsets[i] : offsets[i + 1]]:
+                if j not in visited:
+                    visited.add(j)
+                    stack.append(j)
+                    position = num_ases - 1 - j if rel == Relationships.PROVIDERS else j
+                    data[position >> 3] |= 1 << (position & 7)
+        return int.from_bytes(data, "little")
+
+
+def _is_stub(csr: ASGraphCSR, index: int) -> bool:
+    """Returns True if the AS has one neighbor, like AS.stub"""
+
+    num_neighbors = (
+        csr.peer_offsets[index + 1]
+        - csr.peer_offsets[index]
+        + csr.provider_offsets[index + 1]
+        - csr.provider_offsets[index]
+        + csr.customer_offsets[index + 1]
+        - csr.customer_offsets[index]
+    )
+    return num_neighbors == 1
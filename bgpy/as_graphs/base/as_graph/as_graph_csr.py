@@ -0,0 +1,90 @@
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from bgpy.shared.enums import Relationships
+
+if TYPE_CHECKING:
+    from array import array
+
+
+@dataclass(frozen=True, slots=True)
+class ASGraphCSR:
+    """Compressed sparse row (CSR) view of an ASGraph's topology
+
+    Every AS gets a dense integer id (AS.index). Ids are assigned in
+    propagation rank order (and ASN order within a rank), so each propagation
+    rank is a contiguous range of ids, and customers always have lower ids
+    than their providers.
+
+    Each relationship is stored as two flat arrays. The neighbors of the AS
+    with id i are indices[offsets[i]:offsets[i + 1]], sorted by ASN just like
+    the AS.peers/providers/customers tuples.
+
+    This is stored in addition to those tuples, not instead of them, since
+    policies iterate the tuples and folding stubs, compressing leaves, and
+    graph updates change them. So it adds memory rather than saving it: on a
+    synthetic 80k AS graph, ~55 B per AS for the arrays and ~35 B per AS for
+    asn_to_index, a few percent of the graph (see AS)
+    """
+
+    # index -> ASN
+    asns: "array[int]"
+    asn_to_index: dict[int, int]
+    peer_offsets: "array[int]"
+    peer_indices: "array[int]"
+    provider_offsets: "array[int]"
+    provider_indices: "array[int]"
+    customer_offsets: "array[int]"
+    customer_indices: "array[int]"
+    # Propagation ranks as ranges of ids
+    propagation_rank_ranges: tuple[range, ...]
+
+    def __len__(self) -> int:
+        return len(self.asns)
+
+    def peers(self, index: int) -> "array[int]":
+        """Returns the ids of the peers of the AS with this id"""
+
+        offsets = self.peer_offsets
+        return self.peer_indices[offsets[index] : offsets[index + 1]]
+
+    def providers(self, index: int) -> "array[int]":
+        """Returns the ids of the providers of the AS with this id"""
+
+        offsets = self.provider_offsets
+        return self.provider_indices[offsets[index] : offsets[index + 1]]
+
+    def customers(self, index: int) -> "array[int]":
+        """Returns the ids of the customers of the AS with this id"""
+
+        offsets = self.customer_offsets
+        return self.customer_indices[offsets[index] : offsets[index + 1]]
+
+    def neighbors(self, index: int, rel: Relationships) -> "array[int]":
+        """Returns the ids of the neighbors of the AS for a relationship"""
+
+        if rel == Relationships.PEERS:
+            return self.peers(index)
+        elif rel == Relationships.PROVIDERS:
+            return self.providers(index)
+        elif rel == Relationships.CUSTOMERS:
+            return self.customers(index)
+        else:
+            raise NotImplementedError(f"No CSR arrays for {rel}")
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the arrays in bytes (not including asn_to_index)"""
+
+        return sum(
+            x.itemsize * len(x)
+            for x in (
+                self.asns,
+                self.peer_offsets,
+                self.peer_indices,
+                self.provider_offsets,
+                self.provider_indices,
+                self.customer_offsets,
+                self.customer_indices,
+            )
+        )
@@ -1,18 +1,85 @@
-from functools import cached_property
-from typing import TYPE_CHECKING, Any, Optional
+from typing import TYPE_CHECKING, Any, ClassVar, Optional
 from weakref import CallableProxyType, proxy
 
 from yamlable import YamlAble, yaml_info
 
+from bgpy.shared.enums import Relationships
+
 if TYPE_CHECKING:
     from bgpy.simulation_engine import Policy
 
     from .as_graph import ASGraph
+    from .as_graph_cones import ASGraphCones
+
+
+_NO_ASNS: frozenset[int] = frozenset()
 
 
 @yaml_info(yaml_tag="AS")
 class AS(YamlAble):
-    """Autonomous System class. Contains attributes of an AS"""
+    """Autonomous System class. Contains attributes of an AS
+
+    Every worker holds an AS per ASN, so AS objects are kept small. Attributes
+    are slots, and the ones derived from the relationships (stub, multihomed,
+    transit, neighbors, neighbor_asns) are set once when the graph is built
+    (see finalize_relationships), rather than cached in a per-AS dict.
+
+    Memory budget per AS, on a synthetic 80k AS graph (~2500 B in all):
+        AS object (24 slots, plus the __dict__ and weakref pointers):  ~250 B
+        weakref proxy to the AS (shared by all of its neighbors):       ~80 B
+        Relationship tuples and ASN frozensets (shared when empty):   ~830 B
+        neighbors and neighbor_asns (shared with the relationship
+        attrs when the AS has only one kind of neighbor):             ~430 B
+        Entries in the ASGraph's as_dict, ases, and AS groups:        ~810 B
+        CSR arrays and asn_to_index (on top of the tuples above):      ~90 B
+    The AS's Policy isn't included, since it depends on the Policy class
+    """
+
+    # The YamlAble base classes don't have __slots__, so AS objects still have
+    # __dict__ and __weakref__ pointers, but the dict itself is never allocated
+    __slots__ = (
+        "_customer_cone_asns",
+        "_provider_cone_asns",
+        "as_graph",
+        "as_rank",
+        "asn",
+        "customer_asns",
+        "customer_cone_size",
+        "customers",
+        "hashed_asn",
+        "index",
+        "input_clique",
+        "ixp",
+        "multihomed",
+        "neighbor_asns",
+        "neighbors",
+        "peer_asns",
+        "peers",
+        "policy",
+        "propagation_rank",
+        "provider_asns",
+        "provider_cone_size",
+        "providers",
+        "stub",
+        "transit",
+    )
+
+    db_row_keys: ClassVar[tuple[str, ...]] = (
+        "asn",
+        "peers",
+        "customers",
+        "providers",
+        "input_clique",
+        "ixp",
+        "customer_cone_asns",
+        "customer_cone_size",
+        "provider_cone_asns",
+        "provider_cone_size",
+        "as_rank",
+        "propagation_rank",
+        # Don't forget the properties
+        *("stubs", "stub", "multihomed", "transit"),
+    )
 
     def __init__(
         self,
@@ -32,6 +99,7 @@ class AS(YamlAble):
         provider_cone_size: int | None = None,
         as_rank: int | None = None,
         propagation_rank: int | None = None,
+        index: int | None = None,
         policy: Optional["Policy"] = None,
         as_graph: Optional["ASGraph"] = None,
     ) -> None:
@@ -49,13 +117,16 @@ class AS(YamlAble):
         # Read Caida's paper to understand these
         self.input_clique: bool = input_clique
         self.ixp: bool = ixp
-        self.customer_cone_asns: frozenset[int] | None = customer_cone_asns
+        # Cone ASNs are normally read from the ASGraphCones (see properties)
+        self._customer_cone_asns: frozenset[int] | None = customer_cone_asns
         self.customer_cone_size: int | None = customer_cone_size
-        self.provider_cone_asns: frozenset[int] | None = provider_cone_asns
+        self._provider_cone_asns: frozenset[int] | None = provider_cone_asns
         self.provider_cone_size: int | None = provider_cone_size
         self.as_rank: int | None = as_rank
         # Propagation rank. Rank leaves to clique
         self.propagation_rank: int | None = propagation_rank
+        # Dense id of the AS within ASGraph.csr (set by the ASGraph)
+        self.index: int | None = index
 
         # Hash in advance and only once since this gets called a lot
         self.hashed_asn = hash(self.asn)
@@ -71,6 +142,9 @@ class AS(YamlAble):
             # Ignoring this because it gets set properly immediatly
             self.as_graph = None  # type: ignore
 
+        # Set again by the ASGraph once the relationships are final
+        self.finalize_relationships()
+
     def __lt__(self, as_obj: Any) -> bool:
         if isinstance(as_obj, AS):
             return self.asn < as_obj.asn
@@ -109,67 +183,82 @@ class AS(YamlAble):
 
         return {attr: _format(getattr(self, attr)) for attr in self.db_row_keys}
 
-    @cached_property
-    def db_row_keys(self) -> tuple[str, ...]:
-        return (
-            "asn",
-            "peers",
-            "customers",
-            "providers",
-            "input_clique",
-            "ixp",
-            "customer_cone_asns",
-            "customer_cone_size",
-            "provider_cone_asns",
-            "provider_cone_size",
-            "as_rank",
-            "propagation_rank",
-            # Don't forget the properties
-            *("stubs", "stub", "multihomed", "transit"),
-        )
-
     def __str__(self):
         return "\n".join(str(x) for x in self.db_row.items())
 
-    @cached_property
-    def stub(self) -> bool:
-        """Returns True if AS is a stub by RFC1772"""
+    @property
+    def customer_cone_asns(self) -> frozenset[int] | None:
+        """Returns the customer cone ASNs if they were stored"""
 
-        return len(self.neighbors) == 1
+        if self._customer_cone_asns is None:
+            return self._get_stored_cone_asns(Relationships.CUSTOMERS)
+        else:
+            return self._customer_cone_asns
 
-    @cached_property
-    def multihomed(self) -> bool:
-        """Returns True if AS is multihomed by RFC1772"""
+    @customer_cone_asns.setter
+    def customer_cone_asns(self, asns: frozenset[int] | None) -> None:
+        self._customer_cone_asns = asns
 
-        return len(self.customers) == 0 and len(self.peers) + len(self.providers) > 1
+    @property
+    def provider_cone_asns(self) -> frozenset[int] | None:
+        """Returns the provider cone ASNs if they were stored"""
 
-    @cached_property
-    def transit(self) -> bool:
-        """Returns True if AS is a transit AS by RFC1772"""
+        if self._provider_cone_asns is None:
+            return self._get_stored_cone_asns(Relationships.PROVIDERS)
+        else:
+            return self._provider_cone_asns
+
+    @provider_cone_asns.setter
+    def provider_cone_asns(self, asns: frozenset[int] | None) -> None:
+        self._provider_cone_asns = asns
+
+    def _get_stored_cone_asns(self, rel: Relationships) -> frozenset[int] | None:
+        """Returns cone ASNs from the ASGraphCones, or None if not stored"""
+
+        cones: ASGraphCones | None = getattr(self.as_graph, "cones", None)
+        if cones is None:
+            return None
+        elif rel == Relationships.CUSTOMERS and cones.customer_cones is None:
+            return None
+        elif rel == Relationships.PROVIDERS and cones.provider_cones is None:
+            return None
+        else:
+            return cones.asns(self.asn, rel)
+
+    def finalize_relationships(self) -> None:
+        """Sets the attributes derived from the relationships
+
+        Called by the ASGraph once the relationships are final. Hiding ASes
+        from their neighbors (see ASGraph.fold_stubs) doesn't change these
+        """
+
+        # Empty frozensets aren't interned, so share one between all ASes
+        self.peer_asns = self.peer_asns or _NO_ASNS
+        self.provider_asns = self.provider_asns or _NO_ASNS
+        self.customer_asns = self.customer_asns or _NO_ASNS
+
+        # Concatenating with empty tuples returns the same tuple, not a copy
+        self.neighbors: tuple[AS, ...] = self.customers + self.peers + self.providers
+        neighbor_asns = [
+            x for x in (self.customer_asns, self.peer_asns, self.provider_asns) if x
+        ]
+        if len(neighbor_asns) == 1:
+            self.neighbor_asns: frozenset[int] = neighbor_asns[0]
+        else:
+            self.neighbor_asns = _NO_ASNS.union(*neighbor_asns)
 
-        return (
-            len(self.customers) > 0
-            and len(self.customers) + len(self.peers) + len(self.providers) > 1
-        )
+        # By RFC1772
+        num_neighbors = len(self.neighbors)
+        self.stub: bool = num_neighbors == 1
+        self.multihomed: bool = not self.customers and num_neighbors > 1
+        self.transit: bool = bool(self.customers) and num_neighbors > 1
 
-    @cached_property
+    @property
     def stubs(self) -> tuple["AS", ...]:
         """Returns a list of any stubs connected to that AS"""
 
         return tuple([x for x in self.customers if x.stub])
 
-    @cached_property
-    def neighbors(self) -> tuple["AS", ...]:
-        """Returns customers + peers + providers"""
-
-        return self.customers + self.peers + self.providers
-
-    @cached_property
-    def neighbor_asns(self) -> frozenset[int]:
-        """Returns neighboring ASNs (useful for ASRA)"""
-
-        return frozenset([x.asn for x in self.neighbors])
-
     ##############
     # Yaml funcs #
     ##############
@@ -1,75 +1,48 @@
-"""Functions to determine customer cone size"""
+"""Functions to determine customer and provider cones"""
 
 from bgpy.shared.enums import Relationships
 
-from .base_as import AS
+from .as_graph_cones import ASGraphCones
 
 
-def _get_size_of_and_store_cone(
+def _set_cones(
     self,
-    rel_attr: str = Relationships.CUSTOMERS.name.lower(),
-    store_cone_asns: bool = False,
+    store_customer_cone_size: bool = False,
+    store_customer_cone_asns: bool = False,
+    store_provider_cone_size: bool = False,
+    store_provider_cone_asns: bool = False,
 ) -> None:
-    if rel_attr == Relationships.PROVIDERS.name.lower():
-        self._get_and_store_provider_cone_and_set_size(store_cone_asns)
-    elif rel_attr == Relationships.CUSTOMERS.name.lower():
-        self._get_and_store_customer_cone_and_set_size(store_cone_asns)
-
-
-def _get_and_store_customer_cone_and_set_size(self, store_asns: bool = False) -> None:
-    # Recursively assign the customer cone size
-    non_edges: list[AS] = []
-    cone_dict: dict[int, set[int]] = {}
-    for as_obj in self:
-        if as_obj.stub or as_obj.multihomed:
-            as_obj.customer_cone_size = 0
-            cone_dict[as_obj.asn] = set()
-            if store_asns:
-                as_obj.customer_cone_asns = frozenset()
-        else:
-            non_edges.append(as_obj)
-    for as_obj in non_edges:
-        # NOTE: This also updates the cone_dict behind the scenes
-        customer_cone: set[int] = self._get_cone_helper(
-            as_obj, cone_dict, Relationships.CUSTOMERS.name.lower()
-        )
-        as_obj.customer_cone_size = len(customer_cone)
-        if store_asns:
-            as_obj.customer_cone_asns = frozenset(customer_cone)
-
-
-def _get_and_store_provider_cone_and_set_size(self, store_asns: bool = False) -> None:
-    # Recursively assign the provider cone size
-    cone_dict: dict[int, set[int]] = {}
-    for as_obj in self:
-        # NOTE: This also updates the cone_dict behind the scenes
-        provider_cone: set[int] = self._get_cone_helper(
-            as_obj, cone_dict, Relationships.PROVIDERS.name.lower()
-        )
-        as_obj.provider_cone_size = len(provider_cone)
-        if store_asns:
-            as_obj.provider_cone_asns = frozenset(provider_cone)
-
-
-def _get_cone_helper(
-    self,
-    as_obj: AS,
-    cone_dict: dict[int, set[int]],
-    rel_attr: str,
-) -> set[int]:
-    """Recursively determines the cone size of an as"""
-
-    as_asn = as_obj.asn
-    if as_asn in cone_dict:
-        return cone_dict[as_asn]
-    else:
-        cone_dict[as_asn] = set()
-        for neighbor in getattr(as_obj, rel_attr):
-            cone_dict[as_asn].add(neighbor.asn)
-            if neighbor.asn not in cone_dict:
-                self._get_cone_helper(neighbor, cone_dict, rel_attr)
-            cone_dict[as_asn].update(cone_dict[neighbor.asn])
-    return cone_dict[as_asn]
+    """Sets cone sizes (and AS rank) for each AS, and the graph's ASGraphCones
+
+    Cone bitsets are only kept in the ASGraphCones if their ASNs are stored
+    """
+
+    customer_cones: list[int] | None = None
+    if store_customer_cone_size or store_customer_cone_asns:
+        customer_cones = ASGraphCones.get_bitsets(self.csr, Relationships.CUSTOMERS)
+        for as_obj in self:
+            as_obj.customer_cone_size = customer_cones[as_obj.index].bit_count()
+        self._get_as_rank()
+
+    provider_cones: list[int] | None = None
+    if store_provider_cone_size or store_provider_cone_asns:
+        provider_cones = ASGraphCones.get_bitsets(self.csr, Relationships.PROVIDERS)
+        for as_obj in self:
+            as_obj.provider_cone_size = provider_cones[as_obj.index].bit_count()
+
+    self.cones = ASGraphCones(
+        csr=self.csr,
+        customer_cones=(
+            tuple(customer_cones)
+            if customer_cones is not None and store_customer_cone_asns
+            else None
+        ),
+        provider_cones=(
+            tuple(provider_cones)
+            if provider_cones is not None and store_provider_cone_asns
+            else None
+        ),
+    )
 
 
 def _get_as_rank(self) -> None:
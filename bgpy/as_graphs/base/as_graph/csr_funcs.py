@@ -0,0 +1,54 @@
+"""Functions to build the array-backed (CSR) view of the graph"""
+
+from array import array
+
+from .as_graph_csr import ASGraphCSR
+
+
+def _set_csr(self) -> None:
+    """Builds the CSR arrays and assigns each AS its dense index
+
+    Must be called after propagation ranks are set, since indices
+    are assigned in propagation rank order
+    """
+
+    asns = array("q")
+    asn_to_index: dict[int, int] = dict()
+    rank_ranges: list[range] = list()
+    for rank in self.propagation_ranks:
+        start = len(asns)
+        for as_obj in rank:
+            as_obj.index = len(asns)
+            asn_to_index[as_obj.asn] = as_obj.index
+            asns.append(as_obj.asn)
+        rank_ranges.append(range(start, len(asns)))
+
+    ordered_ases = [as_obj for rank in self.propagation_ranks for as_obj in rank]
+    peer_offsets, peer_indices = self._get_csr_arrays(ordered_ases, "peers")
+    provider_offsets, provider_indices = self._get_csr_arrays(ordered_ases, "providers")
+    customer_offsets, customer_indices = self._get_csr_arrays(ordered_ases, "customers")
+
+    self.csr = ASGraphCSR(
+        asns=asns,
+        asn_to_index=asn_to_index,
+        peer_offsets=peer_offsets,
+        peer_indices=peer_indices,
+        provider_offsets=provider_offsets,
+        provider_indices=provider_indices,
+        customer_offsets=customer_offsets,
+        customer_indices=customer_indices,
+        propagation_rank_ranges=tuple(rank_ranges),
+    )
+
+
+def _get_csr_arrays(
+    self, ordered_ases, rel_attr: str
+) -> tuple["array[int]", "array[int]"]:
+    """Returns the offsets and neighbor indices for a relationship"""
+
+    offsets = array("i", [0])
+    indices = array("i")
+    for as_obj in ordered_ases:
+        indices.extend([x.index for x in getattr(as_obj, rel_attr)])
+        offsets.append(len(indices))
+    return offsets, indices
@@ -9,6 +9,10 @@ if TYPE_CHECKING:
     from bgpy.as_graphs import ASGraphInfo
     from bgpy.simulation_engine import Policy
 
+# Relationship attrs of AS, in the order of the relationship sets of ASNs
+_REL_ATTRS = ("peers", "providers", "customers")
+_PEERS, _PROVIDERS, _CUSTOMERS = range(len(_REL_ATTRS))
+
 
 def _gen_graph(
     self,
@@ -27,10 +31,6 @@ def _gen_graph(
         assert as_.policy.as_ == proxy(as_), (
             f"{BaseASCls} not setting policy.as_ correctly"
         )
-        # Monkey patching these in here whilst generating the AS graph
-        as_.peers_setup_set = set()
-        as_.customers_setup_set = set()
-        as_.providers_setup_set = set()
         return as_
 
     # Add all links to the graph
@@ -52,48 +52,48 @@ def _gen_graph(
         self.as_dict[asn].input_clique = True
 
 
-def _add_relationships(self, as_graph_info: "ASGraphInfo") -> None:
-    """Adds relationships to the graph as references
+def _add_relationships(
+    self, as_graph_info: "ASGraphInfo"
+) -> dict[int, tuple[set[int], set[int], set[int]]]:
+    """Returns the peer, provider, and customer ASNs of every AS
 
-    NOTE: we monkey patch peers_setup_set while the AS Graph is being generated
-    for speed
+    These are sets of ASNs rather than ASes, since AS.__hash__ is much slower
+    than int hashing, and are made into tuples by _make_relationships_tuples
     """
 
+    rels: dict[int, tuple[set[int], set[int], set[int]]] = {
+        asn: (set(), set(), set()) for asn in self.as_dict
+    }
     for cp_link in as_graph_info.customer_provider_links:
-        # Extract customer and provider obj
-        customer = self.as_dict[cp_link.customer_asn]
-        provider = self.as_dict[cp_link.provider_asn]
         # Store references
-        customer.providers_setup_set.add(provider)
-        provider.customers_setup_set.add(customer)
+        rels[cp_link.customer_asn][_PROVIDERS].add(cp_link.provider_asn)
+        rels[cp_link.provider_asn][_CUSTOMERS].add(cp_link.customer_asn)
 
     for peer_link in as_graph_info.peer_links:
-        # Extract as objects for peers
-        asn1, asn2 = peer_link.asns
-        p1, p2 = self.as_dict[asn1], self.as_dict[asn2]
         # Add references to peers
-        p1.peers_setup_set.add(p2)
-        p2.peers_setup_set.add(p1)
+        asn1, asn2 = peer_link.asns
+        rels[asn1][_PEERS].add(asn2)
+        rels[asn2][_PEERS].add(asn1)
+    return rels
 
 
-def _make_relationships_tuples(self):
-    """Make relationships tuples
+def _make_relationships_tuples(
+    self, rels: dict[int, tuple[set[int], set[int], set[int]]]
+) -> None:
+    """Make relationships tuples, and set the attributes derived from them"""
 
-    NOTE: we monkey patch peers_setup_set while the AS Graph is being generated
-    for speed
-    """
+    for as_obj in self:
+        self._set_relationships(as_obj, rels[as_obj.asn])
 
-    rel_attrs = ("peers", "providers", "customers")
-    setup_rel_attrs = ("peers_setup_set", "providers_setup_set", "customers_setup_set")
 
-    for as_obj in self:
-        for rel_attr, setup_rel_attr in zip(rel_attrs, setup_rel_attrs, strict=False):
-            # Conver the setup attribute to tuple
-            # Must be sorted or else yaml dumps differently
-            sorted_ases = sorted(getattr(as_obj, setup_rel_attr), key=lambda x: x.asn)
-            setattr(as_obj, rel_attr, tuple([proxy(x) for x in sorted_ases]))
-            asns_attr = rel_attr[:-1] + "_asns"
-            setattr(as_obj, asns_attr, frozenset([x.asn for x in sorted_ases]))
-
-            # Delete the setup attribute
-            delattr(as_obj, setup_rel_attr)
+def _set_relationships(
+    self, as_obj: AS, asn_sets: tuple[set[int], set[int], set[int]]
+) -> None:
+    """Sets the relationship tuples and ASNs, and the attributes derived from them"""
+
+    as_dict = self.as_dict
+    for rel_attr, asns in zip(_REL_ATTRS, asn_sets, strict=True):
+        sorted_asns = sorted(asns)
+        setattr(as_obj, rel_attr, tuple([proxy(as_dict[x]) for x in sorted_asns]))
+        setattr(as_obj, f"{rel_attr[:-1]}_asns", frozenset(sorted_asns))
+    as_obj.finalize_relationships()
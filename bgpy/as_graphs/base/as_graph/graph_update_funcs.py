@@ -0,0 +1,346 @@
+"""Functions to update the graph in place with an ASGraphInfoDiff
+
+Consecutive CAIDA snapshots share almost all of their links, so rather than
+building the graph of each snapshot from scratch, the ASGraph of the last
+one can be updated with the diff (see ASGraphInfo.get_diff).
+
+Only the ASes with links in the diff get new relationship tuples, and only
+ASes whose customers changed (and the providers above them whose ranks
+change in turn) get new propagation ranks. AS groups are only refiltered for
+the ASes that changed. The CSR arrays and cones are still recomputed in one
+pass each, since AS ids are dense in propagation rank order (so they shift
+whenever a rank changes), and the cones of the input clique span nearly
+the whole graph anyway
+"""
+
+from collections.abc import Callable, Iterable
+from heapq import heapify, heappop, heappush
+from typing import TYPE_CHECKING
+
+from frozendict import frozendict
+
+from bgpy.shared.exceptions import CustomerProviderCycleError
+
+from .as_graph_cones import ASGraphCones
+from .base_as import AS
+from .graph_building_funcs import _CUSTOMERS, _PEERS, _PROVIDERS, _REL_ATTRS
+
+if TYPE_CHECKING:
+    from bgpy.as_graphs.base.as_graph_info_diff import ASGraphInfoDiff
+
+
+def update(self, diff: "ASGraphInfoDiff") -> None:
+    """Applies the diff to the graph in place
+
+    Afterwards the graph is the same as one built from the new ASGraphInfo.
+    Raises ValueError if the diff doesn't apply to this graph, and
+    CustomerProviderCycleError if it would add a cycle. Either way the graph
+    is left as it was, since both are checked before anything changes
+
+    Any folded stubs and compressed leaves are restored first (the
+    SimulationEngine folds and compresses them again in its next setup)
+    """
+
+    if not diff:
+        return
+
+    self.unfold_stubs()
+    self.uncompress_leaves()
+
+    new_asns = (self.as_dict.keys() - diff.removed_asns) | diff.added_asns
+    rels = self._get_updated_relationships(diff, new_asns)
+    new_ranks = self._get_updated_propagation_ranks(
+        rels, diff.added_asns, diff.removed_asns
+    )
+
+    ##################################
+    # Nothing is changed before here #
+    ##################################
+
+    store_customer_cone_size = self.ases[0].customer_cone_size is not None
+    store_customer_cone_asns = self.cones.customer_cones is not None
+    store_provider_cone_size = self.ases[0].provider_cone_size is not None
+    store_provider_cone_asns = self.cones.provider_cones is not None
+    # ASes that are still in the graph, whose links changed
+    relinked_asns = rels.keys() - diff.added_asns - diff.removed_asns
+    old_stub_asns = {x for x in relinked_asns if self.as_dict[x].stub}
+    removed_ases = [self.as_dict[asn] for asn in diff.removed_asns]
+
+    # Add and remove ASes
+    as_dict = {
+        asn: as_obj
+        for asn, as_obj in self.as_dict.items()
+        if asn not in diff.removed_asns
+    }
+    for asn in sorted(diff.added_asns):
+        as_dict[asn] = self.BaseASCls(
+            asn=asn, policy=self.BasePolicyCls(), as_graph=self
+        )
+    self.as_dict = frozendict(as_dict)
+    self.ases = tuple(self.as_dict.values())
+
+    # Set the flags and relationships of every AS that changed
+    changed_asns = (
+        rels.keys()
+        | diff.added_ixp_asns
+        | diff.removed_ixp_asns
+        | diff.added_input_clique_asns
+        | diff.removed_input_clique_asns
+    ) - diff.removed_asns
+    for asn in (diff.added_ixp_asns | diff.removed_ixp_asns) - diff.removed_asns:
+        self.as_dict[asn].ixp = asn in diff.added_ixp_asns
+    for asn in (
+        diff.added_input_clique_asns | diff.removed_input_clique_asns
+    ) - diff.removed_asns:
+        self.as_dict[asn].input_clique = asn in diff.added_input_clique_asns
+    self.ixp_asns = (self.ixp_asns - diff.removed_ixp_asns) | diff.added_ixp_asns
+    for asn, asn_sets in rels.items():
+        if asn not in diff.removed_asns:
+            self._set_relationships(self.as_dict[asn], asn_sets)
+
+    self._update_propagation_ranks(new_ranks, removed_ases)
+    self._set_csr()
+
+    # Cones only depend on customers, providers, and which ASes are stubs
+    cones_changed = (
+        diff.added_asns
+        or diff.removed_asns
+        or diff.added_customer_provider_links
+        or diff.removed_customer_provider_links
+        or old_stub_asns != {x for x in relinked_asns if self.as_dict[x].stub}
+    )
+    if (
+        (cones_changed and (store_customer_cone_size or store_provider_cone_size))
+        or store_customer_cone_asns
+        or store_provider_cone_asns
+    ):
+        self._set_cones(
+            store_customer_cone_size,
+            store_customer_cone_asns,
+            store_provider_cone_size,
+            store_provider_cone_asns,
+        )
+    else:
+        self.cones = ASGraphCones(csr=self.csr)
+
+    self._update_as_groups([self.as_dict[asn] for asn in changed_asns], removed_ases)
+    self._leaf_equivalence_classes = None
+
+
+def _get_updated_relationships(
+    self, diff: "ASGraphInfoDiff", new_asns: frozenset[int]
+) -> dict[int, tuple[set[int], set[int], set[int]]]:
+    """Returns the peer, provider, and customer ASNs of every AS that changed
+
+    Raises ValueError if the diff doesn't apply to this graph
+    """
+
+    as_dict = self.as_dict
+    if diff.added_asns & as_dict.keys():
+        raise ValueError(f"Added ASes are already in the graph: {diff.added_asns}")
+    elif not diff.removed_asns <= as_dict.keys():
+        raise ValueError(f"Removed ASes aren't in the graph: {diff.removed_asns}")
+    for asns in (diff.added_ixp_asns, diff.added_input_clique_asns):
+        if not asns <= new_asns:
+            raise ValueError(f"ASes aren't in the updated graph: {asns}")
+
+    rels: dict[int, tuple[set[int], set[int], set[int]]] = dict()
+
+    def get_asn_sets(asn: int) -> tuple[set[int], set[int], set[int]]:
+        asn_sets = rels.get(asn)
+        if asn_sets is None:
+            if asn in as_dict:
+                as_obj = as_dict[asn]
+                asn_sets = (
+                    set(as_obj.peer_asns),
+                    set(as_obj.provider_asns),
+                    set(as_obj.customer_asns),
+                )
+            else:
+                asn_sets = (set(), set(), set())
+            rels[asn] = asn_sets
+        return asn_sets
+
+    def update_link(asn: int, neighbor_asn: int, rel: int, add: bool) -> None:
+        asn_sets = get_asn_sets(asn)
+        if add:
+            if neighbor_asn not in new_asns:
+                raise ValueError(f"{neighbor_asn} isn't in the updated graph")
+            elif any(neighbor_asn in x for x in asn_sets):
+                raise ValueError(f"{asn} and {neighbor_asn} are already linked")
+            asn_sets[rel].add(neighbor_asn)
+        elif neighbor_asn in asn_sets[rel]:
+            asn_sets[rel].remove(neighbor_asn)
+        else:
+            raise ValueError(f"{neighbor_asn} isn't in the {_REL_ATTRS[rel]} of {asn}")
+
+    # Remove links before adding them, since a link can change type
+    for add, cp_links, peer_links in (
+        (False, diff.removed_customer_provider_links, diff.removed_peer_links),
+        (True, diff.added_customer_provider_links, diff.added_peer_links),
+    ):
+        for cp_link in cp_links:
+            customer_asn, provider_asn = cp_link.customer_asn, cp_link.provider_asn
+            update_link(customer_asn, provider_asn, _PROVIDERS, add)
+            update_link(provider_asn, customer_asn, _CUSTOMERS, add)
+        for peer_link in peer_links:
+            asn1, asn2 = peer_link.asns
+            update_link(asn1, asn2, _PEERS, add)
+            update_link(asn2, asn1, _PEERS, add)
+
+    for asn in diff.removed_asns:
+        if any(get_asn_sets(asn)):
+            raise ValueError(f"Removed AS {asn} still has links")
+    for asn in diff.added_asns:
+        get_asn_sets(asn)
+    return rels
+
+
+def _get_updated_propagation_ranks(
+    self,
+    rels: dict[int, tuple[set[int], set[int], set[int]]],
+    added_asns: frozenset[int],
+    removed_asns: frozenset[int],
+) -> dict[int, int]:
+    """Returns the new propagation ranks of the ASes that need them
+
+    Starting from the ASes whose customers changed, each AS's rank is
+    recomputed from its customers, and its providers only if it changed.
+    ASes are popped lowest rank first, so most are only recomputed once.
+    Ranks are bounded by the longest customer chain, so a rank that keeps
+    growing past twice the number of ASes means there is a cycle
+    """
+
+    as_dict = self.as_dict
+    # Every rank, so that the ranks of customers can be looked up in bulk
+    ranks: dict[int, int] = {x.asn: x.propagation_rank for x in self}
+    ranks.update(dict.fromkeys(added_asns, 0))
+    changed_asns: set[int] = set(added_asns)
+
+    def get_asns(asn: int, rel: int) -> Iterable[int]:
+        asn_sets = rels.get(asn)
+        if asn_sets is None:
+            asns: frozenset[int] = getattr(as_dict[asn], f"{_REL_ATTRS[rel][:-1]}_asns")
+            return asns
+        else:
+            return asn_sets[rel]
+
+    heap = [
+        (ranks[asn], asn)
+        for asn, (_, _, customer_asns) in rels.items()
+        # Only ASes whose customers changed, or that were just added
+        if asn in added_asns
+        or (asn not in removed_asns and customer_asns != as_dict[asn].customer_asns)
+    ]
+    heapify(heap)
+    max_rank = 2 * (len(as_dict) + len(added_asns))
+    while heap:
+        _, asn = heappop(heap)
+        customer_asns = get_asns(asn, _CUSTOMERS)
+        rank = 1 + max(map(ranks.__getitem__, customer_asns)) if customer_asns else 0
+        if rank != ranks[asn]:
+            if rank > max_rank:
+                cycle = _get_customer_provider_cycle(
+                    asn, lambda x: get_asns(x, _CUSTOMERS)
+                )
+                raise CustomerProviderCycleError(
+                    "Customer provider links form a cycle, so propagation ranks "
+                    f"can't be assigned: {' -> '.join(str(x) for x in cycle)}"
+                )
+            ranks[asn] = rank
+            changed_asns.add(asn)
+            for provider_asn in get_asns(asn, _PROVIDERS):
+                heappush(heap, (rank + 1, provider_asn))
+    return {asn: ranks[asn] for asn in changed_asns}
+
+
+def _get_customer_provider_cycle(
+    asn: int, get_customer_asns: Callable[[int], Iterable[int]]
+) -> list[int]:
+    """Returns a cycle of ASNs below the AS, each a customer of the next
+
+    Like ASGraph._get_customer_provider_cycle, but for the updated links
+    """
+
+    # Depth first search down customers, until an ASN in the path is reached
+    path: list[int] = [asn]
+    path_positions: dict[int, int] = {asn: 0}
+    iterators = [iter(sorted(get_customer_asns(asn)))]
+    done: set[int] = set()
+    while iterators:
+        customer_asn = next(iterators[-1], None)
+        if customer_asn is None:
+            done_asn = path.pop()
+            del path_positions[done_asn]
+            done.add(done_asn)
+            iterators.pop()
+        elif customer_asn in path_positions:
+            cycle = path[path_positions[customer_asn] :][::-1]
+            start = cycle.index(min(cycle))
+            cycle = cycle[start:] + cycle[:start]
+            return [*cycle, cycle[0]]
+        elif customer_asn not in done:
+            path_positions[customer_asn] = len(path)
+            path.append(customer_asn)
+            iterators.append(iter(sorted(get_customer_asns(customer_asn))))
+    raise AssertionError(f"No cycle below {asn}")
+
+
+def _update_propagation_ranks(
+    self, new_ranks: dict[int, int], removed_ases: list[AS]
+) -> None:
+    """Sets the new ranks, and rebuilds only the ranks that ASes left or joined"""
+
+    leaving_asns: set[int] = {x.asn for x in removed_ases}
+    changed_ranks: set[int] = {
+        x.propagation_rank for x in removed_ases if x.propagation_rank is not None
+    }
+    joining: dict[int, list[AS]] = dict()
+    for asn, rank in new_ranks.items():
+        as_obj = self.as_dict[asn]
+        if as_obj.propagation_rank != rank:
+            if as_obj.propagation_rank is not None:
+                leaving_asns.add(asn)
+                changed_ranks.add(as_obj.propagation_rank)
+            as_obj.propagation_rank = rank
+            joining.setdefault(rank, []).append(as_obj)
+            changed_ranks.add(rank)
+
+    ranks = list(self.propagation_ranks)
+    ranks.extend([()] * (max(changed_ranks, default=-1) + 1 - len(ranks)))
+    for rank in changed_ranks:
+        rank_ases = [x for x in ranks[rank] if x.asn not in leaving_asns]
+        ranks[rank] = tuple(sorted(rank_ases + joining.get(rank, [])))
+    # The highest ranks can empty out, but every lower rank has an AS in it
+    while not ranks[-1]:
+        ranks.pop()
+    self.propagation_ranks = tuple(ranks)
+
+
+def _update_as_groups(self, changed_ases: list[AS], removed_ases: list[AS]) -> None:
+    """Refilters the ASes that changed for each AS group
+
+    Groups from the additional_as_group_filters are filtered from scratch,
+    since they can depend on more than the ASes in them
+    """
+
+    # ASes are updated in place, so the changed ASes are in the old groups too
+    stale_ases = frozenset(changed_ases) | frozenset(removed_ases)
+    stale_asns = frozenset(x.asn for x in stale_ases)
+    as_groups: dict[str, frozenset[AS]] = dict()
+    asn_groups: dict[str, frozenset[int]] = dict()
+    for as_group_key, filter_func in self.as_group_filters.items():
+        predicate = self._as_group_predicates.get(as_group_key)
+        if predicate is None:
+            as_groups[as_group_key] = filter_func(self)
+            asn_groups[as_group_key] = frozenset(x.asn for x in as_groups[as_group_key])
+        else:
+            members = [x for x in changed_ases if predicate(x)]
+            as_groups[as_group_key] = (
+                self.as_groups[as_group_key] - stale_ases
+            ) | frozenset(members)
+            asn_groups[as_group_key] = (
+                self.asn_groups[as_group_key] - stale_asns
+            ) | frozenset(x.asn for x in members)
+    self.as_groups = frozendict(as_groups)
+    self.asn_groups = frozendict(asn_groups)
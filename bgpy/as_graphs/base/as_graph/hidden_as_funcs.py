@@ -0,0 +1,43 @@
+"""Function to hide ASes from their neighbors during propagation
+
+Folded stubs and compressed leaves (see stub_folding_funcs and
+leaf_compression_funcs) are left out of propagation by removing them from
+their neighbors' peers and customers. Neither have customers, so no AS ever
+has to be removed from a neighbor's providers
+"""
+
+
+def _hide_ases(self) -> None:
+    """Hides every folded stub and compressed leaf from its neighbors
+
+    Only the neighbors of ASes that were hidden or unhidden since the last
+    call have their peers and customers rebuilt, from the ones they had before
+    anything was hidden. Which ASes are hidden mostly stays the same from one
+    run to the next, so this is much faster than rebuilding all of them
+    """
+
+    hidden_asns = (
+        self.folded_stub_provider_asns.keys()
+        | self.compressed_leaf_representative_asns.keys()
+    )
+    as_dict = self.as_dict
+    neighbor_asns: set[int] = set()
+    for asn in hidden_asns ^ self._hidden_asns:
+        neighbor_asns.update(as_dict[asn].neighbor_asns)
+
+    unhidden_neighbors = self._unhidden_neighbors
+    for neighbor_asn in neighbor_asns:
+        neighbor = as_dict[neighbor_asn]
+        peers, customers = unhidden_neighbors.pop(
+            neighbor_asn, (neighbor.peers, neighbor.customers)
+        )
+        visible_peers = tuple([x for x in peers if x.asn not in hidden_asns])
+        visible_customers = tuple([x for x in customers if x.asn not in hidden_asns])
+        if len(visible_peers) == len(peers) and len(visible_customers) == len(
+            customers
+        ):
+            neighbor.peers, neighbor.customers = peers, customers
+        else:
+            unhidden_neighbors[neighbor_asn] = (peers, customers)
+            neighbor.peers, neighbor.customers = visible_peers, visible_customers
+    self._hidden_asns = hidden_asns
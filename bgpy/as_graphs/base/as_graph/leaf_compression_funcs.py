@@ -0,0 +1,59 @@
+"""Functions to propagate to one AS per class of identical leaf ASes
+
+A leaf (an AS with no customers) that isn't seeded never sends anything,
+since anns from providers and peers only go to customers. So leaves with the
+same providers and peers all receive the same anns. While compressed, every
+member of such a class is removed from its neighbors' customers and peers
+except for one representative, and the members' outcomes are found from the
+representative's local RIB afterwards (see ASGraphAnalyzer)
+"""
+
+from collections.abc import Mapping
+
+
+def get_leaf_equivalence_classes(self) -> tuple[tuple[int, ...], ...]:
+    """Returns the ASNs of leaves with the same providers and peers
+
+    Only classes with more than one leaf are returned. The graph doesn't
+    change, so these are only computed once
+    """
+
+    leaf_equivalence_classes: tuple[tuple[int, ...], ...] | None = (
+        self._leaf_equivalence_classes
+    )
+    if leaf_equivalence_classes is None:
+        classes: dict[tuple[frozenset[int], frozenset[int]], list[int]] = dict()
+        for as_obj in self:
+            if not as_obj.customer_asns and as_obj.neighbor_asns:
+                key = (as_obj.provider_asns, as_obj.peer_asns)
+                classes.setdefault(key, []).append(as_obj.asn)
+        leaf_equivalence_classes = tuple(
+            [tuple(asns) for asns in classes.values() if len(asns) > 1]
+        )
+        self._leaf_equivalence_classes = leaf_equivalence_classes
+    return leaf_equivalence_classes
+
+
+def compress_leaves(self, member_representative_asns: Mapping[int, int]) -> None:
+    """Removes the members from their neighbors' customers and peers
+
+    Each member must have the same providers and peers as its representative.
+    Any leaves that were compressed before and aren't members are uncompressed
+    """
+
+    as_dict = self.as_dict
+    for member_asn, representative_asn in member_representative_asns.items():
+        member = as_dict[member_asn]
+        representative = as_dict[representative_asn]
+        assert not member.customer_asns, f"{member_asn} isn't a leaf"
+        assert member.provider_asns == representative.provider_asns
+        assert member.peer_asns == representative.peer_asns
+    self.compressed_leaf_representative_asns = dict(member_representative_asns)
+    self._hide_ases()
+
+
+def uncompress_leaves(self) -> None:
+    """Restores the peers and customers of every neighbor of a member"""
+
+    self.compressed_leaf_representative_asns = dict()
+    self._hide_ases()
@@ -1,24 +1,71 @@
 """Functions to create ranks for propagation"""
 
+from bgpy.shared.exceptions import CustomerProviderCycleError
+
 from .base_as import AS
 
 
 def _assign_propagation_ranks(self):
-    """Assigns propagation ranks from the leafs to input_clique"""
+    """Assigns propagation ranks from the leafs to input_clique
+
+    Each AS's rank is the length of the longest customer chain below it, so
+    every AS is ranked higher than all of its customers. This is Kahn's
+    algorithm over the customer to provider DAG, done one rank at a time, so
+    that each AS and link is only visited once
+    """
+
+    # Number of customers that aren't ranked yet, by ASN
+    unranked_customers: dict[int, int] = {x.asn: len(x.customers) for x in self}
+    rank_ases: list[AS] = [x for x in self if not x.customers]
+    rank = 0
+    num_ranked = 0
+    while rank_ases:
+        next_rank_ases: list[AS] = list()
+        for as_obj in rank_ases:
+            as_obj.propagation_rank = rank
+            for provider_obj in as_obj.providers:
+                provider_asn = provider_obj.asn
+                count = unranked_customers[provider_asn] - 1
+                unranked_customers[provider_asn] = count
+                # Ranked once its last customer is, which is in this rank
+                if count == 0:
+                    next_rank_ases.append(provider_obj)
+        num_ranked += len(rank_ases)
+        rank_ases = next_rank_ases
+        rank += 1
+
+    if num_ranked != len(unranked_customers):
+        cycle = self._get_customer_provider_cycle(
+            [x for x in self if unranked_customers[x.asn]]
+        )
+        raise CustomerProviderCycleError(
+            "Customer provider links form a cycle, so propagation ranks "
+            f"can't be assigned: {' -> '.join(str(x.asn) for x in cycle)}"
+        )
 
-    for as_obj in self:
-        self._assign_ranks_helper(as_obj, 0)
 
+def _get_customer_provider_cycle(self, unranked_ases: list[AS]) -> list[AS]:
+    """Returns a cycle of ASes, each a customer of the next
 
-def _assign_ranks_helper(self, as_obj: AS, rank: int):
-    """Assigns ranks to all ases in customer/provider chain recursively"""
+    Every unranked AS has an unranked customer, so walking down unranked
+    customers must eventually return to an AS that was already visited
+    """
 
-    if as_obj.propagation_rank is None or as_obj.propagation_rank < rank:
-        as_obj.propagation_rank = rank
-        # Only update it's providers if it's rank becomes higher
-        # This avoids a double for loop of writes
-        for provider_obj in as_obj.providers:
-            self._assign_ranks_helper(provider_obj, rank + 1)
+    unranked_asns = frozenset(x.asn for x in unranked_ases)
+    # Position of each visited ASN in the path
+    visited: dict[int, int] = dict()
+    as_obj = unranked_ases[0]
+    path: list[AS] = list()
+    while as_obj.asn not in visited:
+        visited[as_obj.asn] = len(path)
+        path.append(as_obj)
+        as_obj = next(x for x in as_obj.customers if x.asn in unranked_asns)
+    # Walked from providers to customers, so reverse it
+    cycle = path[visited[as_obj.asn] :][::-1]
+    # Start from the lowest ASN so that the same cycle is always reported
+    start = cycle.index(min(cycle, key=lambda x: x.asn))
+    cycle = cycle[start:] + cycle[:start]
+    return [*cycle, cycle[0]]
 
 
 def _get_propagation_ranks(self) -> tuple[tuple[AS, ...], ...]:
@@ -0,0 +1,35 @@
+"""Functions to leave single-homed stubs out of propagation
+
+A stub with a single provider only ever receives what that provider sends
+it, and never sends anything that wasn't seeded there. So while folded, a
+stub is removed from its provider's customers, and its outcome is found from
+the provider's local RIB afterwards (see ASGraphAnalyzer)
+"""
+
+from collections.abc import Iterable
+
+
+def fold_stubs(self, stub_asns: Iterable[int]) -> None:
+    """Removes the stubs from their provider's customers
+
+    Any stubs that were folded before and aren't in stub_asns are unfolded
+
+    NOTE: Only AS.customers changes. Derived attributes like AS.neighbors and
+    AS.stub are set when the graph is built, so they are unaffected
+    """
+
+    as_dict = self.as_dict
+    folded_stub_provider_asns = dict()
+    for stub_asn in stub_asns:
+        stub = as_dict[stub_asn]
+        assert stub.stub and stub.providers, f"{stub_asn} isn't single-homed"
+        folded_stub_provider_asns[stub_asn] = stub.providers[0].asn
+    self.folded_stub_provider_asns = folded_stub_provider_asns
+    self._hide_ases()
+
+
+def unfold_stubs(self) -> None:
+    """Restores the customers of every provider of a folded stub"""
+
+    self.folded_stub_provider_asns = dict()
+    self._hide_ases()
@@ -0,0 +1,270 @@
+"""Functions to write and read a binary cache of a built AS graph
+
+Building an ASGraph from the source file means parsing it, making links,
+and computing propagation ranks, cone sizes and the CSR arrays. Workers build
+the same graph over and over, so instead the built graph is written once as
+flat arrays. Loading it reads the file once, and builds the ASes and their
+relationship tuples straight from memoryview casts of the arrays. The CSR
+arrays are stored as is, so the ASGraph doesn't recompute them, nor the
+propagation ranks (see ASGraph's yaml_csr)
+
+File layout (native byte order, which is part of the cache key):
+    header: magic, version, number of ASes
+    sections: (typecode, count) for each, then the raw arrays, 8 byte aligned
+
+The per-AS arrays are indexed by AS.index, like the CSR arrays. Cone ASNs
+aren't stored, since the ASGraph recomputes its cone bitsets from the CSR
+arrays in well under a second
+"""
+
+import gc
+import os
+import struct
+from array import array
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Literal
+
+from frozendict import frozendict
+
+from .as_graph.as_graph_csr import ASGraphCSR
+from .as_graph_info import ASGraphInfo
+
+if TYPE_CHECKING:
+    from .as_graph import AS, ASGraph
+
+MAGIC = b"BGPYASG\x00"
+# Bump this whenever the layout changes so that old caches are ignored
+VERSION = 3
+
+_HEADER = struct.Struct("=8sIQ")
+_SECTION = struct.Struct("=cxxxxxxxQ")
+_ALIGN = 8
+# Stands in for None in the rank and cone size arrays
+_NONE = -1
+
+# Typecode of each section, in order
+_TYPECODES: tuple[Literal["q", "B", "i"], ...] = (
+    # Indexed by AS.index: ASNs, flags (input clique | ixp << 1),
+    # propagation ranks, AS ranks, customer and provider cone sizes
+    *("q", "B", "q", "q", "q", "q"),
+    # Offsets and indices of the peers, providers and customers CSR arrays
+    *("i", "i", "i", "i", "i", "i"),
+    # AS.index of each AS, in the ASGraph's iteration order
+    "i",
+)
+
+_REL_ATTRS = ("peers", "providers", "customers")
+
+
+def write_as_graph_binary(as_graph: "ASGraph", path: Path) -> None:
+    """Writes the AS graph to path as flat arrays
+
+    Written to a temp file first, then moved into place, so that processes
+    reading the cache never see a partially written file. If writing fails,
+    the temp file is removed and the error is raised
+    """
+
+    csr = as_graph.csr
+    # ASes by AS.index
+    ases = [as_obj for rank in as_graph.propagation_ranks for as_obj in rank]
+
+    def optional_ints(attr: str) -> "array[int]":
+        values = (getattr(as_obj, attr) for as_obj in ases)
+        return array("q", [_NONE if x is None else x for x in values])
+
+    sections: list[array[Any]] = [
+        csr.asns,
+        array("B", [as_obj.input_clique | (as_obj.ixp << 1) for as_obj in ases]),
+        optional_ints("propagation_rank"),
+        optional_ints("as_rank"),
+        optional_ints("customer_cone_size"),
+        optional_ints("provider_cone_size"),
+        csr.peer_offsets,
+        csr.peer_indices,
+        csr.provider_offsets,
+        csr.provider_indices,
+        csr.customer_offsets,
+        csr.customer_indices,
+        array("i", [as_obj.index for as_obj in as_graph.ases]),
+    ]
+    assert tuple(x.typecode for x in sections) == _TYPECODES
+
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        with tmp_path.open("wb") as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, len(ases)))
+            for section in sections:
+                f.write(_SECTION.pack(section.typecode.encode(), len(section)))
+            for section in sections:
+                f.write(b"\x00" * (-f.tell() % _ALIGN))
+                f.write(section.tobytes())
+        tmp_path.replace(path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def read_as_graph_binary(
+    path: Path,
+    ASGraphCls: type["ASGraph"],
+    BaseASCls: type["AS"],
+    BasePolicyCls: type[Any],
+    as_graph_kwargs: dict[str, Any],
+) -> "ASGraph":
+    """Loads an AS graph written by write_as_graph_binary
+
+    Raises ValueError if the file isn't a cache of the current version
+    """
+
+    # Everything allocated here lives as long as the graph, so the GC passes
+    # that allocating it would trigger can't collect anything, yet took about
+    # half of the load time
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return _read_as_graph_binary(
+            path, ASGraphCls, BaseASCls, BasePolicyCls, as_graph_kwargs
+        )
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+def _read_as_graph_binary(
+    path: Path,
+    ASGraphCls: type["ASGraph"],
+    BaseASCls: type["AS"],
+    BasePolicyCls: type[Any],
+    as_graph_kwargs: dict[str, Any],
+) -> "ASGraph":
+    """Loads an AS graph written by write_as_graph_binary (with the GC off)"""
+
+    sections = _read_sections(path.read_bytes())
+    asns, flags, propagation_ranks, as_ranks, *rest = sections
+    customer_cone_sizes, provider_cone_sizes, *rest = rest
+    *csr_sections, order = rest
+
+    def none_if_unset(value: int) -> int | None:
+        return None if value == _NONE else value
+
+    # By AS.index
+    ases = [
+        BaseASCls(
+            asn=asn,
+            input_clique=bool(flag & 1),
+            ixp=bool(flag & 2),
+            customer_cone_size=none_if_unset(customer_cone_size),
+            provider_cone_size=none_if_unset(provider_cone_size),
+            as_rank=none_if_unset(as_rank),
+            propagation_rank=none_if_unset(propagation_rank),
+            index=index,
+            policy=BasePolicyCls(),
+        )
+        for index, (
+            asn,
+            flag,
+            propagation_rank,
+            as_rank,
+            customer_cone_size,
+            provider_cone_size,
+        ) in enumerate(
+            zip(
+                asns,
+                flags,
+                propagation_ranks,
+                as_ranks,
+                customer_cone_sizes,
+                provider_cone_sizes,
+                strict=True,
+            )
+        )
+    ]
+    for rel_attr, offsets, indices in zip(
+        _REL_ATTRS, csr_sections[::2], csr_sections[1::2], strict=True
+    ):
+        asns_attr = f"{rel_attr[:-1]}_asns"
+        for as_obj, start, end in zip(ases, offsets, offsets[1:], strict=False):
+            if start != end:
+                neighbors = tuple([ases[j] for j in indices[start:end]])
+                setattr(as_obj, rel_attr, neighbors)
+                setattr(as_obj, asns_attr, frozenset([x.asn for x in neighbors]))
+
+    # Each propagation rank is a contiguous range of indices
+    rank_ranges = list()
+    start = 0
+    for end in range(1, len(ases) + 1):
+        if end == len(ases) or propagation_ranks[end] != propagation_ranks[start]:
+            rank_ranges.append(range(start, end))
+            start = end
+
+    (
+        peer_offsets,
+        peer_indices,
+        provider_offsets,
+        provider_indices,
+        customer_offsets,
+        customer_indices,
+    ) = map(_copy, csr_sections)
+    csr = ASGraphCSR(
+        asns=_copy(asns),
+        asn_to_index={as_obj.asn: i for i, as_obj in enumerate(ases)},
+        peer_offsets=peer_offsets,
+        peer_indices=peer_indices,
+        provider_offsets=provider_offsets,
+        provider_indices=provider_indices,
+        customer_offsets=customer_offsets,
+        customer_indices=customer_indices,
+        propagation_rank_ranges=tuple(rank_ranges),
+    )
+
+    # Includes the store_*_cone_asns kwargs, so that cones are recomputed
+    kwargs = dict(as_graph_kwargs)
+    kwargs["yaml_as_dict"] = frozendict({ases[i].asn: ases[i] for i in order})
+    kwargs["yaml_ixp_asns"] = frozenset(x.asn for x in ases if x.ixp)
+    kwargs["yaml_csr"] = csr
+    return ASGraphCls(ASGraphInfo(), **kwargs)
+
+
+def _read_sections(data: bytes) -> list[memoryview]:
+    """Returns memoryview casts of the arrays stored in the file's data"""
+
+    num_sections = len(_TYPECODES)
+    if len(data) < _HEADER.size + num_sections * _SECTION.size:
+        raise ValueError("AS graph cache is truncated")
+    magic, version, num_ases = _HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"Not an AS graph cache of version {VERSION}")
+
+    offset = _HEADER.size
+    lengths = list()
+    for expected_typecode in _TYPECODES:
+        typecode, count = _SECTION.unpack_from(data, offset)
+        if typecode != expected_typecode.encode():
+            raise ValueError("AS graph cache is corrupt")
+        lengths.append((expected_typecode, count))
+        offset += _SECTION.size
+
+    view = memoryview(data)
+    sections = list()
+    for typecode, count in lengths:
+        offset += -offset % _ALIGN
+        end = offset + count * struct.calcsize(typecode)
+        if end > len(data):
+            raise ValueError("AS graph cache is truncated")
+        sections.append(view[offset:end].cast(typecode))
+        offset = end
+    per_as_sections = [*sections[:6], sections[-1]]
+    offsets_sections = sections[6:12:2]
+    if any(len(x) != num_ases for x in per_as_sections) or any(
+        len(x) != num_ases + 1 for x in offsets_sections
+    ):
+        raise ValueError("AS graph cache is corrupt")
+    return sections
+
+
+def _copy(section: memoryview) -> "array[int]":
+    """Returns the section as an array (a copy of its bytes)"""
+
+    copy = array(section.format)
+    copy.frombytes(section.cast("B"))
+    return copy
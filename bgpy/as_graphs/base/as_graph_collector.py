@@ -1,4 +1,3 @@
-import shutil
 from abc import ABC, abstractmethod
 from datetime import datetime
 from functools import cached_property
@@ -31,7 +30,7 @@ class ASGraphCollector(ABC):
                 f"Error {e}, deleting cached as graph file at {self.cache_path}"
             )
             # Make sure no matter what don't create a messed up cache
-            shutil.rmtree(self.cache_path)
+            self.cache_path.unlink(missing_ok=True)
             raise
 
     @cached_property
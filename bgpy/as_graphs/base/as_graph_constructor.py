@@ -1,12 +1,21 @@
 import csv
+import hashlib
+import inspect
+import sys
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from frozendict import frozendict
 
 from bgpy.shared.constants import bgpy_logger
 
+from .as_graph_binary_cache import (
+    VERSION,
+    read_as_graph_binary,
+    write_as_graph_binary,
+)
+
 if TYPE_CHECKING:
     from .as_graph import ASGraph
     from .as_graph_collector import ASGraphCollector
@@ -22,8 +31,14 @@ class ASGraphConstructor(ABC):
         as_graph_kwargs=frozendict(),
         tsv_path: Path | None = None,
         stubs: bool = True,
+        binary_cache: bool = True,
     ) -> None:
-        """Stores download time and cache_dir instance vars and creates dir"""
+        """Stores download time and cache_dir instance vars and creates dir
+
+        If binary_cache is True, the built graph is cached in the collector's
+        cache_dir, so that later runs (such as each worker in a
+        Simulation) load it rather than parse and build it again
+        """
 
         self.as_graph_collector: ASGraphCollector = ASGraphCollectorCls(
             **as_graph_collector_kwargs
@@ -32,19 +47,37 @@ class ASGraphConstructor(ABC):
         self.as_graph_kwargs = as_graph_kwargs
         self.tsv_path: Path | None = tsv_path
         self.stubs: bool = stubs
+        self.binary_cache: bool = binary_cache
 
     def run(self) -> "ASGraph":
         """Generates AS graph in the following steps:
 
         1. download file from source using the GraphCollector
-        2. parse downloaded file to get ASGraphInfo object
-        3. Generate the graph based on ASGraphInfo object
-        4. Write to tsv_path if it is set
-        5. Return ASGraph
+        2. Load the graph from the binary cache if it exists, else
+        3. parse downloaded file to get ASGraphInfo object
+        4. Generate the graph based on ASGraphInfo object (and cache it)
+        5. Write to tsv_path if it is set
+        6. Return ASGraph
         """
 
         # Download file (for ex: from CAIDA)
         dl_path = self.as_graph_collector.run()
+        if self.binary_cache:
+            binary_cache_path = self._get_binary_cache_path(dl_path)
+            as_graph = self._read_binary_cache(binary_cache_path)
+            if as_graph is None:
+                as_graph = self._build_as_graph(dl_path)
+                self._write_binary_cache(as_graph, binary_cache_path)
+        else:
+            as_graph = self._build_as_graph(dl_path)
+
+        # Write to TSV if tsv_path is set
+        self.write_tsv(as_graph, self.tsv_path)
+        return as_graph
+
+    def _build_as_graph(self, dl_path: Path) -> "ASGraph":
+        """Parses the downloaded file and generates the ASGraph"""
+
         # Get ASGraphInfo from downloaded file
         as_graph_info = self._get_as_graph_info(dl_path)
         # Generate AS Graph from ASGraphInfo
@@ -55,11 +88,93 @@ class ASGraphConstructor(ABC):
             as_graph_info = self._get_as_graph_info(dl_path, invalid_asns)
             # Generate AS Graph from ASGraphInfo
             as_graph = self._get_as_graph(as_graph_info)
-
-        # Write to TSV if tsv_path is set
-        self.write_tsv(as_graph, self.tsv_path)
         return as_graph
 
+    def get_digest(self) -> str:
+        """Returns a digest of the graph that this constructs
+
+        Covers the downloaded file, and everything else that changes the graph
+        """
+
+        return self._get_digest(self.as_graph_collector.run())
+
+    def _get_digest(self, dl_path: Path) -> str:
+        """Returns a digest of the graph built from the downloaded file"""
+
+        key = hashlib.sha256()
+        with dl_path.open("rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                key.update(chunk)
+        key.update(
+            repr(
+                (
+                    VERSION,
+                    sys.byteorder,
+                    type(self).__qualname__,
+                    self.ASGraphCls.__qualname__,
+                    self.stubs,
+                    *[
+                        self._get_as_graph_kwarg(x)
+                        for x in (
+                            "store_customer_cone_size",
+                            "store_customer_cone_asns",
+                            "store_provider_cone_size",
+                            "store_provider_cone_asns",
+                        )
+                    ],
+                )
+            ).encode()
+        )
+        return key.hexdigest()
+
+    def _get_binary_cache_path(self, dl_path: Path) -> Path:
+        """Returns the binary cache path for the downloaded file
+
+        Keyed by the digest of the graph (see get_digest), so a stale cache is
+        never loaded. It's written to the collector's cache_dir, since the
+        downloaded file may be somewhere else (such as a local mirror)
+        """
+
+        cache_dir = self.as_graph_collector.cache_dir
+        return cache_dir / f"{dl_path.stem}_{self._get_digest(dl_path)[:16]}.asgraph"
+
+    def _read_binary_cache(self, path: Path) -> "ASGraph | None":
+        """Returns the cached ASGraph, or None if there isn't a valid one"""
+
+        if not path.exists():
+            return None
+        try:
+            return read_as_graph_binary(
+                path,
+                self.ASGraphCls,
+                self._get_as_graph_kwarg("BaseASCls"),
+                self._get_as_graph_kwarg("BasePolicyCls"),
+                dict(self.as_graph_kwargs),
+            )
+        except ValueError as e:
+            bgpy_logger.warning(f"Ignoring AS graph cache at {path}: {e}")
+            return None
+
+    def _write_binary_cache(self, as_graph: "ASGraph", path: Path) -> None:
+        """Writes the ASGraph to the binary cache
+
+        The cache only saves time, so failing to write it (such as a full or
+        read only cache_dir) doesn't fail the run
+        """
+
+        try:
+            write_as_graph_binary(as_graph, path)
+        except OSError as e:
+            bgpy_logger.warning(f"Couldn't write AS graph cache at {path}: {e}")
+
+    def _get_as_graph_kwarg(self, name: str) -> Any:
+        """Returns the as_graph_kwarg, or the ASGraphCls default if it's not set"""
+
+        if name in self.as_graph_kwargs:
+            return self.as_graph_kwargs[name]
+        else:
+            return inspect.signature(self.ASGraphCls).parameters[name].default
+
     def remove_stubs(self, as_graph: "ASGraph") -> None:
         """Removes stubs from as graph"""
 
@@ -1,5 +1,6 @@
 from dataclasses import dataclass, field
 
+from .as_graph_info_diff import ASGraphInfoDiff
 from .links import CustomerProviderLink as CPLink
 from .links import Link, PeerLink
 
@@ -33,6 +34,40 @@ class ASGraphInfo:
         else:
             return NotImplemented
 
+    def get_diff(self, other: "ASGraphInfo") -> ASGraphInfoDiff:
+        """Returns the changes from this ASGraphInfo to the other one
+
+        Diagram ranks are ignored, since they aren't part of the ASGraph
+        """
+
+        asns = self.as_graph_asns
+        other_asns = other.as_graph_asns
+        return ASGraphInfoDiff(
+            added_customer_provider_links=(
+                other.customer_provider_links - self.customer_provider_links
+            ),
+            removed_customer_provider_links=(
+                self.customer_provider_links - other.customer_provider_links
+            ),
+            added_peer_links=other.peer_links - self.peer_links,
+            removed_peer_links=self.peer_links - other.peer_links,
+            added_asns=other_asns - asns,
+            removed_asns=asns - other_asns,
+            added_ixp_asns=other.ixp_asns - self.ixp_asns,
+            removed_ixp_asns=self.ixp_asns - other.ixp_asns,
+            added_input_clique_asns=other.input_clique_asns - self.input_clique_asns,
+            removed_input_clique_asns=self.input_clique_asns - other.input_clique_asns,
+        )
+
+    @property
+    def as_graph_asns(self) -> frozenset[int]:
+        """Returns the ASNs of every AS in the ASGraph built from this
+
+        Unlike asns, this includes IXPs and input clique ASes without links
+        """
+
+        return frozenset(self.asns) | self.ixp_asns | self.input_clique_asns
+
     @property
     def asns(self) -> list[int]:
         asns: list[int] = []
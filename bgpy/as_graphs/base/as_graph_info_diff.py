@@ -0,0 +1,34 @@
+from dataclasses import dataclass, field, fields
+
+from .links import CustomerProviderLink as CPLink
+from .links import PeerLink
+
+
+@dataclass(frozen=True, slots=True)
+class ASGraphInfoDiff:
+    """Changes from one ASGraphInfo to another (see ASGraphInfo.get_diff)
+
+    Used to update an ASGraph in place (see ASGraph.update), rather than
+    building the graph of the new ASGraphInfo from scratch
+    """
+
+    # Links
+    added_customer_provider_links: frozenset[CPLink] = field(default_factory=frozenset)
+    removed_customer_provider_links: frozenset[CPLink] = field(
+        default_factory=frozenset
+    )
+    added_peer_links: frozenset[PeerLink] = field(default_factory=frozenset)
+    removed_peer_links: frozenset[PeerLink] = field(default_factory=frozenset)
+    # ASNs of every AS in the graph, whether or not it has links
+    added_asns: frozenset[int] = field(default_factory=frozenset)
+    removed_asns: frozenset[int] = field(default_factory=frozenset)
+    # Metadata
+    added_ixp_asns: frozenset[int] = field(default_factory=frozenset)
+    removed_ixp_asns: frozenset[int] = field(default_factory=frozenset)
+    added_input_clique_asns: frozenset[int] = field(default_factory=frozenset)
+    removed_input_clique_asns: frozenset[int] = field(default_factory=frozenset)
+
+    def __bool__(self) -> bool:
+        """Returns True if anything changed"""
+
+        return any(getattr(self, x.name) for x in fields(self))
@@ -1,22 +1,37 @@
-import bz2
+import os
 import shutil
 from datetime import datetime, timedelta
 from functools import cached_property
 from pathlib import Path
-from tempfile import TemporaryDirectory
 from typing import cast
 
 import requests
 from bs4 import BeautifulSoup as Soup
 
 from bgpy.as_graphs.base import ASGraphCollector
-from bgpy.shared.constants import bgpy_logger
+from bgpy.shared.constants import SINGLE_DAY_CACHE_DIR, bgpy_logger
 from bgpy.shared.exceptions import NoCAIDAURLError
 
 
 class CAIDAASGraphCollector(ASGraphCollector):
     """Downloads relationships from CAIDA and caches file"""
 
+    def __init__(
+        self,
+        dl_time: datetime | None = None,
+        cache_dir: Path = SINGLE_DAY_CACHE_DIR,
+        local_path: Path | None = None,
+    ) -> None:
+        """Stores the local_path to use instead of downloading, if any
+
+        local_path can be a serial-2 file (.bz2 or text), or a local mirror
+        directory of the dated serial-2 archives, so that graphs can be built
+        offline
+        """
+
+        super().__init__(dl_time=dl_time, cache_dir=cache_dir)
+        self.local_path: Path | None = local_path
+
     def _run(self) -> Path:
         """Downloads relationships into a file
 
@@ -24,18 +39,33 @@ class CAIDAASGraphCollector(ASGraphCollector):
 
         Can specify a download time if you want to download an older dataset
         if cache is True it uses the downloaded file that was cached
+
+        The .bz2 archive is cached as is, since the constructor parses it
+        directly. Text caches from older versions are still used if they exist
         """
 
-        if not self.cache_path.exists():
+        if self.local_path is not None:
+            return self._get_local_path(self.local_path, self.dl_time)
+        elif self.cache_path.exists():
+            return self.cache_path
+        elif not self.bz2_cache_path.exists():
             bgpy_logger.info("No caida graph cached. Caching...")
-            # Create a temporary dir to write to
-            with TemporaryDirectory() as tmp_dir:
-                # Path to bz2 download
-                bz2_path: Path = Path(tmp_dir) / "download.bz2"
-                # Download Bz2
-                self._download_bz2_file(self._get_url(self.dl_time), bz2_path)
-                self._unzip_and_write_to_cache(bz2_path)
-        return self.cache_path
+            # Download next to the cache, then move it into place
+            tmp_path = self.bz2_cache_path.with_name(
+                f"{self.bz2_cache_path.name}.{os.getpid()}.tmp"
+            )
+            try:
+                self._download_bz2_file(self._get_url(self.dl_time), tmp_path)
+                tmp_path.replace(self.bz2_cache_path)
+            finally:
+                tmp_path.unlink(missing_ok=True)
+        return self.bz2_cache_path
+
+    @cached_property
+    def bz2_cache_path(self) -> Path:
+        """Path to the cached .bz2 archive for that day"""
+
+        return self.cache_path.with_suffix(".txt.bz2")
 
     @cached_property
     def default_dl_time(self) -> datetime:
@@ -70,6 +100,23 @@ class CAIDAASGraphCollector(ASGraphCollector):
         else:  # pragma: no cover
             raise NoCAIDAURLError("No Urls")
 
+    def _get_local_path(self, local_path: Path, dl_time: datetime) -> Path:
+        """Returns the local file, or the archive for dl_time in a mirror dir"""
+
+        if local_path.is_dir():
+            # Same as _get_url, but for the file names in the mirror
+            paths = sorted(
+                x for x in local_path.iterdir() if dl_time.strftime("%Y%m01") in x.name
+            )
+            if len(paths) > 0:
+                return paths[0]
+            else:
+                raise FileNotFoundError(f"No CAIDA file for {dl_time} in {local_path}")
+        elif local_path.exists():
+            return local_path
+        else:
+            raise FileNotFoundError(f"{local_path} does not exist")
+
     def _get_hrefs(self, url: str) -> list[str]:
         """Returns hrefs from a tags at a given url"""
 
@@ -102,12 +149,3 @@ class CAIDAASGraphCollector(ASGraphCollector):
             r.raise_for_status()
             with bz2_path.open("wb") as f:
                 shutil.copyfileobj(r.raw, f)
-
-    def _unzip_and_write_to_cache(self, bz2_path: Path) -> None:
-        """Unzips bz2 file and writes to cache"""
-
-        # Unzip and read
-        with bz2.open(bz2_path, mode="rb") as bz2_f, self.cache_path.open("w") as txt_f:
-            for line in bz2_f:
-                # Must decode the bytes into strings and strip
-                txt_f.write(line.decode().strip() + "\n")
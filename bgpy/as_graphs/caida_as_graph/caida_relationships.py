@@ -0,0 +1,192 @@
+"""Streaming parser for CAIDA serial-2 relationship files
+
+The file is read in large chunks (straight from the .bz2 archive if that's
+what it is), and each chunk is split into all of its fields at once, so that
+ASNs are converted to ints in bulk into arrays rather than line by line.
+Links are deduplicated as packed 64 bit ints, so no link objects are made
+until the ASGraphInfo is created from the unique links.
+
+Format: https://publicdata.caida.org/datasets/as-relationships/serial-2/
+    # input clique: <asn> <asn> ...
+    # IXP ASes: <asn> <asn> ...
+    <provider-as>|<customer-as>|-1|<source>
+    <peer-as>|<peer-as>|0|<source>
+"""
+
+import bz2
+from array import array
+from collections.abc import Iterator
+from dataclasses import dataclass
+from itertools import compress
+from operator import not_
+from pathlib import Path
+from typing import BinaryIO
+
+from bgpy.as_graphs.base import ASGraphInfo, PeerLink
+from bgpy.as_graphs.base import CustomerProviderLink as CPLink
+
+_CHUNK_SIZE = 1 << 22
+# Fields per relationship line
+_NUM_FIELDS = 4
+# ASNs are 32 bit, so two fit in each key
+_ASN_BITS = 32
+_ASN_MASK = (1 << _ASN_BITS) - 1
+
+
+@dataclass(frozen=True, slots=True)
+class CAIDARelationships:
+    """Unique links of a serial-2 file, as sorted arrays of packed ASNs
+
+    Customer provider keys are provider_asn << 32 | customer_asn
+    Peer keys are lower_asn << 32 | higher_asn
+    """
+
+    customer_provider_keys: "array[int]"
+    peer_keys: "array[int]"
+    input_clique_asns: frozenset[int]
+    ixp_asns: frozenset[int]
+
+    @classmethod
+    def from_file(
+        cls, path: Path, invalid_asns: frozenset[int] = frozenset()
+    ) -> "CAIDARelationships":
+        """Parses a serial-2 file, which may be bz2 compressed
+
+        ASNs in invalid_asns (and any links with them) are left out
+        """
+
+        parser = _Parser(invalid_asns)
+        with _open(path) as f:
+            for chunk in _iter_line_chunks(f):
+                parser.parse_chunk(chunk)
+        return cls(
+            customer_provider_keys=_unique(parser.cp_keys),
+            peer_keys=_unique(parser.peer_keys),
+            input_clique_asns=frozenset(parser.input_clique_asns),
+            ixp_asns=frozenset(parser.ixp_asns),
+        )
+
+    def to_as_graph_info(self) -> ASGraphInfo:
+        """Returns the ASGraphInfo, with one link object per unique link"""
+
+        return ASGraphInfo(
+            customer_provider_links=frozenset(
+                [
+                    CPLink(customer_asn=key & _ASN_MASK, provider_asn=key >> _ASN_BITS)
+                    for key in self.customer_provider_keys
+                ]
+            ),
+            peer_links=frozenset(
+                [PeerLink(key >> _ASN_BITS, key & _ASN_MASK) for key in self.peer_keys]
+            ),
+            ixp_asns=self.ixp_asns,
+            input_clique_asns=self.input_clique_asns,
+        )
+
+
+class _Parser:
+    """Accumulates the fields of each chunk of lines"""
+
+    def __init__(self, invalid_asns: frozenset[int]) -> None:
+        self.invalid_asns: frozenset[int] = invalid_asns
+        self.cp_keys: array[int] = array("Q")
+        self.peer_keys: array[int] = array("Q")
+        self.input_clique_asns: set[int] = set()
+        self.ixp_asns: set[int] = set()
+
+    def parse_chunk(self, chunk: bytes) -> None:
+        """Parses a chunk of whole lines"""
+
+        # Comments are only at the top of the file, so this is rare
+        if b"#" in chunk:
+            lines = chunk.splitlines()
+            for line in lines:
+                if line.startswith(b"#"):
+                    self._parse_comment(line)
+            chunk = b"\n".join(x for x in lines if not x.startswith(b"#"))
+
+        # Splitting on whitespace drops blank lines and \r
+        fields = b"|".join(chunk.split()).split(b"|")
+        if fields == [b""]:
+            return
+        elif len(fields) % _NUM_FIELDS:
+            raise ValueError("Relationship lines must have 4 fields")
+
+        asns1 = array("Q", map(int, fields[0::_NUM_FIELDS]))
+        asns2 = array("Q", map(int, fields[1::_NUM_FIELDS]))
+        is_cp = [x == b"-1" for x in fields[2::_NUM_FIELDS]]
+
+        if self.invalid_asns:
+            valid = [
+                x not in self.invalid_asns and y not in self.invalid_asns
+                for x, y in zip(asns1, asns2, strict=True)
+            ]
+            asns1 = array("Q", compress(asns1, valid))
+            asns2 = array("Q", compress(asns2, valid))
+            is_cp = list(compress(is_cp, valid))
+
+        if max(asns1, default=0) > _ASN_MASK or max(asns2, default=0) > _ASN_MASK:
+            raise ValueError("ASNs must be 32 bit")
+
+        # Providers come first, so this is provider << 32 | customer
+        self.cp_keys.extend(
+            _pack(compress(asns1, is_cp), compress(asns2, is_cp), sort=False)
+        )
+        is_peer = list(map(not_, is_cp))
+        self.peer_keys.extend(
+            _pack(compress(asns1, is_peer), compress(asns2, is_peer), sort=True)
+        )
+
+    def _parse_comment(self, line: bytes) -> None:
+        """Parses the input clique and IXP comments (see CAIDA's paper)"""
+
+        if line.startswith(b"# input clique"):
+            asns = self.input_clique_asns
+        elif line.startswith(b"# IXP ASes"):
+            asns = self.ixp_asns
+        else:
+            return
+        asns.update(
+            asn
+            for asn in map(int, line.split(b":")[-1].split())
+            if asn not in self.invalid_asns
+        )
+
+
+def _open(path: Path) -> BinaryIO:
+    """Opens the file for reading bytes, decompressing it if it's .bz2"""
+
+    if path.suffix == ".bz2":
+        return bz2.open(path, mode="rb")  # type: ignore
+    else:
+        return path.open("rb")
+
+
+def _iter_line_chunks(f: BinaryIO) -> Iterator[bytes]:
+    """Yields large chunks of the file that end on a line break"""
+
+    remainder = b""
+    for data in iter(lambda: f.read(_CHUNK_SIZE), b""):
+        lines = remainder + data
+        end = lines.rfind(b"\n") + 1
+        remainder = lines[end:]
+        yield lines[:end]
+    yield remainder
+
+
+def _pack(asns1: Iterator[int], asns2: Iterator[int], sort: bool) -> list[int]:
+    """Packs pairs of ASNs into keys, with the lower ASN first if sort"""
+
+    if sort:
+        return [
+            x << _ASN_BITS | y if x < y else y << _ASN_BITS | x
+            for x, y in zip(asns1, asns2, strict=True)
+        ]
+    else:
+        return [x << _ASN_BITS | y for x, y in zip(asns1, asns2, strict=True)]
+
+
+def _unique(keys: "array[int]") -> "array[int]":
+    """Returns the sorted unique keys"""
+
+    return array("Q", sorted(set(keys)))
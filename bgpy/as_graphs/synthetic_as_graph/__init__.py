@@ -0,0 +1,11 @@
+from .synthetic_as_graph import SyntheticASGraph
+from .synthetic_as_graph_collector import SyntheticASGraphCollector
+from .synthetic_as_graph_constructor import SyntheticASGraphConstructor
+from .synthetic_topology import SyntheticTopology
+
+__all__ = [
+    "SyntheticASGraphCollector",
+    "SyntheticASGraphConstructor",
+    "SyntheticASGraph",
+    "SyntheticTopology",
+]
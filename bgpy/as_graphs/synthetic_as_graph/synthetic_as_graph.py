@@ -0,0 +1,7 @@
+from bgpy.as_graphs.base import ASGraph
+
+
+class SyntheticASGraph(ASGraph):
+    """A copy of the AS Graph, for graphs from SyntheticTopology"""
+
+    pass
@@ -0,0 +1,61 @@
+import os
+from datetime import datetime
+from functools import cached_property
+from pathlib import Path
+
+from bgpy.as_graphs.base import ASGraphCollector
+from bgpy.shared.constants import SINGLE_DAY_CACHE_DIR
+
+from .synthetic_topology import SyntheticTopology
+
+
+class SyntheticASGraphCollector(ASGraphCollector):
+    """Caches the parameters of a synthetic topology, in place of a download
+
+    Nothing is downloaded, but the constructor generates the same topology
+    from the same parameters, so the params file stands in for the
+    relationships file (and keys the constructor's binary cache)
+    """
+
+    def __init__(
+        self,
+        dl_time: datetime | None = None,
+        cache_dir: Path = SINGLE_DAY_CACHE_DIR,
+        topology: SyntheticTopology | None = None,
+    ) -> None:
+        """Stores the topology to generate (by default, SyntheticTopology())"""
+
+        self.topology: SyntheticTopology = topology or SyntheticTopology()
+        super().__init__(dl_time=dl_time, cache_dir=cache_dir)
+
+    def _run(self) -> Path:
+        """Writes the topology's parameters into a file"""
+
+        if not self.cache_path.exists():
+            # Write next to the cache, then move it into place
+            tmp_path = self.cache_path.with_name(
+                f"{self.cache_path.name}.{os.getpid()}.tmp"
+            )
+            try:
+                tmp_path.write_text(self.topology.to_json())
+                tmp_path.replace(self.cache_path)
+            finally:
+                tmp_path.unlink(missing_ok=True)
+        return self.cache_path
+
+    @cached_property
+    def cache_path(self) -> Path:
+        """Path to the params file, which doesn't depend on the day"""
+
+        topology = self.topology
+        name = (
+            f"{self.__class__.__name__}_{topology.num_ases}_{topology.seed}_"
+            f"{topology.digest}.json"
+        )
+        return self.cache_dir / name
+
+    @cached_property
+    def default_dl_time(self) -> datetime:
+        """Returns today, since nothing is downloaded"""
+
+        return datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
@@ -0,0 +1,59 @@
+from pathlib import Path
+
+from frozendict import frozendict
+
+from bgpy.as_graphs.base import (
+    ASGraph,
+    ASGraphCollector,
+    ASGraphConstructor,
+    ASGraphInfo,
+)
+
+from .synthetic_as_graph import SyntheticASGraph
+from .synthetic_as_graph_collector import SyntheticASGraphCollector
+from .synthetic_topology import SyntheticTopology
+
+
+class SyntheticASGraphConstructor(ASGraphConstructor):
+    """Generates CAIDA-like AS graphs of any size, without downloading
+
+    Pass the topology with as_graph_collector_kwargs, for example:
+        as_graph_collector_kwargs={"topology": SyntheticTopology(num_ases=10**6)}
+    """
+
+    # Add an optional default to ASGraphCollectorCls and ASGraphCls
+    def __init__(
+        self,
+        ASGraphCollectorCls: type[ASGraphCollector] = SyntheticASGraphCollector,
+        ASGraphCls: type[ASGraph] = SyntheticASGraph,
+        as_graph_collector_kwargs=frozendict(),
+        as_graph_kwargs=frozendict(),
+        tsv_path: Path | None = None,
+        stubs: bool = True,
+        binary_cache: bool = True,
+    ) -> None:
+        super().__init__(
+            ASGraphCollectorCls,
+            ASGraphCls,
+            as_graph_collector_kwargs=as_graph_collector_kwargs,
+            as_graph_kwargs=as_graph_kwargs,
+            tsv_path=tsv_path,
+            stubs=stubs,
+            binary_cache=binary_cache,
+        )
+
+    ####################
+    # Abstract methods #
+    ####################
+    def _get_as_graph_info(
+        self, dl_path: Path, invalid_asns: frozenset[int] = frozenset()
+    ) -> ASGraphInfo:
+        """Generates the AS Graph info from the topology's params file"""
+
+        topology = SyntheticTopology.from_json(dl_path.read_text())
+        return topology.get_as_graph_info(invalid_asns)
+
+    def _get_as_graph(self, as_graph_info: ASGraphInfo) -> ASGraph:
+        """Creates and returns the ASGraph"""
+
+        return self.ASGraphCls(as_graph_info, **self.as_graph_kwargs)
@@ -0,0 +1,240 @@
+"""Generator for synthetic, CAIDA-like AS topologies
+
+Lets graphs of any size be built offline and reproducibly (such as for
+scaling benchmarks), without downloading CAIDA's relationships.
+
+The topology is grown one AS at a time, so the providers of every AS were
+added before it, and there are never any customer provider cycles:
+    1. The input clique (the tier-1 ASes), which all peer with each other
+    2. Every other AS, with one or more providers picked by preferential
+       attachment (by number of customers), which gives the power-law
+       customer degrees of the real graph. Only transit ASes can be picked
+       as providers, so the rest end up as stubs and multihomed edge ASes
+    3. Peer links between transit ASes, also by preferential attachment
+    4. A few peer links for a share of the edge ASes
+    5. IXP ASes, which peer with a random set of members, some of which also
+       peer with each other there (which is most of the real graph's peering)
+Finally the ASNs are shuffled, so that an ASN doesn't give away where its AS
+is in the hierarchy (which would matter for tiebreaks by lowest ASN)
+"""
+
+import dataclasses
+import hashlib
+import json
+import random
+from array import array
+from dataclasses import dataclass
+from itertools import accumulate, combinations
+
+from bgpy.as_graphs.base import ASGraphInfo
+from bgpy.as_graphs.caida_as_graph.caida_relationships import CAIDARelationships
+
+# Bump this whenever the generated topologies change, so that graphs cached
+# from older versions aren't used
+VERSION = 1
+# Same packing as CAIDARelationships
+_ASN_BITS = 32
+
+
+@dataclass(frozen=True, slots=True)
+class SyntheticTopology:
+    """Parameters of a synthetic topology
+
+    The defaults are roughly the shape of CAIDA's graph
+    """
+
+    num_ases: int = 10_000
+    # The same seed and parameters always generate the same topology
+    seed: int = 0
+    num_input_clique_ases: int = 15
+    # Share of the ASes outside the input clique that can get customers
+    transit_fraction: float = 0.25
+    # Weights for each AS to have 1, 2, 3, ... providers
+    num_providers_weights: tuple[float, ...] = (0.45, 0.35, 0.12, 0.08)
+    # Average number of peers of each transit AS from transit peering
+    transit_peer_degree: float = 12.0
+    # Share of edge ASes (ASes that aren't transit) that have any peers
+    edge_peering_fraction: float = 0.15
+    # One IXP is added for this many ASes
+    ases_per_ixp: int = 1_000
+    ixp_members: int = 100
+    # Chance for each pair of members of an IXP to peer with each other
+    ixp_member_peering_probability: float = 0.2
+
+    def __post_init__(self) -> None:
+        """Validates the parameters"""
+
+        if self.num_input_clique_ases < 1:
+            raise ValueError("There must be at least one input clique AS")
+        elif self.num_ases < self.num_input_clique_ases + self.num_ixps:
+            raise ValueError("num_ases is too small for the input clique and IXPs")
+        elif self.num_ases >= 1 << _ASN_BITS:
+            raise ValueError("ASNs must be 32 bit")
+        elif not self.num_providers_weights or min(self.num_providers_weights) < 0:
+            raise ValueError("num_providers_weights must be non negative")
+        elif not 0 <= self.transit_fraction <= 1:
+            raise ValueError("transit_fraction must be between 0 and 1")
+        elif not 0 <= self.edge_peering_fraction <= 1:
+            raise ValueError("edge_peering_fraction must be between 0 and 1")
+        elif not 0 <= self.ixp_member_peering_probability <= 1:
+            raise ValueError("ixp_member_peering_probability must be between 0 and 1")
+        elif self.ases_per_ixp < 1:
+            raise ValueError("ases_per_ixp must be positive")
+
+    @property
+    def num_ixps(self) -> int:
+        return self.num_ases // self.ases_per_ixp
+
+    #################
+    # Serialization #
+    #################
+
+    def to_json(self) -> str:
+        """Returns the parameters (and generator version) as JSON"""
+
+        return json.dumps(
+            {"version": VERSION, **dataclasses.asdict(self)}, sort_keys=True
+        )
+
+    @classmethod
+    def from_json(cls, text: str) -> "SyntheticTopology":
+        """Returns the topology from to_json, if it's from this version"""
+
+        params = json.loads(text)
+        if params.pop("version") != VERSION:
+            raise ValueError(f"Not a synthetic topology of version {VERSION}")
+        params["num_providers_weights"] = tuple(params["num_providers_weights"])
+        return cls(**params)
+
+    @property
+    def digest(self) -> str:
+        """Returns a short hash of the parameters, for file names"""
+
+        return hashlib.sha256(self.to_json().encode()).hexdigest()[:16]
+
+    ##############
+    # Generation #
+    ##############
+
+    def get_as_graph_info(
+        self, invalid_asns: frozenset[int] = frozenset()
+    ) -> ASGraphInfo:
+        """Returns the ASGraphInfo of the topology
+
+        ASNs in invalid_asns (and any links with them) are left out
+        """
+
+        return self.get_relationships(invalid_asns).to_as_graph_info()
+
+    def get_relationships(
+        self, invalid_asns: frozenset[int] = frozenset()
+    ) -> CAIDARelationships:
+        """Generates the topology, in the same format as CAIDA's relationships"""
+
+        rng = random.Random(self.seed)  # noqa: S311
+        cp_keys, peer_keys = self._get_links(rng)
+        asns = list(range(1, self.num_ases + 1))
+        rng.shuffle(asns)
+
+        mask = (1 << _ASN_BITS) - 1
+        customer_provider_keys = list()
+        for key in cp_keys:
+            provider_asn, customer_asn = asns[key >> _ASN_BITS], asns[key & mask]
+            if provider_asn not in invalid_asns and customer_asn not in invalid_asns:
+                customer_provider_keys.append(provider_asn << _ASN_BITS | customer_asn)
+        peer_asn_keys = list()
+        for key in peer_keys:
+            asn1, asn2 = sorted((asns[key >> _ASN_BITS], asns[key & mask]))
+            if asn1 not in invalid_asns and asn2 not in invalid_asns:
+                peer_asn_keys.append(asn1 << _ASN_BITS | asn2)
+
+        num_regular_ases = self.num_ases - self.num_ixps
+        return CAIDARelationships(
+            customer_provider_keys=array("Q", sorted(customer_provider_keys)),
+            peer_keys=array("Q", sorted(peer_asn_keys)),
+            input_clique_asns=frozenset(
+                asns[i]
+                for i in range(self.num_input_clique_ases)
+                if asns[i] not in invalid_asns
+            ),
+            ixp_asns=frozenset(
+                asns[i]
+                for i in range(num_regular_ases, self.num_ases)
+                if asns[i] not in invalid_asns
+            ),
+        )
+
+    def _get_links(self, rng: random.Random) -> tuple[set[int], set[int]]:
+        """Returns the links between AS indices (in the order ASes are added)
+
+        Customer provider keys are provider << 32 | customer, and peer keys
+        are lower << 32 | higher, as in CAIDARelationships
+        """
+
+        num_clique_ases = self.num_input_clique_ases
+        num_regular_ases = self.num_ases - self.num_ixps
+        rand = rng.random
+
+        peer_keys = {
+            i << _ASN_BITS | j for i, j in combinations(range(num_clique_ases), 2)
+        }
+
+        # Preferential attachment: every transit AS is in here once, plus once
+        # for every customer it has, and providers are picked from it uniformly
+        attachment = list(range(num_clique_ases))
+        cp_keys: set[int] = set()
+        edge_indices = list()
+        num_providers_choices = range(1, len(self.num_providers_weights) + 1)
+        cum_weights = list(accumulate(self.num_providers_weights))
+        for customer in range(num_clique_ases, num_regular_ases):
+            num_providers = rng.choices(num_providers_choices, cum_weights=cum_weights)[
+                0
+            ]
+            providers: list[int] = list()
+            # Bounded, since there may be fewer transit ASes than providers
+            for _ in range(4 * num_providers):
+                provider = attachment[int(rand() * len(attachment))]
+                if provider not in providers:
+                    providers.append(provider)
+                    if len(providers) == num_providers:
+                        break
+            cp_keys.update([x << _ASN_BITS | customer for x in providers])
+            attachment.extend(providers)
+            if rand() < self.transit_fraction:
+                attachment.append(customer)
+            else:
+                edge_indices.append(customer)
+
+        def add_peer_link(index1: int, index2: int) -> None:
+            low, high = sorted((index1, index2))
+            # Links can't be both customer provider and peer links
+            if (
+                low != high
+                and (low << _ASN_BITS | high) not in cp_keys
+                and (high << _ASN_BITS | low) not in cp_keys
+            ):
+                peer_keys.add(low << _ASN_BITS | high)
+
+        num_transit_ases = num_regular_ases - len(edge_indices)
+        for _ in range(int(num_transit_ases * self.transit_peer_degree / 2)):
+            add_peer_link(
+                attachment[int(rand() * len(attachment))],
+                attachment[int(rand() * len(attachment))],
+            )
+
+        for edge_index in edge_indices:
+            if rand() < self.edge_peering_fraction:
+                for _ in range(1 + int(rand() * 3)):
+                    add_peer_link(edge_index, attachment[int(rand() * len(attachment))])
+
+        member_candidates = range(num_clique_ases, num_regular_ases)
+        for ixp_index in range(num_regular_ases, self.num_ases):
+            num_members = min(self.ixp_members, len(member_candidates))
+            members = rng.sample(member_candidates, num_members)
+            for member_index in members:
+                add_peer_link(ixp_index, member_index)
+            for member1, member2 in combinations(members, 2):
+                if rand() < self.ixp_member_peering_probability:
+                    add_peer_link(member1, member2)
+
+        return cp_keys, peer_keys
@@ -17,3 +17,12 @@ class AnnouncementNotFoundError(RuntimeError):
     """
 
     pass
+
+
+class CustomerProviderCycleError(RuntimeError):
+    """Exception that covers when customer-provider links form a cycle
+
+    Propagation ranks can't be assigned, since an AS would be its own provider
+    """
+
+    pass
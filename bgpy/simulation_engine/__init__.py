@@ -1,5 +1,6 @@
 # Skip isort formatting due to circular imports if Announcement isn't first
 from .announcement import Announcement  # isort: skip
+from .as_path import ASPath
 from .ann_containers import LocalRIB, RecvQueue, RIBsIn, RIBsOut
 
 # Custom attacker policies
@@ -55,10 +56,19 @@ from .policies import (
     ROVPPV2LiteFull,
     ShortestPathPrefixASPAAttacker,
 )
-from .simulation_engines import BaseSimulationEngine, SimulationEngine
+from .simulation_engines import (
+    ActiveASes,
+    ArraySimulationEngine,
+    BaseSimulationEngine,
+    EngineSnapshot,
+    SimulationEngine,
+    StreamingSimulationEngine,
+    ThreadedSimulationEngine,
+)
 
 __all__ = [
     "Announcement",
+    "ASPath",
     "LocalRIB",
     "RIBsIn",
     "RIBsOut",
@@ -113,6 +123,11 @@ __all__ = [
     "ASPAwNFull",
     "ShortestPathPrefixASPAAttacker",
     "FirstASNStrippingPrefixASPAAttacker",
+    "ActiveASes",
     "BaseSimulationEngine",
+    "EngineSnapshot",
     "SimulationEngine",
+    "ArraySimulationEngine",
+    "StreamingSimulationEngine",
+    "ThreadedSimulationEngine",
 ]
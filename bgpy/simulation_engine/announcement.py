@@ -1,19 +1,27 @@
-from dataclasses import asdict, dataclass, replace
-from typing import Any, Optional
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, fields, replace
+from types import MemberDescriptorType
+from typing import Any, ClassVar, Optional
 from warnings import warn
 
 from yamlable import YamlAble, yaml_info
 
 from bgpy.shared.enums import Relationships
 
+from .as_path import ASPath
+
 
 @yaml_info(yaml_tag="Announcement")
 @dataclass(slots=True, frozen=True)
 class Announcement(YamlAble):
     """BGP Announcement"""
 
+    # Set to True in a subclass to prepend with ASPaths (shared tails)
+    # rather than tuples. See ASPath
+    shared_as_paths: ClassVar[bool] = False
+
     prefix: str
-    as_path: tuple[int, ...]
+    as_path: tuple[int, ...] | ASPath
     # Equivalent to the next hop in a normal BGP announcement
     next_hop_asn: int = None  # type: ignore
     seed_asn: int | None = None
@@ -39,7 +47,7 @@ class Announcement(YamlAble):
     # BGPsec next ASN that should receive the control plane announcement
     # NOTE: this is the opposite direction of next_hop, for the data plane
     bgpsec_next_asn: int | None = None
-    bgpsec_as_path: tuple[int, ...] = ()
+    bgpsec_as_path: tuple[int, ...] | ASPath = ()
     # RFC 9234 OTC attribute (Used in OnlyToCustomers Policy)
     only_to_customers: int | None = None
     # ROV++ attribute
@@ -83,6 +91,62 @@ class Announcement(YamlAble):
         else:
             return replace(self)
 
+    #########################
+    # Unchecked (fast) copy #
+    #########################
+
+    # These skip __init__ and __post_init__ (and so any validation) and set
+    # the slots directly. Use them for propagation, where anns are copied
+    # from anns that are already valid, and use .copy everywhere else
+
+    def copy_next_hop(self, next_hop_asn: int) -> "Announcement":
+        """Unchecked copy with a new next_hop_asn"""
+
+        return _get_copy_func(type(self), ("next_hop_asn",))(self, next_hop_asn)
+
+    def copy_processed(
+        self,
+        as_path: "tuple[int, ...] | ASPath",
+        recv_relationship: Relationships,
+    ) -> "Announcement":
+        """Unchecked copy of a received ann, with seed_asn set to None"""
+
+        return _get_copy_func(type(self), _PROCESSED_FIELDS)(
+            self, as_path, recv_relationship, None
+        )
+
+    def copy_bgpsec(
+        self,
+        bgpsec_next_asn: int | None,
+        bgpsec_as_path: "tuple[int, ...] | ASPath",
+    ) -> "Announcement":
+        """Unchecked copy with new bgpsec attributes"""
+
+        return _get_copy_func(type(self), _BGPSEC_FIELDS)(
+            self, bgpsec_next_asn, bgpsec_as_path
+        )
+
+    def unchecked_copy(
+        self, overwrite_default_kwargs: dict[str, Any]
+    ) -> "Announcement":
+        """Unchecked copy with any attributes overwritten"""
+
+        return _get_copy_func(type(self), tuple(overwrite_default_kwargs))(
+            self, *overwrite_default_kwargs.values()
+        )
+
+    def prepend_as_path(
+        self, asn: int, as_path: tuple[int, ...] | ASPath | None = None
+    ) -> tuple[int, ...] | ASPath:
+        """Returns the AS path (or as_path if passed) with the ASN prepended"""
+
+        if as_path is None:
+            as_path = self.as_path
+        if self.shared_as_paths:
+            return ASPath(asn, as_path)
+        else:
+            return (asn, *as_path)
+
     def __str__(self) -> str:
         return f"{self.prefix} {self.as_path} {self.recv_relationship}"
 
@@ -99,7 +163,11 @@ class Announcement(YamlAble):
     def __to_yaml_dict__(self) -> dict[str, Any]:
         """This optional method is called when you call yaml.dump()"""
 
-        return asdict(self)
+        dct = asdict(self)
+        for key in ("as_path", "bgpsec_as_path"):
+            if isinstance(dct.get(key), ASPath):
+                dct[key] = dct[key].as_tuple()
+        return dct
 
     @classmethod
     def __from_yaml_dict__(
@@ -140,3 +208,86 @@ class Announcement(YamlAble):
             stacklevel=2,
         )
         return self.bgpsec_next_asn == asn and self.bgpsec_as_path == self.as_path
+
+
+##############################
+# Unchecked copy generation #
+##############################
+
+_PROCESSED_FIELDS = ("as_path", "recv_relationship", "seed_asn")
+_BGPSEC_FIELDS = ("bgpsec_next_asn", "bgpsec_as_path")
+
+# (AnnCls, overwritten field names) -> generated copy function
+_COPY_FUNCS: dict[tuple[type, tuple[str, ...]], Callable[..., Announcement]] = dict()
+
+
+def _get_copy_func(
+    cls: type[Announcement], field_names: tuple[str, ...]
+) -> Callable[..., Announcement]:
+    """Returns the copy function for the class and overwritten fields
+
+    Functions are generated the first time an AnnCls copies a combination of
+    fields, so this also works for user subclasses (such as the
+    ScenarioConfig.AnnCls)
+    """
+
+    try:
+        return _COPY_FUNCS[cls, field_names]
+    except KeyError:
+        func = _make_copy_func(cls, field_names)
+        _COPY_FUNCS[cls, field_names] = func
+        return func
+
+
+def _make_copy_func(
+    cls: type[Announcement], field_names: tuple[str, ...]
+) -> Callable[..., Announcement]:
+    """Generates a function that copies an ann, overwriting field_names
+
+    The function takes the ann and then the new values in field_names order,
+    and sets every slot directly through its member descriptor.
+
+    If the class has fields that aren't slots, or its own __post_init__
+    (which might set derived attributes), this falls back to the checked copy
+    """
+
+    names = [x.name for x in fields(cls)]
+    if field_names and len(set(field_names)) != len(field_names):
+        raise ValueError(f"Duplicate fields in {field_names}")
+    for name in field_names:
+        if name not in names:
+            raise TypeError(f"{cls.__name__} has no field {name}")
+
+    args = [f"v{i}" for i in range(len(field_names))]
+    all_slots = all(
+        isinstance(getattr(cls, x, None), MemberDescriptorType) for x in names
+    )
+    if not all_slots or cls.__post_init__ is not Announcement.__post_init__:
+        kwargs = ", ".join(
+            f"{x}={arg}" for x, arg in zip(field_names, args, strict=True)
+        )
+        lines = [f"    return _replace(self, {kwargs})"]
+    else:
+        lines = ["    new = _new(_cls)"]
+        for name in names:
+            if name in field_names:
+                value = args[field_names.index(name)]
+            else:
+                value = f"self.{name}"
+            lines.append(f"    _set_{name}(new, {value})")
+        lines.append("    return new")
+
+    params = ", ".join(["self", *args])
+    src = f"def copy_func({params}):\n" + "\n".join(lines)
+    namespace: dict[str, Any] = {
+        "_cls": cls,
+        "_new": object.__new__,
+        "_replace": replace,
+    }
+    if all_slots:
+        for name in names:
+            namespace[f"_set_{name}"] = getattr(cls, name).__set__
+    exec(src, namespace)  # noqa: S102
+    func: Callable[..., Announcement] = namespace["copy_func"]
+    func.__qualname__ = f"{cls.__qualname__}.copy_func"
+    return func
@@ -0,0 +1,126 @@
+from collections.abc import Iterator, Sequence
+from typing import Any, overload
+
+
+class ASPath(Sequence[int]):
+    """AS path stored as a head ASN and a pointer to the (shared) tail path
+
+    Prepending an ASN to a tuple copies the whole path, so every hop of
+    propagation costs O(path length) in time and memory. An ASPath instead
+    points at the path it was prepended to, so all announcements derived from
+    the same announcement share one tail. The length, origin, and a 64 bit
+    membership mask (for fast negative loop checks) are cached per node, and
+    the tuple is only built when it's needed (slices, hashing, yaml).
+
+    ASPaths compare and hash equal to the tuple of the same path, so they can
+    be used anywhere a tuple AS path is used. This pays off for long paths and
+    for policies that store many announcements (such as BGPFull's RIBsIn).
+    Enable it with Announcement.shared_as_paths
+    """
+
+    __slots__ = ("cached_tuple", "head", "length", "mask", "origin", "tail")
+
+    def __init__(self, head: int, tail: "tuple[int, ...] | ASPath" = ()) -> None:
+        self.head: int = head
+        self.tail: tuple[int, ...] | ASPath = tail
+        self.cached_tuple: tuple[int, ...] | None = None
+        if isinstance(tail, ASPath):
+            self.length: int = tail.length + 1
+            self.origin: int = tail.origin
+            self.mask: int = tail.mask | (1 << (head & 63))
+        else:
+            self.length = len(tail) + 1
+            self.origin = tail[-1] if tail else head
+            mask = 1 << (head & 63)
+            for asn in tail:
+                mask |= 1 << (asn & 63)
+            self.mask = mask
+
+    def prepend(self, asn: int) -> "ASPath":
+        """Returns a new path with the ASN prepended, sharing this path"""
+
+        return ASPath(asn, self)
+
+    def as_tuple(self) -> tuple[int, ...]:
+        """Returns (and caches) the path as a tuple"""
+
+        if self.cached_tuple is None:
+            self.cached_tuple = tuple(self)
+        return self.cached_tuple
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __iter__(self) -> Iterator[int]:
+        node: tuple[int, ...] | ASPath = self
+        while isinstance(node, ASPath):
+            if node.cached_tuple is not None:
+                yield from node.cached_tuple
+                return
+            yield node.head
+            node = node.tail
+        yield from node
+
+    def __reversed__(self) -> Iterator[int]:
+        return reversed(self.as_tuple())
+
+    def __contains__(self, asn: object) -> bool:
+        if not isinstance(asn, int) or not (self.mask >> (asn & 63)) & 1:
+            return False
+        node: tuple[int, ...] | ASPath = self
+        while isinstance(node, ASPath):
+            if node.head == asn:
+                return True
+            node = node.tail
+        return asn in node
+
+    @overload
+    def __getitem__(self, index: int) -> int: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> tuple[int, ...]: ...
+
+    def __getitem__(self, index: int | slice) -> int | tuple[int, ...]:
+        if isinstance(index, slice):
+            return self.as_tuple()[index]
+        elif index == 0:
+            return self.head
+        elif index == -1 or index == self.length - 1:
+            return self.origin
+        elif self.cached_tuple is not None:
+            return self.cached_tuple[index]
+
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("AS path index out of range")
+        node: tuple[int, ...] | ASPath = self
+        while isinstance(node, ASPath):
+            if index == 0:
+                return node.head
+            index -= 1
+            node = node.tail
+        return node[index]
+
+    def __eq__(self, other: object) -> bool:
+        if other is self:
+            return True
+        elif isinstance(other, ASPath):
+            return self.length == other.length and self.as_tuple() == other.as_tuple()
+        elif isinstance(other, tuple):
+            return self.length == len(other) and self.as_tuple() == other
+        else:
+            return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.as_tuple())
+
+    def __repr__(self) -> str:
+        return repr(self.as_tuple())
+
+    # Immutable, so copies (such as from dataclasses.asdict) can share it
+    def __copy__(self) -> "ASPath":
+        return self
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> "ASPath":
+        return self
@@ -23,6 +23,8 @@ class ASPA(ROV):
     """
 
     name: str = "ASPA"
+    # ASPA doesn't drop anns with loops
+    prefilter_loops: bool = False
 
     def _valid_ann(self, ann: "Ann", from_rel: Relationships) -> bool:
         """Returns False if from peer/customer when aspa is set"""
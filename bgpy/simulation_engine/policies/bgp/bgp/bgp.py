@@ -18,6 +18,7 @@ from .process_incoming_funcs import (
     _get_new_best_ann,
     _reset_q,
     _valid_ann,
+    process_folded_stub_ann,
     process_incoming_anns,
     receive_ann,
     seed_ann,
@@ -38,10 +39,17 @@ if TYPE_CHECKING:
     from weakref import CallableProxyType
 
     from bgpy.as_graphs import AS
+    from bgpy.simulation_engine.announcement import Announcement as Ann
 
 
 class BGP(Policy):
     name: str = "BGP"
+    skip_when_idle: bool = True
+    streaming_receive: bool = True
+    prefilter_loops: bool = True
+    parallel_ranks: bool = True
+    foldable_stub: bool = True
+    compressible_leaf: bool = True
 
     def __init__(
         self,
@@ -61,6 +69,39 @@ class BGP(Policy):
         self.recv_q = recv_q or RecvQueue()
         # This gets set within the AS class so it's fine
         self.as_: CallableProxyType[AS] = as_  # type: ignore
+        # prefix -> (local RIB ann, copy of it that is sent to neighbors)
+        # Not part of the policy's state, just reused across propagation phases
+        self._outbound_anns: dict[str, tuple[Ann, Ann]] = dict()
+
+    def reset(self) -> None:
+        """Clears all announcements so the policy can be reused for a new run
+
+        Containers are cleared in place rather than recreated to avoid
+        reallocating them for every AS on every scenario
+        """
+
+        self.local_rib.data.clear()
+        self.recv_q.data.clear()
+        self.recv_from_rel = None
+        self._outbound_anns.clear()
+
+    def snapshot(self) -> dict[str, Any]:
+        """Returns copies of the local RIB and recv_q
+
+        Anns are immutable, so only the containers are copied
+        """
+
+        return {
+            "local_rib": self.local_rib.data.copy(),
+            "recv_q": {k: v.copy() for k, v in self.recv_q.data.items()},
+        }
+
+    def restore(self, state: dict[str, Any]) -> None:
+        """Replaces the local RIB and recv_q with copies of those from snapshot()"""
+
+        self.reset()
+        self.local_rib.data.update(state["local_rib"])
+        self.recv_q.data.update({k: v.copy() for k, v in state["recv_q"].items()})
 
     # Propagation functionality
     propagate_to_providers = propagate_to_providers
@@ -75,6 +116,7 @@ class BGP(Policy):
     seed_ann = seed_ann
     receive_ann = receive_ann
     process_incoming_anns = process_incoming_anns
+    process_folded_stub_ann = process_folded_stub_ann
     _get_new_best_ann = _get_new_best_ann
     _valid_ann = _valid_ann
     _copy_and_process = _copy_and_process
@@ -17,15 +17,24 @@ from bgpy.simulation_framework import Scenario as Scenario
 
 class BGP(Policy):
     name: str
+    skip_when_idle: bool
+    streaming_receive: bool
+    recv_from_rel: Relationships | None
+    prefilter_loops: bool
+    parallel_ranks: bool
     local_rib: Incomplete
     recv_q: Incomplete
     as_: Incomplete
+    _outbound_anns: dict[str, tuple[Ann, Ann]]
     def __init__(
         self,
         local_rib: LocalRIB | None = None,
         recv_q: RecvQueue | None = None,
         as_: AS | None = None,
     ) -> None: ...
+    def reset(self) -> None: ...
+    def snapshot(self) -> dict[str, Any]: ...
+    def restore(self, state: dict[str, Any]) -> None: ...
     def _get_best_ann_by_gao_rexford(
         self, current_ann: Ann | None, new_ann: Ann
     ) -> Ann: ...
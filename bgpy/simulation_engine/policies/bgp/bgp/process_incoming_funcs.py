@@ -1,9 +1,8 @@
 from typing import TYPE_CHECKING, Any
 
-from bgpy.simulation_engine.ann_containers import RecvQueue
+from bgpy.shared.enums import Relationships
 
 if TYPE_CHECKING:
-    from bgpy.shared.enums import Relationships
     from bgpy.simulation_engine.announcement import Announcement as Ann
     from bgpy.simulation_framework import Scenario
 
@@ -22,12 +21,63 @@ def seed_ann(self: "BGP", ann: "Ann") -> None:
     assert self.local_rib.get(ann.prefix) is None, err
     # Seed by placing in the local rib
     self.local_rib.add_ann(ann)
+    # So that engines send it (see Policy.active_ases)
+    if self.active_ases is not None:
+        self.active_ases.add_seeded(self.as_)
 
 
 def receive_ann(self: "BGP", ann: "Ann") -> None:
-    """Function for recieving announcements, adds to recv_q"""
+    """Function for recieving announcements, adds to recv_q
 
-    self.recv_q.add_ann(ann)
+    If the engine is streaming anns (recv_from_rel is set), the ann is only
+    kept if it's valid and better than both the local RIB ann and the best
+    ann received so far, so the recv_q holds one ann per prefix
+    """
+
+    from_rel = self.recv_from_rel
+    if from_rel is None:
+        # So that engines process the recv_q (see Policy.active_ases)
+        if not self.recv_q.data and self.active_ases is not None:
+            self.active_ases.add_received(self.as_)
+        self.recv_q.add_ann(ann)
+        return
+
+    # Compare as if processed, so len + 1, and as_path[0] becomes as_path[1]
+    # Ties keep the current ann, same as _get_best_ann_by_gao_rexford
+    prefix = ann.prefix
+    new_len = len(ann.as_path) + 1
+    new_neighbor_asn = ann.as_path[0]
+    recv_anns = self.recv_q.data.get(prefix)
+    if recv_anns:
+        # Has the same recv_relationship and already beats the local RIB ann
+        best_ann = recv_anns[0]
+        best_len = len(best_ann.as_path) + 1
+        if best_len < new_len or (
+            best_len == new_len and best_ann.as_path[0] <= new_neighbor_asn
+        ):
+            return
+    else:
+        current_ann = self.local_rib.data.get(prefix)
+        if current_ann is not None:
+            current_rel = current_ann.recv_relationship.value
+            if current_rel > from_rel.value:
+                return
+            elif current_rel == from_rel.value:
+                current_len = len(current_ann.as_path)
+                if current_len < new_len or (
+                    current_len == new_len
+                    and current_ann.as_path[1] <= new_neighbor_asn
+                ):
+                    return
+
+    # Only validate anns that would be selected
+    if self._valid_ann(ann, from_rel):
+        if recv_anns:
+            recv_anns[0] = ann
+        else:
+            if not self.recv_q.data and self.active_ases is not None:
+                self.active_ases.add_received(self.as_)
+            self.recv_q.data[prefix] = [ann]
 
 
 def process_incoming_anns(
@@ -40,6 +90,14 @@ def process_incoming_anns(
 ) -> None:
     """Process all announcements that were incoming from a specific rel"""
 
+    if self.recv_from_rel is not None:
+        assert self.recv_from_rel == from_rel, "Streamed from a different rel"
+        # Streamed anns are valid and beat the local RIB ann (see receive_ann)
+        for (ann,) in self.recv_q.data.values():
+            self.local_rib.add_ann(self._copy_and_process(ann, from_rel))
+        self._reset_q(reset_q)
+        return
+
     # For each prefix, get all anns recieved
     for prefix, ann_list in self.recv_q.items():
         # Get announcement currently in local rib
@@ -60,6 +118,19 @@ def process_incoming_anns(
     self._reset_q(reset_q)
 
 
+def process_folded_stub_ann(self: "BGP", ann: "Ann") -> "Ann | None":
+    """Returns the ann a folded stub keeps if its provider sends ann
+
+    Same as receiving and processing ann from the provider with nothing in
+    the local RIB, which is all a folded stub has (see Policy.foldable_stub)
+    """
+
+    if self._valid_ann(ann, Relationships.PROVIDERS):
+        return self._copy_and_process(ann, Relationships.PROVIDERS)
+    else:
+        return None
+
+
 def _get_new_best_ann(
     self: "BGP", current_ann: "Ann | None", new_ann: "Ann", from_rel: "Relationships"
 ) -> "Ann | None":
@@ -103,20 +174,23 @@ def _copy_and_process(
     Prepends AS to AS Path and sets recv_relationship
     """
 
+    as_path = ann.prepend_as_path(self.as_.asn)
+    if not overwrite_default_kwargs:
+        return ann.copy_processed(as_path, recv_relationship)
+
     kwargs: dict[str, Any] = {
-        "as_path": (self.as_.asn, *ann.as_path),
+        "as_path": as_path,
         "recv_relationship": recv_relationship,
         "seed_asn": None,
     }
-
-    if overwrite_default_kwargs:
-        kwargs.update(overwrite_default_kwargs)
+    kwargs.update(overwrite_default_kwargs)
     # Don't use a dict comp here for speed
-    return ann.copy(overwrite_default_kwargs=kwargs)
+    return ann.unchecked_copy(kwargs)
 
 
 def _reset_q(self: "BGP", reset_q: bool) -> None:
     """Resets the recieve q"""
 
     if reset_q:
-        self.recv_q = RecvQueue()
+        # Clear in place rather than making a new RecvQueue every time
+        self.recv_q.data.clear()
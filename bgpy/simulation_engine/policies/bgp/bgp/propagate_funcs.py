@@ -65,19 +65,40 @@ def _propagate(
     else:
         raise NotImplementedError
 
-    for _prefix, unprocessed_ann in self.local_rib.items():
-        # Starting in v4 we must set the next_hop when sending
-        # Copying announcements is a bottleneck for sims,
-        # so we try to do this as little as possible
-        if neighbors and unprocessed_ann.recv_relationship in send_rels:
-            ann = unprocessed_ann.copy({"next_hop_asn": self.as_.asn})
-        else:
+    if not neighbors:
+        return
+
+    asn = self.as_.asn
+    prefilter_loops = self.prefilter_loops
+    outbound_anns = self._outbound_anns
+    for prefix, unprocessed_ann in self.local_rib.items():
+        if unprocessed_ann.recv_relationship not in send_rels:
             continue
 
+        ann: Ann | None = None
         for neighbor in neighbors:
-            if ann.recv_relationship in send_rels and not self._prev_sent(
-                neighbor, ann
+            # Don't send anns that the neighbor would drop due to a loop
+            # (see Policy.prefilter_loops)
+            if (
+                prefilter_loops
+                and neighbor.policy.prefilter_loops
+                and neighbor.asn in unprocessed_ann.as_path
             ):
+                continue
+            # Starting in v4 we must set the next_hop when sending
+            # Copying announcements is a bottleneck for sims,
+            # so we try to do this as little as possible. Only copy once a
+            # neighbor will get the ann, and reuse the copy in later
+            # phases while the local RIB ann is unchanged
+            if ann is None:
+                cached = outbound_anns.get(prefix)
+                if cached is not None and cached[0] is unprocessed_ann:
+                    ann = cached[1]
+                else:
+                    ann = unprocessed_ann.copy_next_hop(asn)
+                    outbound_anns[prefix] = (unprocessed_ann, ann)
+
+            if not self._prev_sent(neighbor, ann):
                 # Policy took care of it's own propagation for this ann
                 if self._policy_propagate(neighbor, ann, propagate_to, send_rels):
                     continue
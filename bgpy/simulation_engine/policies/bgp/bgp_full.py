@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 from warnings import warn
 
 from bgpy.shared.enums import Relationships
@@ -13,6 +13,18 @@ if TYPE_CHECKING:
 
 class BGPFull(BGP):
     name = "BGP Full"
+    # Withdrawals are only sent while processing received anns
+    skip_when_idle: bool = True
+    # Every received ann is needed for the RIBsIn
+    streaming_receive: bool = False
+    # Every ann sent is needed for the RIBsIn and RIBsOut
+    prefilter_loops: bool = False
+    # Withdrawals are sent while processing
+    parallel_ranks: bool = False
+    # Stubs must still get and track (withdrawn) anns in their RIBsIn
+    foldable_stub: bool = False
+    # Same for leaves
+    compressible_leaf: bool = False
 
     def __init__(
         self,
@@ -25,6 +37,31 @@ class BGPFull(BGP):
         self.ribs_in: RIBsIn = ribs_in or RIBsIn()
         self.ribs_out: RIBsOut = ribs_out or RIBsOut()
 
+    def reset(self) -> None:
+        """Clears all announcements so the policy can be reused for a new run"""
+
+        super().reset()
+        self.ribs_in.data.clear()
+        self.ribs_out.data.clear()
+
+    def snapshot(self) -> dict[str, Any]:
+        """Returns copies of the local RIB, recv_q, RIBsIn, and RIBsOut
+
+        AnnInfos are never modified in place, so like anns they are shared
+        """
+
+        state = super().snapshot()
+        state["ribs_in"] = {k: v.copy() for k, v in self.ribs_in.data.items()}
+        state["ribs_out"] = {k: v.copy() for k, v in self.ribs_out.data.items()}
+        return state
+
+    def restore(self, state: dict[str, Any]) -> None:
+        """Replaces the RIBs with copies of those from snapshot()"""
+
+        super().restore(state)
+        self.ribs_in.data.update({k: v.copy() for k, v in state["ribs_in"].items()})
+        self.ribs_out.data.update({k: v.copy() for k, v in state["ribs_out"].items()})
+
     #########################
     # Process incoming anns #
     #########################
@@ -17,6 +17,8 @@ class BGPiSec(BGPiSecTransitiveOnlyToCustomers):
     """
 
     name = "BGP-iSec"
+    # Only drops more anns than BGP-iSec Transitive + OTC
+    prefilter_loops: bool = True
 
     def _valid_ann(self, ann: "Ann", from_rel: "Relationships") -> bool:
         """Determines bgp-isec transitive + OTC + ProviderConeValid + super"""
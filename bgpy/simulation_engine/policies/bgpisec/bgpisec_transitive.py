@@ -13,6 +13,9 @@ class BGPiSecTransitive(BGPSec):
     """Represents BGPiSec Transitive attributes"""
 
     name = "BGP-iSec Transitive Only"
+    # Only sets and checks BGP-iSec attributes on top of BGPsec's
+    prefilter_loops: bool = True
+    parallel_ranks: bool = True
 
     # Doesn't change the path preference mechanism so that it's easier to deploy
     # and path preference has no benefit
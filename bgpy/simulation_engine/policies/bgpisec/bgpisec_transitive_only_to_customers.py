@@ -14,6 +14,8 @@ class BGPiSecTransitiveOnlyToCustomers(BGPiSecTransitive):
     """Represents BGPiSec Transitive attributes"""
 
     name = "BGP-iSec Transitive + OTC"
+    # OTC only drops more anns, and sets the OTC attribute when sending
+    prefilter_loops: bool = True
 
     def _valid_ann(self, ann: "Ann", from_rel: "Relationships") -> bool:
         """Determines bgp-isec transitive+OTC validity and super() validity"""
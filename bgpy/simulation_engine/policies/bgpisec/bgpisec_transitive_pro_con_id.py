@@ -17,6 +17,8 @@ class BGPiSecTransitiveProConID(BGPiSecTransitive):
     """
 
     name = "BGP-iSec Transitive + ProConID"
+    # The provider cone check only drops more anns
+    prefilter_loops: bool = True
 
     def _valid_ann(self, ann: "Ann", from_rel: "Relationships") -> bool:
         """Determines bgp-isec transitive validity and super() validity"""
@@ -16,6 +16,8 @@ class ProviderConeID(ROV):
     """
 
     name = "ProviderConeID"
+    # Only drops more anns than ROV
+    prefilter_loops: bool = True
 
     def _valid_ann(
         self,
@@ -35,19 +37,22 @@ class ProviderConeID(ROV):
         """Determines provider cone validity from customers"""
 
         if from_rel == Relationships.CUSTOMERS:
-            as_dict = self.as_.as_graph.as_dict
-            provider_cone_asns = as_dict[ann.origin].provider_cone_asns
+            as_graph = self.as_.as_graph
+            as_dict = as_graph.as_dict
+            cones = as_graph.cones
             Cls = self.__class__
-            if provider_cone_asns is None:
+            if cones.provider_cones is None:
                 raise ValueError(
                     "Provider cones must be set for this policy to work, see params "
                     "to simulation.py in the simulation_framework of bgpy"
                 )
+            provider_cone = cones.bitset(ann.origin, Relationships.PROVIDERS)
             # We don't look at the last ASN in the path, since that's the origin
             # The ASes ASN is also not yet in the announcement, so we add it here
             for asn in (self.as_.asn, *ann.as_path[:-1]):
                 # not in provider cone of the origin, and is adopting
-                if asn not in provider_cone_asns and isinstance(
+                bit = cones.get_bit(asn, Relationships.PROVIDERS)
+                if not provider_cone >> bit & 1 and isinstance(
                     as_dict[asn].policy, Cls
                 ):
                     return False
@@ -23,6 +23,15 @@ class BGPSec(ROV):
     """
 
     name = "BGPsec"
+    # Only sets the BGPsec path of seeded, received, and sent anns
+    skip_when_idle: bool = True
+    prefilter_loops: bool = True
+    parallel_ranks: bool = True
+    # Security is part of the path selection
+    streaming_receive: bool = False
+    # BGPsec paths are changed for each neighbor that anns are sent to
+    foldable_stub: bool = False
+    compressible_leaf: bool = False
 
     def seed_ann(self, ann: "Ann") -> None:
         """Seeds announcement at this AS and initializes BGPSec path"""
@@ -56,7 +65,7 @@ class BGPSec(ROV):
         else:
             next_asn = None
             path = ()
-        send_ann = ann.copy({"bgpsec_next_asn": next_asn, "bgpsec_as_path": path})
+        send_ann = ann.copy_bgpsec(next_asn, path)
         self._process_outgoing_ann(neighbor, send_ann, propagate_to, send_rels)
         return True
 
@@ -72,7 +81,7 @@ class BGPSec(ROV):
         prepends ASN if valid, otherwise clears
         """
         if self.bgpsec_valid(ann, self.as_.asn):
-            bgpsec_as_path = (self.as_.asn, *ann.bgpsec_as_path)
+            bgpsec_as_path = ann.prepend_as_path(self.as_.asn, ann.bgpsec_as_path)
         else:
             bgpsec_as_path = ()
 
@@ -17,6 +17,16 @@ class ShortestPathPrefixASPAAttacker(BGP):
     customers the ShortestPathPrefix is a forged-origin hijack
     """
 
+    # Customers get a different ann than the one in the local RIB
+    foldable_stub: bool = False
+    # process_incoming_anns only checks the scenario before processing like BGP
+    # does, and _policy_propagate sends the same ann to every customer
+    skip_when_idle: bool = True
+    streaming_receive: bool = True
+    prefilter_loops: bool = True
+    parallel_ranks: bool = True
+    compressible_leaf: bool = True
+
     def process_incoming_anns(
         self,
         *,
@@ -11,6 +11,8 @@ class EdgeFilter(BGP):
     """Prevents edge ASes from paths containing ASNs they don't own"""
 
     name: str = "EdgeFilter"
+    # Only drops more anns than BGP
+    prefilter_loops: bool = True
 
     def _valid_ann(self, ann: "Ann", from_rel: "Relationships") -> bool:
         """Returns invalid if an edge AS is announcing paths containing other ASNs
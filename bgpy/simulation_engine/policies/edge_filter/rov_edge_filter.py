@@ -11,6 +11,8 @@ class ROVEdgeFilter(EdgeFilter):
     """Prevents edge ASes from paths containing ASNs they don't own (w/ROV)"""
 
     name: str = "ROV + EdgeFilter"
+    # ROV only drops more anns than EdgeFilter
+    prefilter_loops: bool = True
 
     def _valid_ann(self, ann: "Ann", from_rel: "Relationships") -> bool:
         """ROV+EdgeFilter"""
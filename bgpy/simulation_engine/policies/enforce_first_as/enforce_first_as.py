@@ -15,6 +15,8 @@ class EnforceFirstAS(BGP):
     """
 
     name: str = "Enforce-First-AS"
+    # Only drops more anns than BGP
+    prefilter_loops: bool = True
 
     def _valid_ann(self, ann: "Ann", from_rel: "Relationships") -> bool:
         """Returns False if first ASN is not a neighbor, else True"""
@@ -15,6 +15,8 @@ class ROVEnforceFirstAS(EnforceFirstAS):
     """
 
     name: str = "ROV + Enforce-First-AS"
+    # ROV only drops more anns than Enforce-First-AS
+    prefilter_loops: bool = True
 
     def _valid_ann(self, ann: "Ann", from_rel: "Relationships") -> bool:
         """Returns False if first ASN is not a neighbor (or invalid ROV), else True"""
@@ -12,6 +12,12 @@ class OnlyToCustomers(BGP):
     """An Policy that deploys OnlyToCustomers"""
 
     name: str = "OnlyToCustomers"
+    # OTC only drops more anns, and sets the OTC attribute the same way for
+    # every neighbor of a relationship
+    prefilter_loops: bool = True
+    compressible_leaf: bool = True
+    # The OTC attribute is added to anns sent to customers
+    foldable_stub: bool = False
 
     def _valid_ann(self, ann: "Ann", from_rel: Rels) -> bool:
         """Returns False if from peer/customer when only_to_customers is set"""
@@ -11,6 +11,8 @@ class PathEnd(ROV):
     """An Policy that deploys Path-End"""
 
     name: str = "Path-End"
+    # Only drops more anns than ROV
+    prefilter_loops: bool = True
 
     def _valid_ann(self, ann: "Ann", recv_rel: "Relationships") -> bool:
         """Returns announcement validity by checking pathend records"""
@@ -11,6 +11,8 @@ class PeerlockLite(BGP):
     """A policy that does PeerlockLite"""
 
     name: str = "Peerlock Lite"
+    # Only drops more anns than BGP
+    prefilter_loops: bool = True
 
     def _valid_ann(self, ann: "Ann", recv_rel: "Relationships") -> bool:
         """Returns announcement validity
@@ -8,8 +8,52 @@ from yamlable import YamlAble, yaml_info_decorate
 if TYPE_CHECKING:
     from bgpy.shared.enums import Relationships
     from bgpy.simulation_engine import Announcement as Ann
+    from bgpy.simulation_engine.simulation_engines import ActiveASes
     from bgpy.simulation_framework import Scenario
 
+# The methods that each engine optimization flag relies on. A subclass that
+# overrides any of them is opted out of the flag, unless it sets the flag in
+# its own class body (see Policy.__init_subclass__)
+_FLAG_HOOKS: dict[str, tuple[str, ...]] = {
+    "skip_when_idle": (
+        "receive_ann",
+        "seed_ann",
+        "process_incoming_anns",
+        "propagate_to_providers",
+        "propagate_to_peers",
+        "propagate_to_customers",
+    ),
+    "streaming_receive": (
+        "receive_ann",
+        "process_incoming_anns",
+        "_get_new_best_ann",
+        "_copy_and_process",
+    ),
+    "prefilter_loops": (
+        "receive_ann",
+        "process_incoming_anns",
+        "_valid_ann",
+        "_policy_propagate",
+    ),
+    "parallel_ranks": ("receive_ann", "process_incoming_anns", "_copy_and_process"),
+    "foldable_stub": (
+        "receive_ann",
+        "process_incoming_anns",
+        "_copy_and_process",
+        "propagate_to_customers",
+        "_policy_propagate",
+    ),
+    "compressible_leaf": (
+        "receive_ann",
+        "process_incoming_anns",
+        "_copy_and_process",
+        "propagate_to_providers",
+        "propagate_to_peers",
+        "propagate_to_customers",
+        "_policy_propagate",
+    ),
+}
+
 
 class Policy(YamlAble, metaclass=ABCMeta):
     name: str = "AbstractPolicy"
@@ -17,14 +61,74 @@ class Policy(YamlAble, metaclass=ABCMeta):
     name_to_subclass_dict: ClassVar[dict[str, type["Policy"]]] = dict()
     # Simulates RPKI and something like routinator that is globally available
     roa_checker: ROAChecker = ROAChecker()
+    # If True, engines may skip process_incoming_anns when the recv_q is empty
+    # and propagate_to_* when the local_rib is empty. Policies that do work
+    # with nothing incoming (i.e. adding blackholes) must leave this as False
+    skip_when_idle: bool = False
+    # Set by engines that skip idle ASes, for policies with skip_when_idle.
+    # Such policies must add their AS to it whenever an ann is received into
+    # their empty recv_q, or seeded into their local RIB (see BGP.receive_ann
+    # and BGP.seed_ann), since engines only visit the ASes added to it
+    active_ases: "ActiveASes | None" = None
+    # If True, the policy can select the best ann for each prefix as anns are
+    # received rather than queueing all of them (see StreamingSimulationEngine).
+    # Policies that need every received ann, or that change the Gao Rexford
+    # selection, must leave this as False
+    streaming_receive: bool = False
+    # The relationship anns are being received from, set by engines that
+    # stream anns. None when anns are queued
+    recv_from_rel: "Relationships | None" = None
+    # If True for both the sender and the receiver, anns that would loop at
+    # the receiver aren't sent at all. Policies that accept looping anns, or
+    # that need (or track sending) anns the receiver drops, such as the RIBsIn
+    # and RIBsOut of BGPFull, must leave this as False
+    prefilter_loops: bool = False
+    # If True, engines may process and propagate the ASes of a propagation rank
+    # in parallel (see ThreadedSimulationEngine). Policies that send anns to
+    # other ASes while processing, such as withdrawals in BGPFull, must leave
+    # this as False
+    parallel_ranks: bool = False
+    # If True for a single-homed stub and its provider, engines may leave the
+    # stub out of propagation (see SimulationEngine fold_stubs). The stub's
+    # outcome is then found from its provider's local RIB, with each ann that
+    # the provider would send it filtered by the stub's _valid_ann. So this
+    # policy must only filter and select the anns it receives, and must send
+    # its local RIB to customers unchanged. Policies that do anything else,
+    # such as adding blackholes or attributes, must leave this as False
+    foldable_stub: bool = False
+    # If True for ASes with no customers and the same providers and peers, and
+    # for all of their neighbors, engines may propagate to just one of them
+    # (see SimulationEngine compress_leaves). The others get a copy of its
+    # anns with their own ASN at the start of the AS path. So processing a
+    # received ann must only depend on the ann, the relationship it's from,
+    # and the AS's neighbors, and every neighbor of the same relationship must
+    # be sent the same ann. Policies that do anything else must leave this as
+    # False
+    compressible_leaf: bool = False
 
     def __init_subclass__(cls: type["Policy"], *args, **kwargs) -> None:
         """This method essentially creates a list of all subclasses
 
         This allows us to know all AS types that have been created
+
+        It also opts subclasses out of the engine optimization flags (such as
+        skip_when_idle and prefilter_loops) whose methods they override, since
+        a flag that is True for a parent class was only checked against the
+        parent's methods. Likewise, a flag is only inherited as True if every
+        parent class has it. Subclasses that still support the flag must set
+        it in their own class body
         """
 
         super().__init_subclass__(*args, **kwargs)
+        class_attrs = vars(cls)
+        for flag, hooks in _FLAG_HOOKS.items():
+            if flag not in class_attrs:
+                setattr(
+                    cls,
+                    flag,
+                    all(getattr(base, flag, True) for base in cls.__bases__)
+                    and not any(x in class_attrs for x in hooks),
+                )
         assert hasattr(cls, "name"), "Policy must have a name"
         yaml_info_decorate(cls, yaml_tag=cls.name)
         cls.subclass_to_name_dict[cls] = cls.name
@@ -44,6 +148,40 @@ class Policy(YamlAble, metaclass=ABCMeta):
         else:
             return NotImplemented
 
+    @abstractmethod
+    def reset(self) -> None:
+        """Clears all announcements so the policy can be reused for a new run"""
+
+        raise NotImplementedError
+
+    @abstractmethod
+    def snapshot(self) -> Any:
+        """Returns copies of the policy's RIBs (see EngineSnapshot)"""
+
+        raise NotImplementedError
+
+    @abstractmethod
+    def restore(self, state: Any) -> None:
+        """Replaces the policy's RIBs with copies of those from snapshot()"""
+
+        raise NotImplementedError
+
+    @classmethod
+    def snapshot_shared(cls) -> Any:
+        """Returns a copy of the state shared by every AS with this policy
+
+        Such as a class-level repository that every AS adds to. None if there
+        isn't any (see EngineSnapshot)
+        """
+
+        return None
+
+    @classmethod
+    def restore_shared(cls, state: Any) -> None:
+        """Replaces the shared state with a copy of that from snapshot_shared()"""
+
+        return None
+
     ##########################
     # Process incoming funcs #
     ##########################
@@ -67,6 +205,14 @@ class Policy(YamlAble, metaclass=ABCMeta):
 
         raise NotImplementedError
 
+    def process_folded_stub_ann(self, ann: "Ann") -> "Ann | None":
+        """Returns the ann a folded stub keeps if its provider sends ann
+
+        Only needed if foldable_stub is True (see Policy.foldable_stub)
+        """
+
+        raise NotImplementedError
+
     #####################
     # Propagation funcs #
     #####################
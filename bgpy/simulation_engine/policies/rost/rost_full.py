@@ -14,6 +14,8 @@ class RoSTFull(BGPFullIgnoreInvalid):
     """
 
     name = "RoST Full"
+    # Suppressed withdrawals are re-added to the recv_q even when it's empty
+    skip_when_idle = False
 
     rost_trusted_repository = RoSTTrustedRepository()
 
@@ -21,6 +23,27 @@ class RoSTFull(BGPFullIgnoreInvalid):
         self.rost_trusted_repository.clear()
         super().__init__(*args, **kwargs)
 
+    def reset(self) -> None:
+        """Clears all announcements and the RoST trusted repository"""
+
+        self.rost_trusted_repository.clear()
+        super().reset()
+
+    @classmethod
+    def snapshot_shared(cls) -> RoSTTrustedRepository:
+        """Returns a copy of the trusted repository, which all RoST ASes share"""
+
+        return cls.rost_trusted_repository.copy()
+
+    @classmethod
+    def restore_shared(cls, state: RoSTTrustedRepository) -> None:
+        """Replaces the trusted repository with a copy of the snapshot's
+
+        Replaced in place, so that subclasses keep sharing the same repository
+        """
+
+        cls.rost_trusted_repository.replace(state)
+
     def withdraw_ann_from_neighbors(self, withdraw_ann: Ann) -> None:
         """Adds withdrawals you create to RoST Trusted Repo"""
 
@@ -1,3 +1,4 @@
+from copy import deepcopy
 from dataclasses import dataclass, field
 
 from bgpy.simulation_engine.announcement import Announcement as Ann
@@ -43,8 +44,21 @@ class RoSTTrustedRepository:
     def clear(self) -> None:
         self.__init__()  # type: ignore
 
+    def copy(self) -> "RoSTTrustedRepository":
+        """Returns a copy that shares nothing with this repository"""
+
+        repository = RoSTTrustedRepository()
+        repository.replace(self)
+        return repository
+
+    def replace(self, other: "RoSTTrustedRepository") -> None:
+        """Replaces the withdrawals with a copy of those in the other repository"""
+
+        root = other._withdrawal_as_path_root  # noqa: SLF001
+        self._withdrawal_as_path_root = deepcopy(root)
+
     def add_ann(self, ann: Ann) -> None:
-        key = (ann.prefix, ann.as_path)
+        key = (ann.prefix, tuple(ann.as_path))
         current_node = self._withdrawal_as_path_root
         for asn in ann.as_path[::-1]:
             if asn not in current_node.as_path_branches:
@@ -11,6 +11,8 @@ class PeerROV(BGP):
     """An Policy that deploys ROV only for peers"""
 
     name: str = "PeerROV"
+    # Invalid anns from peers are dropped on top of the loops that BGP drops
+    prefilter_loops: bool = True
 
     def _valid_ann(self, ann: "Ann", recv_rel: "Relationships") -> bool:
         """Returns announcement validity
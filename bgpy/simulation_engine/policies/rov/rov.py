@@ -11,6 +11,8 @@ class ROV(BGP):
     """An Policy that deploys ROV"""
 
     name: str = "ROV"
+    # Invalid anns are dropped on top of the loops that BGP drops
+    prefilter_loops: bool = True
 
     def _valid_ann(self, ann: "Ann", recv_rel: "Relationships") -> bool:
         """Returns announcement validity
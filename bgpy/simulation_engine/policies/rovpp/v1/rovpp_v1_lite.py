@@ -16,6 +16,17 @@ class ROVPPV1Lite(ROV):
     """
 
     name: str = "ROV++V1 Lite"
+    # Blackholes are added and holes recounted even with an empty recv_q
+    skip_when_idle: bool = False
+    # Blackholes are only added to this AS's own local RIB
+    parallel_ranks: bool = True
+    # Every received ann is needed to find blackholes
+    streaming_receive: bool = False
+    prefilter_loops: bool = False
+    # Blackholes are sent to customers and added to stubs
+    foldable_stub: bool = False
+    # Blackholes depend on the neighbor that an ann came from
+    compressible_leaf: bool = False
 
     def _policy_propagate(
         self,
@@ -1,4 +1,17 @@
+from .active_ases import ActiveASes
+from .array_simulation_engine import ArraySimulationEngine
 from .base_simulation_engine import BaseSimulationEngine
+from .engine_snapshot import EngineSnapshot
 from .simulation_engine import SimulationEngine
+from .streaming_simulation_engine import StreamingSimulationEngine
+from .threaded_simulation_engine import ThreadedSimulationEngine
 
-__all__ = ["BaseSimulationEngine", "SimulationEngine"]
+__all__ = [
+    "ActiveASes",
+    "ArraySimulationEngine",
+    "BaseSimulationEngine",
+    "EngineSnapshot",
+    "SimulationEngine",
+    "StreamingSimulationEngine",
+    "ThreadedSimulationEngine",
+]
@@ -0,0 +1,133 @@
+from collections.abc import Iterable
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from bgpy.as_graphs import AS, ASGraph
+
+
+class ActiveASes:
+    """The ASes that have work to do in each step of propagation
+
+    Engines only visit these ASes, so that idle ASes (nothing in their recv_q
+    to process, and nothing in their local RIB to send) are never visited.
+
+    ASes whose policies have skip_when_idle are only visited once they have
+    work. Their policies add themselves here when an ann is received into an
+    empty recv_q or seeded (see Policy.active_ases). Once processed or seeded,
+    an AS may have anns to send, so it's visited in every sending step after
+    that. ASes whose policies don't have skip_when_idle are visited in every
+    step, like the policies' docs require.
+
+    ASes are kept by AS.index and bucketed by propagation rank, and each step
+    visits them in AS.index order, which is the order of the propagation
+    ranks. So the order ASes are visited in doesn't depend on the order in
+    which they became active
+    """
+
+    def __init__(self) -> None:
+        # ASes by AS.index
+        self._ases: list[AS] = list()
+        # Propagation rank by AS.index
+        self._ranks: list[int] = list()
+        # Per propagation rank, the AS.index of ASes visited in every step
+        self._always_active: list[frozenset[int]] = list()
+        # Per propagation rank, the AS.index of ASes with anns to process
+        self._receivers: list[set[int]] = list()
+        # Per propagation rank, the AS.index of ASes that may have anns to send
+        self._senders: list[set[int]] = list()
+
+    def reset(self, as_graph: "ASGraph") -> None:
+        """Starts tracking the ASes of the graph, with nothing active
+
+        Must be called whenever policies are replaced (see
+        SimulationEngine.setup), since policies are only tracked once they
+        point to this (see Policy.active_ases)
+        """
+
+        self._ases = [as_obj for rank in as_graph.propagation_ranks for as_obj in rank]
+        self._ranks = list()
+        self._always_active = list()
+        for rank_index, rank in enumerate(as_graph.propagation_ranks):
+            self._ranks.extend([rank_index] * len(rank))
+            always_active = list()
+            for as_obj in rank:
+                policy = as_obj.policy
+                if policy.skip_when_idle:
+                    policy.active_ases = self
+                else:
+                    policy.active_ases = None
+                    assert as_obj.index is not None, "mypy type check"
+                    always_active.append(as_obj.index)
+            self._always_active.append(frozenset(always_active))
+        self._receivers = [set() for _ in as_graph.propagation_ranks]
+        self._senders = [set() for _ in as_graph.propagation_ranks]
+
+    ################
+    # Policy funcs #
+    ################
+
+    def add_received(self, as_obj: "AS") -> None:
+        """Adds an AS that received an ann into its empty recv_q"""
+
+        i = as_obj.index
+        assert i is not None, "mypy type check"
+        self._receivers[self._ranks[i]].add(i)
+
+    def add_seeded(self, as_obj: "AS") -> None:
+        """Adds an AS that had an ann seeded into its local RIB"""
+
+        i = as_obj.index
+        assert i is not None, "mypy type check"
+        self._senders[self._ranks[i]].add(i)
+
+    ################
+    # Engine funcs #
+    ################
+
+    def add_restored_ases(self, as_graph: "ASGraph") -> None:
+        """Adds the ASes whose restored recv_q or local RIB isn't empty
+
+        Restored policies don't add themselves (see SimulationEngine.restore)
+        """
+
+        for as_obj in as_graph:
+            policy = as_obj.policy
+            if policy.active_ases is self:
+                if getattr(policy, "recv_q", None):
+                    self.add_received(as_obj)
+                if getattr(policy, "local_rib", None):
+                    self.add_seeded(as_obj)
+
+    def add_senders(self, indices: Iterable[int]) -> None:
+        """Adds ASes (by AS.index) whose local RIBs were filled by the engine"""
+
+        ranks = self._ranks
+        senders = self._senders
+        for i in indices:
+            senders[ranks[i]].add(i)
+
+    def pop_receivers(self, rank: int | None = None) -> list["AS"]:
+        """Returns the ASes to process, of a propagation rank or of all of them
+
+        Popped ASes are expected to be processed, and so may send anns after
+        """
+
+        ranks = range(len(self._receivers)) if rank is None else (rank,)
+        indices: set[int] = set()
+        for i in ranks:
+            receivers = self._receivers[i]
+            self._senders[i].update(receivers)
+            indices.update(receivers, self._always_active[i])
+            receivers.clear()
+        ases = self._ases
+        return [ases[i] for i in sorted(indices)]
+
+    def get_senders(self, rank: int | None = None) -> list["AS"]:
+        """Returns the ASes to send from, of a propagation rank or of all of them"""
+
+        ranks = range(len(self._senders)) if rank is None else (rank,)
+        indices: set[int] = set()
+        for i in ranks:
+            indices.update(self._senders[i], self._always_active[i])
+        ases = self._ases
+        return [ases[i] for i in sorted(indices)]
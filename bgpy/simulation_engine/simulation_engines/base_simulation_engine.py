@@ -4,6 +4,8 @@ from typing import TYPE_CHECKING, Any, Optional
 
 from yamlable import YamlAble, yaml_info, yaml_info_decorate
 
+from .engine_snapshot import EngineSnapshot
+
 # https://stackoverflow.com/a/57005931/8903959
 if TYPE_CHECKING:
     from bgpy.as_graphs import ASGraph
@@ -78,6 +80,56 @@ class BaseSimulationEngine(YamlAble, ABC):
 
         raise NotImplementedError
 
+    ##################
+    # Snapshot funcs #
+    ##################
+
+    def snapshot(self) -> EngineSnapshot:
+        """Returns a snapshot of every AS's RIBs and the ready_to_run_round
+
+        Along with the folded stubs and compressed leaves, and the state each
+        policy class shares between its ASes
+        """
+
+        return EngineSnapshot(
+            ready_to_run_round=self.ready_to_run_round,
+            policy_states={
+                as_obj.asn: (type(as_obj.policy), as_obj.policy.snapshot())
+                for as_obj in self.as_graph
+            },
+            folded_stub_provider_asns=dict(self.as_graph.folded_stub_provider_asns),
+            compressed_leaf_representative_asns=dict(
+                self.as_graph.compressed_leaf_representative_asns
+            ),
+            shared_policy_states={
+                PolicyCls: PolicyCls.snapshot_shared()
+                for PolicyCls in {type(as_obj.policy) for as_obj in self.as_graph}
+            },
+        )
+
+    def restore(self, snapshot: EngineSnapshot) -> None:
+        """Restores every AS's RIBs and the ready_to_run_round from a snapshot
+
+        Policies are replaced if their class differs from the snapshot's, and
+        the stubs and leaves that were folded and compressed are again.
+        The snapshot isn't modified, so it can be restored any number of times
+        """
+
+        self.as_graph.fold_stubs(snapshot.folded_stub_provider_asns)
+        self.as_graph.compress_leaves(snapshot.compressed_leaf_representative_asns)
+        as_dict = self.as_graph.as_dict
+        for asn, (PolicyCls, state) in snapshot.policy_states.items():
+            as_obj = as_dict[asn]
+            if type(as_obj.policy) is not PolicyCls:
+                # Remove references so that RAM can be reclaimed
+                del as_obj.policy.as_
+                as_obj.policy = PolicyCls(as_=as_obj)
+            as_obj.policy.restore(state)
+        # Done after the policies are replaced, since new policies may clear it
+        for PolicyCls, shared_state in snapshot.shared_policy_states.items():
+            PolicyCls.restore_shared(shared_state)
+        self.ready_to_run_round = snapshot.ready_to_run_round
+
     ##############
     # Yaml funcs #
     ##############
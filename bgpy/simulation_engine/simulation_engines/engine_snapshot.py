@@ -0,0 +1,41 @@
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from bgpy.simulation_engine import Policy
+
+
+@dataclass(frozen=True, slots=True)
+class EngineSnapshot:
+    """Saved RIB state of every AS, along with the engine's ready_to_run_round
+
+    Also saves which stubs were folded and which leaves were compressed (see
+    SimulationEngine), since the outcomes of those ASes are found from them,
+    and the state shared by every AS of a policy class (such as RoST's trusted
+    repository)
+
+    Created with BaseSimulationEngine.snapshot, and used with
+    BaseSimulationEngine.restore to start from a converged state rather than
+    propagating again.
+
+    Snapshots aren't copy-on-write. Engines and scenario hooks change the
+    RIBs in place, so taking a snapshot copies every AS's containers, and so
+    does each restore. Only the announcements are shared, since they're
+    immutable. On an 80k AS graph, after a SubprefixHijack that took ~1.3s to
+    propagate, a snapshot takes ~0.15s and a restore ~0.25s.
+
+    None of BGPy's scenarios use snapshots. AccidentalRouteLeak, for example,
+    can't start its leak round from the converged first round, since without
+    withdrawals the ASes that switch to the leak would leave stale routes at
+    their neighbors (see its post_propagation_hook)
+    """
+
+    ready_to_run_round: int
+    # ASN -> (policy class, state from Policy.snapshot)
+    policy_states: dict[int, tuple[type["Policy"], Any]]
+    # See ASGraph.folded_stub_provider_asns
+    folded_stub_provider_asns: dict[int, int]
+    # See ASGraph.compressed_leaf_representative_asns
+    compressed_leaf_representative_asns: dict[int, int]
+    # Policy class -> state from Policy.snapshot_shared
+    shared_policy_states: dict[type["Policy"], Any]
@@ -1,18 +1,49 @@
+from collections.abc import Callable, Sequence
+from operator import methodcaller
 from typing import TYPE_CHECKING, Any, Optional
 
-from bgpy.shared.enums import Relationships
+from bgpy.shared.enums import ASGroups, Relationships
 
+from .active_ases import ActiveASes
 from .base_simulation_engine import BaseSimulationEngine
+from .engine_snapshot import EngineSnapshot
 
 # https://stackoverflow.com/a/57005931/8903959
 if TYPE_CHECKING:
+    from bgpy.as_graphs import AS
     from bgpy.simulation_engine import Announcement as Ann
+    from bgpy.simulation_engine import Policy
     from bgpy.simulation_framework import Scenario
 
 
 class SimulationEngine(BaseSimulationEngine):
     """Python simulation engine representation"""
 
+    def __init__(
+        self,
+        *args,
+        fold_stubs: bool = False,
+        compress_leaves: bool = False,
+        **kwargs,
+    ) -> None:
+        """Saves fold_stubs and compress_leaves
+
+        If fold_stubs is True, single-homed stubs that don't need to propagate
+        are left out of propagation for each run (see _get_foldable_stub_asns).
+        Their outcomes are found by the ASGraphAnalyzer instead, so the results
+        are the same while a large share of CAIDA's ASes aren't propagated to
+
+        If compress_leaves is True, only one AS of each class of leaves that
+        would get the same anns is propagated to (see
+        _get_leaf_representative_asns), and the ASGraphAnalyzer copies its
+        outcome to the rest
+        """
+
+        super().__init__(*args, **kwargs)
+        self.fold_stubs: bool = fold_stubs
+        self.compress_leaves: bool = compress_leaves
+        self._active_ases: ActiveASes = ActiveASes()
+
     ###############
     # Setup funcs #
     ###############
@@ -21,6 +52,16 @@ class SimulationEngine(BaseSimulationEngine):
         """Sets AS classes and seeds announcements"""
 
         self._set_as_classes(scenario)
+        # Done after setting the AS classes, since it depends on their policies
+        self.as_graph.fold_stubs(
+            self._get_foldable_stub_asns(scenario) if self.fold_stubs else ()
+        )
+        # Done after folding stubs, so that folded stubs aren't compressed
+        self.as_graph.compress_leaves(
+            self._get_leaf_representative_asns(scenario) if self.compress_leaves else {}
+        )
+        # Done before seeding, since seeded ASes add themselves to it
+        self._active_ases.reset(self.as_graph)
         self._seed_announcements(scenario.announcements)
         self.ready_to_run_round = 0
 
@@ -35,11 +76,90 @@ class SimulationEngine(BaseSimulationEngine):
 
         # Done here to save as much time  as possible
         for as_obj in self.as_graph:
-            # Delete the old policy and remove references so that RAM can be reclaimed
-            del as_obj.policy.as_
             # set the AS class to be the proper type of AS
             Cls = scenario.get_policy_cls(as_obj)
-            as_obj.policy = Cls(as_=as_obj)
+            policy = as_obj.policy
+            if type(policy) is Cls:
+                # Reuse the policy (and its containers) from the last run
+                policy.reset()
+            else:
+                # Delete the old policy and remove references so that RAM can be
+                # reclaimed
+                del policy.as_
+                as_obj.policy = Cls(as_=as_obj)
+
+    def _get_foldable_stub_asns(self, scenario: "Scenario") -> list[int]:
+        """Returns the ASNs of stubs that can be left out of propagation
+
+        These are single-homed stubs that aren't attackers, victims, or seeded,
+        where both the stub and its provider have policies that support it (see
+        Policy.foldable_stub). Only single round scenarios are folded, since a
+        stub's local RIB from the last round would otherwise matter
+        """
+
+        if scenario.scenario_config.propagation_rounds != 1:
+            return []
+
+        unfoldable_asns = (scenario.attacker_asns | scenario.victim_asns).union(
+            [ann.seed_asn for ann in scenario.announcements]
+        )
+        as_dict = self.as_graph.as_dict
+        foldable_stub_asns = list()
+        for asn in self.as_graph.asn_groups[ASGroups.STUBS.value]:
+            as_obj = as_dict[asn]
+            if (
+                as_obj.providers
+                and asn not in unfoldable_asns
+                and as_obj.policy.foldable_stub
+                and as_obj.providers[0].policy.foldable_stub
+            ):
+                foldable_stub_asns.append(asn)
+        return foldable_stub_asns
+
+    def _get_leaf_representative_asns(self, scenario: "Scenario") -> dict[int, int]:
+        """Returns the representative ASN of each leaf left out of propagation
+
+        Leaves with the same providers and peers (see
+        ASGraph.get_leaf_equivalence_classes) and the same policy class get the
+        same anns, as long as none of them are pinned by the scenario or are in
+        a seeded AS path, and all of their policies and their neighbors'
+        policies support it (see Policy.compressible_leaf). The first leaf of
+        each policy class is the representative. Only single round scenarios are
+        compressed, for the same reason as with folded stubs
+        """
+
+        if scenario.scenario_config.propagation_rounds != 1:
+            return {}
+
+        pinned_asns = (scenario.attacker_asns | scenario.victim_asns).union(
+            [ann.seed_asn for ann in scenario.announcements],
+            *[ann.as_path for ann in scenario.announcements],
+        )
+        as_graph = self.as_graph
+        as_dict = as_graph.as_dict
+        folded_stub_provider_asns = as_graph.folded_stub_provider_asns
+        member_representative_asns: dict[int, int] = dict()
+        for leaf_asns in as_graph.get_leaf_equivalence_classes():
+            if not all(
+                as_dict[x].policy.compressible_leaf
+                for x in as_dict[leaf_asns[0]].neighbor_asns
+            ):
+                continue
+            # Policy class -> representative ASN
+            representative_asns: dict[type[Policy], int] = dict()
+            for asn in leaf_asns:
+                policy = as_dict[asn].policy
+                if (
+                    policy.compressible_leaf
+                    and asn not in pinned_asns
+                    and asn not in folded_stub_provider_asns
+                ):
+                    representative_asn = representative_asns.setdefault(
+                        type(policy), asn
+                    )
+                    if representative_asn != asn:
+                        member_representative_asns[asn] = representative_asn
+        return member_representative_asns
 
     def _seed_announcements(self, announcements: tuple["Ann", ...] = ()) -> None:
         """Seeds announcement at the proper AS
@@ -54,6 +174,21 @@ class SimulationEngine(BaseSimulationEngine):
             obj_to_seed = self.as_graph.as_dict[ann.seed_asn]
             obj_to_seed.policy.seed_ann(ann)
 
+    ##################
+    # Snapshot funcs #
+    ##################
+
+    def restore(self, snapshot: EngineSnapshot) -> None:
+        """Restores from a snapshot, and finds the ASes with anns in their RIBs
+
+        Done with a scan over every AS, since restored policies don't add
+        themselves to the ActiveASes
+        """
+
+        super().restore(snapshot)
+        self._active_ases.reset(self.as_graph)
+        self._active_ases.add_restored_ases(self.as_graph)
+
     #####################
     # Propagation funcs #
     #####################
@@ -80,6 +215,9 @@ class SimulationEngine(BaseSimulationEngine):
         0. providers
         2. peers
         3. customers
+
+        Each step only visits the ASes with anns to process or send (see
+        ActiveASes), rather than every AS
         """
 
         self._propagate_to_providers(propagation_round, scenario)
@@ -89,25 +227,26 @@ class SimulationEngine(BaseSimulationEngine):
     def _propagate_to_providers(self, propagation_round: int, scenario: "Scenario"):
         """Propogate to providers"""
 
+        process = methodcaller(
+            "process_incoming_anns",
+            from_rel=Relationships.CUSTOMERS,
+            propagation_round=propagation_round,
+            scenario=scenario,
+        )
         # Propogation ranks go from stubs to input_clique in ascending order
         # By customer provider pairs (peers are ignored for the ranks)
-        for i, rank in enumerate(self.as_graph.propagation_ranks):
+        active_ases = self._active_ases
+        for i in range(len(self.as_graph.propagation_ranks)):
             # Nothing to process at the start
             if i > 0:
                 # Process first because maybe it recv from lower ranks
-                for as_obj in rank:
-                    as_obj.policy.process_incoming_anns(
-                        from_rel=Relationships.CUSTOMERS,
-                        propagation_round=propagation_round,
-                        scenario=scenario,
-                    )
+                self._run_step(active_ases.pop_receivers(i), process)
             # Send to the higher ranks
-            for as_obj in rank:
-                as_obj.policy.propagate_to_providers()
+            self._run_step(
+                active_ases.get_senders(i), methodcaller("propagate_to_providers")
+            )
 
-    def _propagate_to_peers(
-        self, propagation_round: int, scenario: Optional["Scenario"]
-    ):
+    def _propagate_to_peers(self, propagation_round: int, scenario: "Scenario"):
         """Propagate to peers"""
 
         # The reason you must separate this for loop here
@@ -115,32 +254,49 @@ class SimulationEngine(BaseSimulationEngine):
         # It'd be impossible to take into account peering
         # since different customers peer to different ranks
         # So first do customer to provider propagation, then peer propagation
-        for as_obj in self.as_graph:
-            as_obj.policy.propagate_to_peers()
-        for as_obj in self.as_graph:
-            as_obj.policy.process_incoming_anns(
-                from_rel=Relationships.PEERS,
-                propagation_round=propagation_round,
-                scenario=scenario,
-            )
+        self._run_step(
+            self._active_ases.get_senders(), methodcaller("propagate_to_peers")
+        )
+        process = methodcaller(
+            "process_incoming_anns",
+            from_rel=Relationships.PEERS,
+            propagation_round=propagation_round,
+            scenario=scenario,
+        )
+        self._run_step(self._active_ases.pop_receivers(), process)
 
     def _propagate_to_customers(self, propagation_round: int, scenario: "Scenario"):
         """Propagate to customers"""
 
+        process = methodcaller(
+            "process_incoming_anns",
+            from_rel=Relationships.PROVIDERS,
+            propagation_round=propagation_round,
+            scenario=scenario,
+        )
         # Propogation ranks go from stubs to input_clique in ascending order
         # By customer provider pairs (peers are ignored for the ranks)
         # So here we start at the highest rank(input_clique) and propagate down
-        for i, rank in enumerate(reversed(self.as_graph.propagation_ranks)):
+        active_ases = self._active_ases
+        num_ranks = len(self.as_graph.propagation_ranks)
+        for i in reversed(range(num_ranks)):
             # There are no incomming Anns at the top
-            if i > 0:
-                for as_obj in rank:
-                    as_obj.policy.process_incoming_anns(
-                        from_rel=Relationships.PROVIDERS,
-                        propagation_round=propagation_round,
-                        scenario=scenario,
-                    )
-            for as_obj in rank:
-                as_obj.policy.propagate_to_customers()
+            if i < num_ranks - 1:
+                self._run_step(active_ases.pop_receivers(i), process)
+            self._run_step(
+                active_ases.get_senders(i), methodcaller("propagate_to_customers")
+            )
+
+    def _run_step(self, ases: Sequence["AS"], func: Callable[["Policy"], None]) -> None:
+        """Runs func for the policy of each AS, in order
+
+        Every step of propagation goes through this, so that subclasses can
+        change how a step is run without copying the loops above (see
+        ThreadedSimulationEngine)
+        """
+
+        for as_obj in ases:
+            func(as_obj.policy)
 
     ##############
     # Yaml funcs #
@@ -149,7 +305,8 @@ class SimulationEngine(BaseSimulationEngine):
     def __to_yaml_dict__(self) -> dict[str, Any]:
         """This optional method is called when you call yaml.dump()"""
 
-        return dict(vars(self))
+        # Private attrs aren't init args
+        return {k: v for k, v in vars(self).items() if not k.startswith("_")}
 
     @classmethod
     def __from_yaml_dict__(
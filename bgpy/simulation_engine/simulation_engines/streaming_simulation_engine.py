@@ -0,0 +1,57 @@
+from typing import TYPE_CHECKING
+
+from bgpy.shared.enums import Relationships
+
+from .simulation_engine import SimulationEngine
+
+if TYPE_CHECKING:
+    from bgpy.simulation_framework import Scenario
+
+
+class StreamingSimulationEngine(SimulationEngine):
+    """Simulation engine where policies select anns as they receive them
+
+    Normally every received ann is queued in the recv_q, and then compared
+    when process_incoming_anns is called. Here, before each propagation phase,
+    policies that support it (see Policy.streaming_receive) are told which
+    relationship they are receiving from, so that they can validate each ann
+    and keep only the best one per prefix as it arrives. Only the winning ann
+    is then copied and processed.
+
+    Policies that don't support it (BGPFull, ROV++, BGPsec, etc) queue anns
+    just like in the SimulationEngine, so the results are the same
+    """
+
+    def _propagate(self, propagation_round: int, scenario: "Scenario"):
+        """Propagates, and then turns streaming back off"""
+
+        try:
+            super()._propagate(propagation_round, scenario)
+        finally:
+            self._set_recv_from_rel(None)
+
+    def _propagate_to_providers(self, propagation_round: int, scenario: "Scenario"):
+        """Propogate to providers"""
+
+        self._set_recv_from_rel(Relationships.CUSTOMERS)
+        super()._propagate_to_providers(propagation_round, scenario)
+
+    def _propagate_to_peers(self, propagation_round: int, scenario: "Scenario"):
+        """Propagate to peers"""
+
+        self._set_recv_from_rel(Relationships.PEERS)
+        super()._propagate_to_peers(propagation_round, scenario)
+
+    def _propagate_to_customers(self, propagation_round: int, scenario: "Scenario"):
+        """Propagate to customers"""
+
+        self._set_recv_from_rel(Relationships.PROVIDERS)
+        super()._propagate_to_customers(propagation_round, scenario)
+
+    def _set_recv_from_rel(self, from_rel: Relationships | None) -> None:
+        """Sets the relationship that streaming policies receive from"""
+
+        for as_obj in self.as_graph:
+            policy = as_obj.policy
+            if policy.streaming_receive:
+                policy.recv_from_rel = from_rel
@@ -0,0 +1,138 @@
+import os
+import sys
+import threading
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import TYPE_CHECKING
+
+from .simulation_engine import SimulationEngine
+
+if TYPE_CHECKING:
+    from bgpy.as_graphs import AS
+    from bgpy.simulation_engine import Announcement as Ann
+    from bgpy.simulation_engine import Policy
+    from bgpy.simulation_framework import Scenario
+
+
+# Anns sent by the current thread, as (receiving policy, ann)
+_outboxes = threading.local()
+
+
+def _defer_receive_ann(policy: "Policy", ann: "Ann") -> None:
+    """Adds the ann to the current thread's outbox instead of receiving it"""
+
+    _outboxes.outbox.append((policy, ann))
+
+
+def _gil_enabled() -> bool:
+    """Returns False only on free-threaded Python with the GIL disabled"""
+
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is None or is_gil_enabled()
+
+
+class ThreadedSimulationEngine(SimulationEngine):
+    """Simulation engine that runs the ASes of a propagation rank in threads
+
+    Within a rank, ASes process their own recv_q independently, and only
+    receive_ann crosses AS boundaries. So each step of the SimulationEngine's
+    propagation is split into contiguous chunks that are run across a thread
+    pool (see _run_step), and sent anns go into per-thread outboxes rather
+    than the receivers' recv_q. At the end of each step, outboxes are received
+    in chunk order, which is the same order the SimulationEngine sends in, so
+    the results are identical.
+
+    This only speeds things up on free-threaded Python (3.13t+), so with the
+    GIL enabled this is just the SimulationEngine by default (see
+    serial_with_gil). It's also the SimulationEngine when any policy doesn't
+    support threads (see Policy.parallel_ranks)
+    """
+
+    def __init__(
+        self,
+        *args,
+        max_workers: int | None = None,
+        min_chunk_size: int = 256,
+        serial_with_gil: bool = True,
+        **kwargs,
+    ) -> None:
+        """Saves the thread pool settings
+
+        With the GIL enabled, threads only add overhead, so this runs serially
+        unless serial_with_gil is False (which is mostly useful for testing the
+        threaded path on a regular build)
+        """
+
+        super().__init__(*args, **kwargs)
+        self.max_workers: int = max_workers or os.cpu_count() or 1
+        # Smaller ranks aren't worth the overhead of threads
+        self.min_chunk_size: int = min_chunk_size
+        self.serial_with_gil: bool = serial_with_gil
+        # Set only while propagating in threads
+        self._executor: ThreadPoolExecutor | None = None
+
+    def _propagate(self, propagation_round: int, scenario: "Scenario"):
+        """Propagates in threads if possible, else like the SimulationEngine"""
+
+        if not self._can_run_in_threads():
+            super()._propagate(propagation_round, scenario)
+            return
+
+        policies = [as_obj.policy for as_obj in self.as_graph]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            # Send to outboxes rather than directly to neighbors
+            for policy in policies:
+                policy.receive_ann = partial(_defer_receive_ann, policy)
+            self._executor = executor
+            try:
+                super()._propagate(propagation_round, scenario)
+            finally:
+                self._executor = None
+                for policy in policies:
+                    del policy.receive_ann
+
+    def _can_run_in_threads(self) -> bool:
+        """Returns True if threads are useful and every policy supports them"""
+
+        if self.max_workers < 2 or (self.serial_with_gil and _gil_enabled()):
+            return False
+        else:
+            return all(as_obj.policy.parallel_ranks for as_obj in self.as_graph)
+
+    def _run_step(self, ases: Sequence["AS"], func: Callable[["Policy"], None]) -> None:
+        """Runs func for each AS in chunks, then delivers sent anns in order"""
+
+        if self._executor is None:
+            super()._run_step(ases, func)
+            return
+
+        num_chunks = min(self.max_workers, len(ases) // self.min_chunk_size)
+        if num_chunks < 2:
+            outboxes = [_run_chunk(ases, func)]
+        else:
+            chunk_size = -(-len(ases) // num_chunks)
+            chunks = [ases[i : i + chunk_size] for i in range(0, len(ases), chunk_size)]
+            outboxes = list(
+                self._executor.map(_run_chunk, chunks, [func] * len(chunks))
+            )
+
+        # Receive in the same order that the SimulationEngine sends in
+        for outbox in outboxes:
+            for policy, ann in outbox:
+                type(policy).receive_ann(policy, ann)
+
+
+def _run_chunk(
+    ases: Sequence["AS"], func: Callable[["Policy"], None]
+) -> list[tuple["Policy", "Ann"]]:
+    """Runs func for each AS, and returns the anns that were sent"""
+
+    outbox: list[tuple[Policy, Ann]] = list()
+    _outboxes.outbox = outbox
+    try:
+        for as_obj in ases:
+            func(as_obj.policy)
+    finally:
+        del _outboxes.outbox
+    return outbox
@@ -27,6 +27,8 @@ from .scenarios import (
     VictimsPrefix,
 )
 from .simulation import Simulation
+from .simulation_checkpoint import SimulationCheckpoint
+from .simulation_progress import SimulationProgress
 
 __all__ = [
     "ASGraphAnalyzer",
@@ -43,6 +45,8 @@ __all__ = [
     "ScenarioConfig",
     "Scenario",
     "Simulation",
+    "SimulationCheckpoint",
+    "SimulationProgress",
     "GraphCategory",
     "AccidentalRouteLeak",
     "PrefixHijack",
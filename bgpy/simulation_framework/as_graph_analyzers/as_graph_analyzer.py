@@ -3,7 +3,7 @@ from typing import TYPE_CHECKING, Optional
 from bgpy.as_graphs import AS
 from bgpy.shared.enums import Outcomes, Plane, Relationships
 from bgpy.simulation_engine import Announcement as Ann
-from bgpy.simulation_engine import BaseSimulationEngine
+from bgpy.simulation_engine import ASPath, BaseSimulationEngine
 
 from .base_as_graph_analyzer import BaseASGraphAnalyzer
 
@@ -45,11 +45,54 @@ class ASGraphAnalyzer(BaseASGraphAnalyzer):
         """Gets the most specific ann in a list of ordered prefixes
 
         ordered prefixes start with the most specific, and move to least specific
+
+        Stubs that were left out of propagation (see ASGraph.fold_stubs) get the
+        ann they would have had from their provider, and leaves that were left
+        out (see ASGraph.compress_leaves) get their representative's ann
         """
 
-        return {
-            x: self._get_most_specific_ann(x, ordered_prefixes) for x in engine.as_graph
-        }
+        as_graph = engine.as_graph
+        folded_stub_provider_asns = as_graph.folded_stub_provider_asns
+        compressed_leaf_representative_asns = (
+            as_graph.compressed_leaf_representative_asns
+        )
+        if not folded_stub_provider_asns and not compressed_leaf_representative_asns:
+            return {
+                x: self._get_most_specific_ann(x, ordered_prefixes) for x in as_graph
+            }
+
+        as_dict = as_graph.as_dict
+        # Provider ASN -> the anns it sends to customers, in prefix order
+        sent_anns: dict[int, list[Ann]] = dict()
+        most_specific_ann_dict: dict[AS, Ann | None] = dict()
+        for as_obj in as_graph:
+            if as_obj.asn in compressed_leaf_representative_asns:
+                # Set below, once the representative's ann is known
+                continue
+            provider_asn = folded_stub_provider_asns.get(as_obj.asn)
+            if provider_asn is None:
+                most_specific_ann = self._get_most_specific_ann(
+                    as_obj, ordered_prefixes
+                )
+            else:
+                provider_sent_anns = sent_anns.get(provider_asn)
+                if provider_sent_anns is None:
+                    provider_sent_anns = self._get_sent_anns(
+                        as_dict[provider_asn], ordered_prefixes
+                    )
+                    sent_anns[provider_asn] = provider_sent_anns
+                most_specific_ann = self._get_folded_stub_most_specific_ann(
+                    as_obj, as_dict[provider_asn], provider_sent_anns
+                )
+            most_specific_ann_dict[as_obj] = most_specific_ann
+
+        for member_asn, asn in compressed_leaf_representative_asns.items():
+            member = as_dict[member_asn]
+            representative_ann = most_specific_ann_dict[as_dict[asn]]
+            most_specific_ann_dict[member] = (
+                self._get_compressed_leaf_most_specific_ann(member, representative_ann)
+            )
+        return most_specific_ann_dict
 
     def _get_most_specific_ann(
         self, as_obj: AS, ordered_prefixes: tuple[str, ...]
@@ -67,6 +110,56 @@ class ASGraphAnalyzer(BaseASGraphAnalyzer):
                 return most_specific_ann
         return None
 
+    def _get_sent_anns(
+        self, provider: AS, ordered_prefixes: tuple[str, ...]
+    ) -> list["Ann"]:
+        """Returns the anns the provider sends to customers, most specific first"""
+
+        sent_anns = list()
+        for prefix in ordered_prefixes:
+            ann = provider.policy.local_rib.get(prefix)
+            if ann:
+                assert isinstance(ann, Ann), "for mypy"
+                sent_anns.append(ann.copy_next_hop(provider.asn))
+        return sent_anns
+
+    def _get_folded_stub_most_specific_ann(
+        self, as_obj: AS, provider: AS, sent_anns: list["Ann"]
+    ) -> Optional["Ann"]:
+        """Returns the most specific ann a folded stub would have
+
+        A folded stub would've received every ann its provider sends, and kept
+        the ones that are valid by its own policy (see Policy.foldable_stub)
+        """
+
+        policy = as_obj.policy
+        # Anns the provider wouldn't send due to a loop (see Policy.prefilter_loops)
+        prefilter_loops = policy.prefilter_loops and provider.policy.prefilter_loops
+        for ann in sent_anns:
+            if not (prefilter_loops and as_obj.asn in ann.as_path):
+                processed_ann = policy.process_folded_stub_ann(ann)
+                if processed_ann is not None:
+                    return processed_ann
+        return None
+
+    def _get_compressed_leaf_most_specific_ann(
+        self, as_obj: AS, representative_ann: Optional["Ann"]
+    ) -> Optional["Ann"]:
+        """Returns the representative's ann, as if as_obj had processed it
+
+        The only difference is the ASN that was prepended to the AS path (see
+        Policy.compressible_leaf)
+        """
+
+        if representative_ann is None:
+            return None
+        as_path = representative_ann.as_path
+        tail = as_path.tail if isinstance(as_path, ASPath) else as_path[1:]
+        return representative_ann.copy_processed(
+            representative_ann.prepend_as_path(as_obj.asn, tail),
+            representative_ann.recv_relationship,
+        )
+
     def analyze(self) -> dict[int, dict[int, int]]:
         """Takes in engine and outputs traceback for ctrl + data plane data"""
 
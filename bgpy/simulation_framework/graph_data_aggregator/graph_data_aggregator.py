@@ -9,7 +9,7 @@ from warnings import warn
 
 from bgpy.shared.enums import Outcomes, Plane, SpecialPercentAdoptions
 from bgpy.simulation_engine import BaseSimulationEngine
-from bgpy.simulation_framework.scenarios import Scenario
+from bgpy.simulation_framework.scenarios import Scenario, ScenarioConfig
 from bgpy.simulation_framework.utils import get_all_graph_categories
 
 from .data_point_agg_data import DataPointAggData
@@ -19,6 +19,11 @@ from .trial_data import TrialData
 
 DATA_TYPE = dict[GraphCategory, defaultdict[DataPointKey, list[float]]]
 PICKLE_DATA_TYPE = dict[GraphCategory, dict[DataPointKey, DataPointAggData]]
+# (graph category index, scenario config index, propagation round, percent adopt,
+# percents) for each data point. See get_compact_data
+COMPACT_DATA_TYPE = list[
+    tuple[int, int, int, float | SpecialPercentAdoptions, tuple[float, ...]]
+]
 
 
 class GraphDataAggregator:
@@ -68,6 +73,63 @@ class GraphDataAggregator:
     def __radd__(self, other):
         return self.__add__(other)
 
+    def get_compact_data(
+        self, scenario_configs: tuple[ScenarioConfig, ...]
+    ) -> COMPACT_DATA_TYPE:
+        """Returns the data with indexes in place of the graph categories and configs
+
+        Used to send the data of a task from a worker to the parent, since the
+        data of a single task is much smaller than its keys. ScenarioConfigs can
+        be large (such as with override_announcements), and would otherwise be
+        sent (and hashed when merging) for every task
+
+        Only self.data is included. Subclasses that store anything else must
+        extend this and add_compact_data, or it won't reach the parent
+        """
+
+        graph_category_indexes = {x: i for i, x in enumerate(self.graph_categories)}
+        # Scenario labels are unique (see Simulation._validate_scenario_configs)
+        scenario_config_indexes = {
+            x.scenario_label: i for i, x in enumerate(scenario_configs)
+        }
+        return [
+            (
+                graph_category_indexes[graph_category],
+                scenario_config_indexes[data_point_key.scenario_config.scenario_label],
+                data_point_key.propagation_round,
+                data_point_key.percent_adopt,
+                tuple(percents),
+            )
+            for graph_category, data_dict in self.data.items()
+            for data_point_key, percents in data_dict.items()
+        ]
+
+    def add_compact_data(
+        self,
+        compact_data: COMPACT_DATA_TYPE,
+        scenario_configs: tuple[ScenarioConfig, ...],
+    ) -> None:
+        """Merges data from get_compact_data into this one in place
+
+        Unlike __add__, only the task's data is copied, so merging the results
+        of many small tasks one at a time doesn't copy this data over and over
+        """
+
+        for (
+            graph_category_index,
+            scenario_config_index,
+            propagation_round,
+            percent_adopt,
+            percents,
+        ) in compact_data:
+            data_point_key = DataPointKey(
+                propagation_round=propagation_round,
+                percent_adopt=percent_adopt,
+                scenario_config=scenario_configs[scenario_config_index],
+            )
+            graph_category = self.graph_categories[graph_category_index]
+            self.data[graph_category][data_point_key].extend(percents)
+
     ######################
     # Track Metric Funcs #
     ######################
@@ -1,7 +1,6 @@
 import warnings
 from typing import TYPE_CHECKING, Optional
 
-from bgpy.as_graphs.base.as_graph.customer_cone_funcs import _get_cone_size_helper
 from bgpy.shared.constants import bgpy_logger
 from bgpy.shared.enums import (
     ASGroups,
@@ -65,9 +64,6 @@ class AccidentalRouteLeak(VictimsPrefix):
             )
             warnings.warn(msg, RuntimeWarning, stacklevel=2)
 
-    # Just returns customer cone
-    _get_cone_size_helper = _get_cone_size_helper
-
     def post_propagation_hook(
         self,
         engine: "BaseSimulationEngine",
@@ -155,12 +151,10 @@ class AccidentalRouteLeak(VictimsPrefix):
         )
         # Stores customer cones of attacker ASNs
         # used in untrackable func and when selecting victims
+        cones = engine.as_graph.cones
         for attacker_asn in attacker_asns:
             self._attackers_customer_cones_asns.update(
-                self._get_cone_size_helper(
-                    engine.as_graph.as_dict[attacker_asn],
-                    dict(),
-                ),
+                cones.asns(attacker_asn, Relationships.CUSTOMERS)
             )
         return attacker_asns
 
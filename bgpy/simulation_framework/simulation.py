@@ -1,19 +1,21 @@
 import argparse
 import gc
+import hashlib
 import os
 import random
-import shutil
 import time
+import traceback
+from collections import deque
+from contextlib import suppress
 from copy import deepcopy
-from multiprocessing import Pool, cpu_count
+from multiprocessing import cpu_count, get_all_start_methods, get_context
+from multiprocessing.connection import wait
 from pathlib import Path
-from tempfile import TemporaryDirectory
-from typing import TYPE_CHECKING, Iterable
+from typing import TYPE_CHECKING, ClassVar, Iterator
 from warnings import warn
 
 import psutil
 from frozendict import frozendict
-from tqdm import tqdm
 
 from bgpy.as_graphs.base import ASGraph, ASGraphConstructor
 from bgpy.as_graphs.caida_as_graph import CAIDAASGraphConstructor
@@ -31,10 +33,31 @@ from .as_graph_analyzers import ASGraphAnalyzer, BaseASGraphAnalyzer
 from .graph_data_aggregator import GraphCategory, GraphDataAggregator
 from .graphing import GraphFactory
 from .scenarios import Scenario, ScenarioConfig, SubprefixHijack
+from .simulation_checkpoint import SimulationCheckpoint
+from .simulation_progress import SimulationProgress
 from .utils import get_all_graph_categories
 
 if TYPE_CHECKING:
-    from multiprocessing.pool import ApplyResult
+    from multiprocessing.connection import Connection
+    from multiprocessing.context import DefaultContext, ForkContext
+    from multiprocessing.process import BaseProcess
+
+    from .graph_data_aggregator.graph_data_aggregator import COMPACT_DATA_TYPE
+
+
+def _parse_shard(shard: str) -> tuple[int, int]:
+    """Parses a shard given as I/N into (I, N)"""
+
+    try:
+        shard_index, num_shards = (int(x) for x in shard.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"shard must be given as I/N, not {shard}"
+        ) from None
+    if not 0 <= shard_index < num_shards:
+        raise argparse.ArgumentTypeError(f"shard {shard} must be in 0/N to N-1/N")
+    return shard_index, num_shards
+
 
 parser = argparse.ArgumentParser(description="Runs BGPy simulations")
 parser.add_argument(
@@ -45,6 +68,22 @@ parser.add_argument(
     default=1,
     help="Number of trials to run",
 )
+parser.add_argument(
+    "--shard",
+    type=_parse_shard,
+    default=None,
+    help=(
+        "Runs only shard I of N (given as I/N) of the tasks, and writes their "
+        "data to a shard file in the output dir, to merge with --merge_shards"
+    ),
+)
+parser.add_argument(
+    "--merge_shards",
+    type=Path,
+    nargs="+",
+    default=(),
+    help="Merges the shard files of every shard and writes the data and graphs",
+)
 # parse known args to avoid crashing during pytest
 args, _unknown = parser.parse_known_args()
 
@@ -52,6 +91,10 @@ args, _unknown = parser.parse_known_args()
 class Simulation:
     """Runs simulations for BGP attack/defend scenarios"""
 
+    # Graph built by the parent process when share_as_graph is True. It's a class
+    # attr so that forked workers inherit it without it being pickled with self
+    _shared_as_graph: ClassVar[ASGraph | None] = None
+
     def __init__(
         self,
         *,
@@ -87,8 +130,8 @@ class Simulation:
                 "as_graph_kwargs": frozendict(
                     {
                         # When no ASNs are stored, .9gb/core
-                        # When one set of cones is stored, 1.6gb/core
-                        # When both sets of cones are stored, 2.3gb/core
+                        # When one set of cones is stored, 1gb/core
+                        # When both sets of cones are stored, 1.1gb/core
                         "store_customer_cone_size": True,
                         "store_customer_cone_asns": False,
                         "store_provider_cone_size": False,
@@ -98,6 +141,25 @@ class Simulation:
                 "tsv_path": None,  # Path.home() / "Desktop" / "caida.tsv",
             }
         ),
+        # Build the graph once and share it copy-on-write with forked workers
+        share_as_graph: bool = False,
+        # Leave single-homed stubs out of propagation and find their outcomes
+        # from their providers instead (see SimulationEngine)
+        fold_stubs: bool = False,
+        # Propagate to one of each class of leaves that would get the same anns
+        # and copy its outcome to the rest (see SimulationEngine)
+        compress_leaves: bool = False,
+        # Append the data of each task to a checkpoint in the output_dir as soon
+        # as it's done, so that a run that's killed can be resumed by running it
+        # again with the same parameters (see SimulationCheckpoint)
+        checkpoint: bool = False,
+        # Run only shard I of N (as (I, N)) of the tasks, to merge later with
+        # merge_shard_paths (see _run_shard)
+        shard: tuple[int, int] | None = args.shard,
+        # Shard files of every shard, to merge rather than run any tasks
+        merge_shard_paths: tuple[Path, ...] = tuple(args.merge_shards),
+        # Writes a JSON progress log here (see SimulationProgress)
+        progress_log_path: Path | None = None,
         SimulationEngineCls: type[BaseSimulationEngine] = SimulationEngine,
         ASGraphAnalyzerCls: type[BaseASGraphAnalyzer] = ASGraphAnalyzer,
         GraphDataAggregatorCls: type[GraphDataAggregator] = GraphDataAggregator,
@@ -119,14 +181,21 @@ class Simulation:
             percent_adoptions
         )
         self.num_trials: int = num_trials
-        # Since we parallelize by trials, no need to have more CPUs than trials
-        self.parse_cpus: int = min(parse_cpus, num_trials)
+        # Since we parallelize by tasks, no need to have more CPUs than tasks
+        self.parse_cpus: int = min(parse_cpus, num_trials * len(percent_adoptions))
         self.scenario_configs: tuple[ScenarioConfig, ...] = (
             self._get_filtered_scenario_configs(scenario_configs)
         )
 
         self.python_hash_seed: int | None = python_hash_seed
         self._seed_random()
+        # Each task is seeded from this (see _seed_task_random), so that results
+        # don't depend on which worker runs which task, or how many workers there are
+        self._task_seed: str = (
+            str(python_hash_seed)
+            if python_hash_seed is not None
+            else str(random.getrandbits(64))
+        )
 
         self.sim_name: str = sim_name or self.default_sim_name
         self.output_dir: Path = output_dir or self.default_output_dir
@@ -136,12 +205,22 @@ class Simulation:
         # So that multiprocessing doesn't interfere with one another
         self.ASGraphConstructorCls: type[ASGraphConstructor] = ASGraphConstructorCls
         self.as_graph_constructor_kwargs = as_graph_constructor_kwargs
+        self.share_as_graph: bool = share_as_graph
         # Validate before building the graph to give the user a few seconds to kill
         # the program if desired (if RAM would run out) or validation errors before
         # multi-second as graph loading takes place
         self._validate_init()
 
         self.SimulationEngineCls: type[BaseSimulationEngine] = SimulationEngineCls
+        self.fold_stubs: bool = fold_stubs
+        self.compress_leaves: bool = compress_leaves
+        self.checkpoint: bool = checkpoint
+        self.shard: tuple[int, int] | None = shard
+        self.merge_shard_paths: tuple[Path, ...] = merge_shard_paths
+        self._validate_shards()
+        self.progress_log_path: Path | None = progress_log_path
+        # Seconds each scenario config took in the last task, by scenario label
+        self._scenario_config_seconds: dict[str, float] = dict()
 
         self.ASGraphAnalyzerCls: type[BaseASGraphAnalyzer] = ASGraphAnalyzerCls
         self.GraphDataAggregatorCls: type[GraphDataAggregator] = GraphDataAggregatorCls
@@ -151,13 +230,6 @@ class Simulation:
 
         self.graph_categories: tuple[GraphCategory, ...] = graph_categories
 
-        # Can't delete this since it gets deleted in multiprocessing for some reason
-        # NOTE: Once pypy gets to 3.12, just pass delete=False to this
-        with TemporaryDirectory() as tmp_dir:
-            tmp_dir_str = tmp_dir
-        self._tqdm_tracking_dir: Path = Path(tmp_dir_str)
-        self._tqdm_tracking_dir.mkdir(parents=True)
-
     @property
     def default_sim_name(self) -> str:
         return "bgpy_sims"
@@ -180,9 +252,11 @@ class Simulation:
         1. scenario config mismatch between adopting and base policies
         2. duplicate scenario labels
         3. RAM constraints
+        4. share_as_graph is supported
         """
 
         self._validate_scenario_configs()
+        self._validate_share_as_graph()
         self._validate_ram()
 
     def _validate_scenario_configs(self) -> None:
@@ -212,6 +286,34 @@ class Simulation:
                 "unique label name to your config"
             )
 
+    def _validate_share_as_graph(self) -> None:
+        """Turns off share_as_graph where workers can't be forked"""
+
+        if self.share_as_graph and "fork" not in get_all_start_methods():
+            warn(
+                "share_as_graph requires the fork start method, which isn't "
+                "available on this platform, so each worker will build its own graph",
+                stacklevel=2,
+            )
+            self.share_as_graph = False
+
+    def _validate_shards(self) -> None:
+        """Validates the shard and merge_shard_paths
+
+        Every shard must pick the same random numbers for the same task, or
+        the merged data wouldn't match a run that wasn't sharded
+        """
+
+        if self.shard is not None and self.merge_shard_paths:
+            raise ValueError("A simulation can't run a shard and merge shards")
+        if (
+            self.shard is not None or self.merge_shard_paths
+        ) and self.python_hash_seed is None:
+            raise ValueError(
+                "Sharded simulations must set the python_hash_seed, so that "
+                "every shard uses the same random numbers"
+            )
+
     def _validate_ram(self) -> None:
         """Validates that the RAM will not run out of bounds
 
@@ -223,17 +325,28 @@ class Simulation:
         store_provider_cone_asns = graph_kwargs.get("store_provider_cone_asns", False)
 
         # NOTE: These are for PyPy, not Python
+        # Cones are stored as bitsets (see ASGraphCones). Compared to frozensets
+        # (which took 2.3 and 1.6gb/core) they add ~15% RAM per set of cones
         # How much RAM for storing both provider and customer cones
         if store_customer_cone_asns and store_provider_cone_asns:
-            total_gb_ram_per_core = 2.3
+            total_gb_ram_per_core = 1.1
         # How much RAM for storing either provider or customer cone
         elif store_customer_cone_asns or store_provider_cone_asns:
-            total_gb_ram_per_core = 1.6
+            total_gb_ram_per_core = 1.0
         # By default sims take ~1gb/core
         else:
             total_gb_ram_per_core = 0.9
 
-        expected_total_gb_ram = self.parse_cpus * total_gb_ram_per_core
+        if self.share_as_graph and self.parse_cpus > 1:
+            # The graph is only built once, in the parent. Each worker then copies
+            # just the pages it writes to (policies, RIBs, and refcounts), which
+            # was ~3/4 of a worker that builds its own graph (CPython, 80k ASes)
+            worker_gb_ram = total_gb_ram_per_core * 0.75
+            expected_total_gb_ram = (
+                total_gb_ram_per_core + self.parse_cpus * worker_gb_ram
+            )
+        else:
+            expected_total_gb_ram = self.parse_cpus * total_gb_ram_per_core
         # Gets available RAM and converts to GB
         total_gb_ram = psutil.virtual_memory().available / (1024**3)
 
@@ -252,19 +365,37 @@ class Simulation:
         GraphFactoryCls: type[GraphFactory] | None = GraphFactory,
         graph_factory_kwargs=None,
     ) -> None:
-        """Runs the simulation and write the data"""
+        """Runs the simulation and write the data
+
+        If shard is set, only writes the data of its tasks to the shard file.
+        If merge_shard_paths is set, merges them rather than running any tasks
+        """
 
-        # Cache the CAIDA graph
-        self.ASGraphConstructorCls(**self.as_graph_constructor_kwargs).run()
-        graph_data_aggregator = self._get_data()
+        as_graph_constructor = self.ASGraphConstructorCls(
+            **self.as_graph_constructor_kwargs
+        )
+        checkpoint = None
+        if self.merge_shard_paths:
+            graph_data_aggregator = self._merge_shards(as_graph_constructor)
+        else:
+            # Cache the CAIDA graph
+            as_graph_constructor.run()
+            if self.shard is not None:
+                self._run_shard(as_graph_constructor)
+                return
+            if self.checkpoint:
+                checkpoint = self._get_checkpoint(as_graph_constructor)
+            graph_data_aggregator = self._get_data(checkpoint)
         graph_data_aggregator.write_data(
             csv_path=self.csv_path, pickle_path=self.pickle_path
         )
+        # The data is written, so there's nothing left to resume
+        if checkpoint is not None:
+            checkpoint.path.unlink()
         self._graph_data(GraphFactoryCls, graph_factory_kwargs)
         # This object holds a lot of memory, good to get rid of it
         del graph_data_aggregator
         gc.collect()
-        shutil.rmtree(self._tqdm_tracking_dir)
 
     def _seed_random(self, seed_suffix: str = "") -> None:
         """Seeds randomness"""
@@ -280,108 +411,403 @@ class Simulation:
                 raise RuntimeError(msg)
             random.seed(str(self.python_hash_seed) + seed_suffix)
 
-    def _get_data(self):
-        """Runs trials for graph and aggregates data"""
+    def _seed_task_random(self, trial: int, percent_adopt_index: int | None = None):
+        """Seeds randomness for a task, or for a trial if no percent adopt is given"""
 
-        # Single process
-        if self.parse_cpus == 1:
-            # Results are a list of lists of metric trackers that we then sum
-            return sum(
-                self._get_single_process_results(),
-                start=self.GraphDataAggregatorCls(
-                    graph_categories=self.graph_categories
-                ),
+        seed_suffix = f"_{trial}"
+        if percent_adopt_index is not None:
+            seed_suffix += f"_{percent_adopt_index}"
+        random.seed(self._task_seed + seed_suffix)
+
+    def _get_checkpoint(
+        self, as_graph_constructor: ASGraphConstructor, name: str = "checkpoint"
+    ) -> SimulationCheckpoint:
+        """Returns the checkpoint for a run with these parameters"""
+
+        fingerprint = self._get_fingerprint(as_graph_constructor)
+        return SimulationCheckpoint(
+            path=self.output_dir / f"{name}_{fingerprint[:16]}.pickle",
+            fingerprint=fingerprint,
+            task_seed=self._task_seed,
+        )
+
+    def _get_fingerprint(self, as_graph_constructor: ASGraphConstructor) -> str:
+        """Returns a fingerprint of everything that changes the data of a task
+
+        num_trials isn't included, since the data of a task doesn't depend on
+        how many trials there are, so an interrupted run can be resumed with
+        more trials. Neither are the parse_cpus or the shard, since they don't
+        change the data either (see _get_data)
+        """
+
+        constructor_kwargs = dict(self.as_graph_constructor_kwargs)
+        # Only where the graph is written to, which doesn't change it
+        constructor_kwargs.pop("tsv_path", None)
+        params = (
+            type(self).__qualname__,
+            self.percent_adoptions,
+            self.scenario_configs,
+            self.python_hash_seed,
+            self.fold_stubs,
+            self.compress_leaves,
+            self.SimulationEngineCls,
+            self.ASGraphAnalyzerCls,
+            self.GraphDataAggregatorCls,
+            self.data_plane_tracking,
+            self.control_plane_tracking,
+            self.graph_categories,
+            self.ASGraphConstructorCls,
+            sorted(constructor_kwargs.items()),
+            as_graph_constructor.get_digest(),
+        )
+        return hashlib.sha256(repr(params).encode()).hexdigest()
+
+    def _get_data(
+        self, checkpoint: SimulationCheckpoint | None = None
+    ) -> GraphDataAggregator:
+        """Runs all tasks and merges their data in task order
+
+        Since every task is seeded on its own, and the data is merged in the
+        same order no matter which worker ran the task, the data is the same
+        for any number of CPUs. For the same reason, tasks in the checkpoint
+        aren't run again, and the data is the same as if they were
+        """
+
+        graph_data_aggregator = self.GraphDataAggregatorCls(
+            graph_categories=self.graph_categories
+        )
+        tasks = self._get_tasks()
+        task_data: dict[tuple[int, int], COMPACT_DATA_TYPE] = dict()
+        if checkpoint is not None:
+            task_data = checkpoint.load()
+            # Continue with the random numbers of the run that was interrupted
+            self._task_seed = checkpoint.task_seed
+        unfinished_tasks = [x for x in tasks if x not in task_data]
+
+        next_task_index = self._merge_task_data(
+            graph_data_aggregator, tasks, task_data, 0
+        )
+        for task, compact_data in self._get_results(unfinished_tasks):
+            if checkpoint is not None:
+                checkpoint.append(task, compact_data)
+            task_data[task] = compact_data
+            next_task_index = self._merge_task_data(
+                graph_data_aggregator, tasks, task_data, next_task_index
             )
-        # Multiprocess
-        else:
-            # Results are a list of lists of metric trackers that we then sum
-            return sum(
-                self._get_mp_results(),
-                start=self.GraphDataAggregatorCls(
-                    graph_categories=self.graph_categories
-                ),
+        return graph_data_aggregator
+
+    def _run_shard(self, as_graph_constructor: ASGraphConstructor) -> None:
+        """Runs the tasks of the shard, and writes their data to its shard file
+
+        The shard file is a checkpoint (see SimulationCheckpoint), so a shard
+        that's killed resumes when it's run again, and it describes the
+        simulation that it's from, so that merging checks that every shard
+        file is from the same simulation
+        """
+
+        assert self.shard is not None, "Only called for shards"
+        shard_index, num_shards = self.shard
+        checkpoint = self._get_checkpoint(
+            as_graph_constructor, f"shard_{shard_index}_of_{num_shards}"
+        )
+        task_data = checkpoint.load()
+        shard_tasks = self._get_tasks()[shard_index::num_shards]
+        unfinished_tasks = [x for x in shard_tasks if x not in task_data]
+        for task, compact_data in self._get_results(unfinished_tasks):
+            checkpoint.append(task, compact_data)
+        bgpy_logger.info(f"Wrote shard {shard_index} to {checkpoint.path}")
+
+    def _merge_shards(
+        self, as_graph_constructor: ASGraphConstructor
+    ) -> GraphDataAggregator:
+        """Merges the data in the shard files, in task order
+
+        Since the data is merged in the same order as _get_data, it's the same
+        as the data of a run that wasn't sharded
+        """
+
+        fingerprint = self._get_fingerprint(as_graph_constructor)
+        task_data: dict[tuple[int, int], COMPACT_DATA_TYPE] = dict()
+        for path in self.merge_shard_paths:
+            if not path.exists():
+                raise FileNotFoundError(f"No shard file at {path}")
+            task_data.update(
+                SimulationCheckpoint(path, fingerprint, self._task_seed).read()
             )
 
+        tasks = self._get_tasks()
+        missing_tasks = [x for x in tasks if x not in task_data]
+        if missing_tasks:
+            raise ValueError(
+                f"The shard files are missing {len(missing_tasks)} of the "
+                f"{len(tasks)} tasks, such as (trial, percent adopt index) "
+                f"{missing_tasks[0]}"
+            )
+        graph_data_aggregator = self.GraphDataAggregatorCls(
+            graph_categories=self.graph_categories
+        )
+        self._merge_task_data(graph_data_aggregator, tasks, task_data, 0)
+        return graph_data_aggregator
+
+    def _merge_task_data(
+        self,
+        graph_data_aggregator: GraphDataAggregator,
+        tasks: list[tuple[int, int]],
+        task_data: dict[tuple[int, int], "COMPACT_DATA_TYPE"],
+        next_task_index: int,
+    ) -> int:
+        """Merges the data of the tasks that are done, in task order
+
+        Tasks finish in any order, so the data of later tasks is held in
+        task_data until the tasks before them are done. Returns the index of
+        the next task to merge
+        """
+
+        while next_task_index < len(tasks) and tasks[next_task_index] in task_data:
+            graph_data_aggregator.add_compact_data(
+                task_data.pop(tasks[next_task_index]), self.scenario_configs
+            )
+            next_task_index += 1
+        return next_task_index
+
     ###########################
     # Multiprocessing Methods #
     ###########################
 
-    def _get_chunks(self, cpus: int) -> list[list[int]]:
-        """Returns chunks of trial inputs based on number of CPUs running
+    def _get_tasks(self) -> list[tuple[int, int]]:
+        """Returns the (trial, percent adopt index) of every task, in merge order
 
-        Not a generator since we need this for multiprocessing
-
-        We also don't multiprocess one by one because the start up cost of
-        each process is huge (since each process must generate it's own engine
-        ) so we must divy up the work beforehand
+        Each task runs every scenario config, since they reuse each other's
+        adopting ASNs. Tasks are small so that workers that finish early can take
+        the remaining ones, rather than idling while configs that are slower
+        (like BGPFull, or scenarios with more propagation rounds) finish
         """
 
-        trials_list = list(range(self.num_trials))
-        return [trials_list[i::cpus] for i in range(cpus)]
+        return [
+            (trial, percent_adopt_index)
+            for trial in range(self.num_trials)
+            for percent_adopt_index in range(len(self.percent_adoptions))
+        ]
+
+    def _get_results(
+        self, tasks: list[tuple[int, int]]
+    ) -> Iterator[tuple[tuple[int, int], "COMPACT_DATA_TYPE"]]:
+        """Yields each task with its compact data as it finishes"""
+
+        if not tasks:
+            return
+        with SimulationProgress(
+            num_tasks=len(tasks),
+            num_workers=min(self.parse_cpus, len(tasks)),
+            desc=f"Simulating {self.output_dir.name}",
+            log_path=self.progress_log_path,
+        ) as progress:
+            # Single process
+            if self.parse_cpus == 1:
+                yield from self._get_single_process_results(tasks, progress)
+            # Multiprocess
+            else:
+                yield from self._get_mp_results(tasks, progress)
 
-    def _get_single_process_results(self) -> list[GraphDataAggregator]:
-        """Get all results when using single processing"""
+    def _get_single_process_results(
+        self, tasks: list[tuple[int, int]], progress: SimulationProgress
+    ) -> Iterator[tuple[tuple[int, int], "COMPACT_DATA_TYPE"]]:
+        """Yields each task with its compact data, when single processing"""
 
-        return [self._run_chunk(i, x) for i, x in enumerate(self._get_chunks(1))]
+        engine = self._get_worker_engine()
+        for task in tasks:
+            progress.task_started(0, task)
+            compact_data = self._run_task(engine, *task).get_compact_data(
+                self.scenario_configs
+            )
+            progress.task_finished(0, task, self._scenario_config_seconds)
+            yield task, compact_data
 
-    def _get_mp_results(self) -> list[GraphDataAggregator]:
-        """Get results from multiprocessing
+    def _get_mp_results(
+        self, tasks: list[tuple[int, int]], progress: SimulationProgress
+    ) -> Iterator[tuple[tuple[int, int], "COMPACT_DATA_TYPE"]]:
+        """Yields each task with its compact data as it finishes, from multiprocessing
 
-        Previously used starmap, but now we have tqdm
+        Each task's data is merged as soon as it (and the tasks before it) are
+        done, so the parent never holds more than the merged data and the few
+        tasks that finished out of order
         """
 
-        # Pool is much faster than ProcessPoolExecutor
-        with Pool(self.parse_cpus) as p:
-            # return p.starmap(self._run_chunk, enumerate(self._get_chunks(parse_cpus)))
-            chunks = self._get_chunks(self.parse_cpus)
-            desc = f"Simulating {self.output_dir.name}"
-            total = sum(len(x) for x in chunks) * len(self.percent_adoptions)
-            with tqdm(total=total, desc=desc) as pbar:
-                tasks: list[ApplyResult[GraphDataAggregator]] = [
-                    p.apply_async(self._run_chunk, x) for x in enumerate(chunks)
-                ]
-                completed: list[GraphDataAggregator] = []
-                while tasks:
-                    completed, tasks = self._get_completed_and_tasks(completed, tasks)
-                    self._update_tqdm_progress_bar(pbar)
-                    time.sleep(0.5)
-        return completed
-
-    def _get_completed_and_tasks(self, completed, tasks):
-        """Moves completed tasks into completed"""
-        new_tasks = list()
-        for task in tasks:
-            if task.ready():
-                completed.append(task.get())
-            else:
-                new_tasks.append(task)
-        return completed, new_tasks
-
-    def _update_tqdm_progress_bar(self, pbar: tqdm) -> None:  # type: ignore
-        """Updates tqdm progress bar"""
-
-        total_completed = 0
-        for file_path in self._tqdm_tracking_dir.iterdir():
-            try:
-                total_completed += int(file_path.read_text())
-            # Can happen write when file is being written when it's empty
-            except ValueError:
-                pass
-        pbar.n = total_completed
-        pbar.refresh()
+        if self.share_as_graph:
+            # Built once here, and inherited copy-on-write by forked workers
+            Simulation._shared_as_graph = self._get_worker_as_graph()
+            # Move everything into the permanent generation so that the GC in
+            # the workers doesn't write to (and thus copy) the graph's pages
+            gc.collect()
+            gc.freeze()
+        try:
+            yield from self._get_mp_pool_results(
+                tasks, get_context("fork" if self.share_as_graph else None), progress
+            )
+        finally:
+            if self.share_as_graph:
+                gc.unfreeze()
+                Simulation._shared_as_graph = None
+
+    def _get_mp_pool_results(
+        self,
+        tasks: list[tuple[int, int]],
+        mp_context: "DefaultContext | ForkContext",
+        progress: SimulationProgress,
+    ) -> Iterator[tuple[tuple[int, int], "COMPACT_DATA_TYPE"]]:
+        """Runs the tasks on worker processes with the given multiprocessing context
+
+        Each worker builds its engine once, then runs one task at a time, and is
+        sent the next task as soon as it sends back the data of the last. So
+        workers that finish early take the remaining tasks. Tasks are yielded
+        with their data in whatever order they finish in
+
+        If a worker dies (for example if it runs out of RAM), only the task it
+        was running is lost, and that task is retried once on a new worker
+
+        Workers send the seconds each scenario config took with each task's
+        data, which the parent reports along with which task each worker is
+        running (see SimulationProgress)
+        """
+
+        unsent_task_indexes = deque(range(len(tasks)))
+        retried_task_indexes: set[int] = set()
+        # Index of the task that each worker is running, by worker index
+        running_task_indexes: dict[int, int] = dict()
+        num_finished_tasks = 0
+        # Workers that died while idle aren't replaced once every task is sent
+        workers: dict[int, tuple[BaseProcess, Connection]] = dict()
+
+        def send_next_task(worker_index: int) -> None:
+            if unsent_task_indexes:
+                task_index = unsent_task_indexes.popleft()
+                try:
+                    workers[worker_index][1].send((task_index, tasks[task_index]))
+                # The worker died (such as after it sent its last task's data).
+                # The task never reached it, so it goes back to be sent again,
+                # and the worker is replaced once its pipe reads EOF
+                except OSError:
+                    unsent_task_indexes.appendleft(task_index)
+                    return
+                running_task_indexes[worker_index] = task_index
+                progress.task_started(worker_index, tasks[task_index])
+
+        try:
+            for worker_index in range(min(self.parse_cpus, len(tasks))):
+                workers[worker_index] = self._start_worker(mp_context)
+                send_next_task(worker_index)
+            while num_finished_tasks < len(tasks):
+                ready = wait([conn for _, conn in workers.values()])
+                for worker_index, (worker, conn) in list(workers.items()):
+                    if conn not in ready:
+                        continue
+                    try:
+                        task_index, compact_data, config_seconds, error = conn.recv()
+                    # The worker died, so replace it and retry its task, if any
+                    except (EOFError, OSError):
+                        worker.join()
+                        conn.close()
+                        del workers[worker_index]
+                        lost_task_index = running_task_indexes.pop(worker_index, None)
+                        progress.worker_died(
+                            worker_index,
+                            None if lost_task_index is None else tasks[lost_task_index],
+                            worker.exitcode,
+                        )
+                        if lost_task_index is not None:
+                            if lost_task_index in retried_task_indexes:
+                                raise RuntimeError(
+                                    f"Workers died twice running task (trial, "
+                                    f"percent adopt index) {tasks[lost_task_index]}, "
+                                    f"last with exit code {worker.exitcode}"
+                                ) from None
+                            retried_task_indexes.add(lost_task_index)
+                            unsent_task_indexes.appendleft(lost_task_index)
+                        # A worker that died while idle is only replaced if
+                        # there are tasks left for it
+                        if unsent_task_indexes:
+                            workers[worker_index] = self._start_worker(mp_context)
+                            send_next_task(worker_index)
+                        continue
+                    if error is not None:
+                        if task_index is None:
+                            raise RuntimeError(
+                                f"A worker raised an error at startup:\n{error}"
+                            )
+                        raise RuntimeError(
+                            "A worker raised an error running task (trial, "
+                            f"percent adopt index) {tasks[task_index]}:\n{error}"
+                        )
+                    del running_task_indexes[worker_index]
+                    num_finished_tasks += 1
+                    progress.task_finished(
+                        worker_index, tasks[task_index], config_seconds
+                    )
+                    send_next_task(worker_index)
+                    yield tasks[task_index], compact_data
+            # Tells the workers to exit
+            for _, conn in workers.values():
+                # Workers that died while idle exit anyways
+                with suppress(OSError):
+                    conn.send(None)
+        finally:
+            for worker, conn in workers.values():
+                worker.join(timeout=1)
+                if worker.is_alive():
+                    worker.terminate()
+                    worker.join()
+                conn.close()
+
+    def _start_worker(
+        self, mp_context: "DefaultContext | ForkContext"
+    ) -> tuple["BaseProcess", "Connection"]:
+        """Starts a worker, and returns it with the parent's end of its pipe"""
+
+        conn, worker_conn = mp_context.Pipe()
+        worker = mp_context.Process(target=self._run_worker, args=(worker_conn,))
+        worker.start()
+        # So that the parent's end of the pipe gets an EOF if the worker dies
+        worker_conn.close()
+        return worker, conn
+
+    def _run_worker(self, conn: "Connection") -> None:
+        """Runs the tasks sent over the pipe by the parent until it sends None
+
+        engine isn't picklable or dillable, as it has weakrefs, which
+        will deserialize to dead refs, so each worker builds its own once.
+        For each task, the worker sends back its index with either its compact
+        data and the seconds each scenario config took, or the traceback of the
+        error it raised
+        """
+
+        task_index = None
+        try:
+            engine = self._get_worker_engine()
+            while (indexed_task := conn.recv()) is not None:
+                task_index, task = indexed_task
+                compact_data = self._run_task(engine, *task).get_compact_data(
+                    self.scenario_configs
+                )
+                conn.send(
+                    (task_index, compact_data, self._scenario_config_seconds, None)
+                )
+        # Sent to the parent to raise, along with the task that raised it
+        except Exception:  # noqa: BLE001
+            conn.send((task_index, None, None, traceback.format_exc()))
 
     ############################
     # Data Aggregation Methods #
     ############################
 
-    def _run_chunk(self, chunk_id: int, trials: list[int]) -> GraphDataAggregator:
-        """Runs a chunk of trial inputs"""
+    def _run_task(
+        self, engine: BaseSimulationEngine, trial: int, percent_adopt_index: int
+    ) -> GraphDataAggregator:
+        """Runs every scenario config for a trial and percent adoption
 
-        # Must also seed randomness here since we don't want multiproc to be the same
-        self._seed_random(seed_suffix=str(chunk_id))
-
-        engine = self._get_engine_for_run_chunk()
+        Records the seconds each scenario config took in _scenario_config_seconds
+        """
 
+        self._scenario_config_seconds = dict()
         graph_data_aggregator = self.GraphDataAggregatorCls(
             graph_categories=self.graph_categories
         )
@@ -390,54 +816,83 @@ class Simulation:
         reuse_victim_asns = self._get_reuse_victim_asns()
         reuse_adopting_asns = self._get_reuse_adopting_asns()
 
-        for trial_index, trial in self._get_run_chunk_iter(trials):
-            # Use the same attacker victim pairs across all percent adoptions
-            trial_attacker_asns = None
-            trial_victim_asns = None
-            for percent_adopt_index, percent_adopt in enumerate(self.percent_adoptions):
-                # Use the same adopting asns across all scenarios configs
-                adopting_asns = None
-                for scenario_config in self.scenario_configs:
-                    # Create the scenario for this trial
-                    assert scenario_config.ScenarioCls, "ScenarioCls is None"
-                    scenario = scenario_config.ScenarioCls(
-                        scenario_config=scenario_config,
-                        percent_adoption=percent_adopt,
-                        engine=engine,
-                        attacker_asns=trial_attacker_asns,
-                        victim_asns=trial_victim_asns,
-                        adopting_asns=adopting_asns,
-                    )
-
-                    # Change AS Classes, seed announcements before propagation
-                    scenario.setup_engine(engine)
-                    # For each round of propagation run the engine
-                    for propagation_round in range(scenario_config.propagation_rounds):
-                        self._single_engine_run(
-                            engine=engine,
-                            percent_adopt=percent_adopt,
-                            trial=trial,
-                            scenario=scenario,
-                            propagation_round=propagation_round,
-                            graph_data_aggregator=graph_data_aggregator,
-                        )
+        # Use the same attacker victim pairs across all percent adoptions
+        trial_attacker_asns, trial_victim_asns = self._get_trial_attacker_victim_asns(
+            engine, trial
+        )
+        self._seed_task_random(trial, percent_adopt_index)
+        percent_adopt = self.percent_adoptions[percent_adopt_index]
+        # Use the same adopting asns across all scenarios configs
+        adopting_asns = None
+        for scenario_config in self.scenario_configs:
+            start_time = time.perf_counter()
+            # Create the scenario for this trial
+            assert scenario_config.ScenarioCls, "ScenarioCls is None"
+            scenario = scenario_config.ScenarioCls(
+                scenario_config=scenario_config,
+                percent_adoption=percent_adopt,
+                engine=engine,
+                attacker_asns=trial_attacker_asns,
+                victim_asns=trial_victim_asns,
+                adopting_asns=adopting_asns,
+            )
 
-                    if reuse_attacker_asns:
-                        trial_attacker_asns = scenario.attacker_asns
-                    if reuse_victim_asns:
-                        trial_victim_asns = scenario.victim_asns
-                    if reuse_adopting_asns:
-                        adopting_asns = scenario.adopting_asns
-                # Used to track progress with tqdm
-                total_completed = (
-                    trial_index * len(self.percent_adoptions) + percent_adopt_index + 1
+            # Change AS Classes, seed announcements before propagation
+            scenario.setup_engine(engine)
+            # For each round of propagation run the engine
+            for propagation_round in range(scenario_config.propagation_rounds):
+                self._single_engine_run(
+                    engine=engine,
+                    percent_adopt=percent_adopt,
+                    trial=trial,
+                    scenario=scenario,
+                    propagation_round=propagation_round,
+                    graph_data_aggregator=graph_data_aggregator,
                 )
-                self._write_tqdm_progress(chunk_id, total_completed)
 
-        self._write_tqdm_progress(chunk_id, len(trials) * len(self.percent_adoptions))
+            if reuse_attacker_asns:
+                trial_attacker_asns = scenario.attacker_asns
+            if reuse_victim_asns:
+                trial_victim_asns = scenario.victim_asns
+            if reuse_adopting_asns:
+                adopting_asns = scenario.adopting_asns
+
+            self._scenario_config_seconds[scenario_config.scenario_label] = (
+                time.perf_counter() - start_time
+            )
 
         return graph_data_aggregator
 
+    def _get_trial_attacker_victim_asns(
+        self, engine: BaseSimulationEngine, trial: int
+    ) -> tuple[frozenset[int] | None, frozenset[int] | None]:
+        """Returns the attacker and victim ASNs to reuse across a trial, if any
+
+        These are the ones the first scenario config picks at the first percent
+        adoption. Tasks of the same trial can run on different workers, so each
+        picks them again, from a seed that depends on the trial alone. Scenarios
+        pick attackers and victims before anything else, so this scenario is
+        only created for them
+        """
+
+        reuse_attacker_asns = self._get_reuse_attacker_asns()
+        reuse_victim_asns = self._get_reuse_victim_asns()
+        if not (reuse_attacker_asns or reuse_victim_asns):
+            return None, None
+
+        self._seed_task_random(trial)
+        scenario_config = self.scenario_configs[0]
+        assert scenario_config.ScenarioCls, "ScenarioCls is None"
+        scenario = scenario_config.ScenarioCls(
+            scenario_config=scenario_config,
+            percent_adoption=self.percent_adoptions[0],
+            engine=engine,
+        )
+        return (
+            scenario.attacker_asns if reuse_attacker_asns else None,
+            scenario.victim_asns if reuse_victim_asns else None,
+        )
+
     def _get_reuse_attacker_asns(self) -> bool:
         num_attackers_set = {x.num_attackers for x in self.scenario_configs}
         attacker_subcategories_set = {
@@ -458,43 +913,37 @@ class Simulation:
         }
         return len(adoption_categories_set) == 1
 
-    def _get_engine_for_run_chunk(self) -> BaseSimulationEngine:
-        """Returns SimulationEngine for the _run_chunk method
+    def _get_worker_engine(self) -> BaseSimulationEngine:
+        """Returns the SimulationEngine that a worker runs all of its tasks with
 
-        engine isn't picklable or dillable, as it has weakrefs, which
-        will deserialize to dead refs
+        If share_as_graph is True, workers use the graph forked from the parent
         """
-        constructor_kwargs = dict(self.as_graph_constructor_kwargs)
-        constructor_kwargs["tsv_path"] = None
-        as_graph: ASGraph = self.ASGraphConstructorCls(**constructor_kwargs).run()
+
+        as_graph = Simulation._shared_as_graph
+        if as_graph is None:
+            as_graph = self._get_worker_as_graph()
+        # Only passed when set, since not every engine supports them
+        engine_kwargs = {
+            kwarg: True
+            for kwarg, value in (
+                ("fold_stubs", self.fold_stubs),
+                ("compress_leaves", self.compress_leaves),
+            )
+            if value
+        }
         engine = self.SimulationEngineCls(
             as_graph,
             cached_as_graph_tsv_path=self.as_graph_constructor_kwargs.get("tsv_path"),
+            **engine_kwargs,
         )
         return engine
 
-    def _get_run_chunk_iter(self, trials: list[int]) -> Iterable[tuple[int, int]]:
-        """Returns iterator for trials with or without progress bar
+    def _get_worker_as_graph(self) -> ASGraph:
+        """Builds the ASGraph without writing it to a TSV"""
 
-        If there's only 1 cpu, run the progress bar here, else we run it elsewhere
-        """
-
-        if self.parse_cpus == 1:
-            return tqdm(
-                enumerate(trials),
-                total=len(trials),
-                desc=f"Simulating {self.output_dir.name}",
-            )
-        else:
-            return enumerate(trials)
-
-    def _write_tqdm_progress(self, chunk_id: int, completed: int) -> None:
-        """Writes total number of percent adoption trial pairs to file"""
-
-        # If self.parse_cpus == 1, then no multiprocessing is used
-        if self.parse_cpus > 1:
-            with (self._tqdm_tracking_dir / f"{chunk_id}.txt").open("w") as f:
-                f.write(str(completed))
+        constructor_kwargs = dict(self.as_graph_constructor_kwargs)
+        constructor_kwargs["tsv_path"] = None
+        return self.ASGraphConstructorCls(**constructor_kwargs).run()
 
     def _single_engine_run(
         self,
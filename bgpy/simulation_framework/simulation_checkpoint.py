@@ -0,0 +1,126 @@
+"""Append-only checkpoint of the data of finished Simulation tasks
+
+Long simulations only write their data once every task is done, so a run
+that is killed would otherwise lose everything. Instead, the data of each
+task is appended to the checkpoint as soon as it's done, and a run with the
+same parameters skips the tasks that are already in it.
+
+The shards of a sharded Simulation write their data to checkpoints too, which
+are then read and merged (see Simulation._run_shard)
+
+File layout (pickles, one after another):
+    header: version, fingerprint of the simulation parameters, task seed
+    records: (task, compact data) for each finished task, in the order they
+        finished. See GraphDataAggregator.get_compact_data
+
+Each record is synced to disk once it's written. A run that is killed while
+writing one leaves a partial record at the end, which is truncated on load
+"""
+
+import os
+import pickle
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .graph_data_aggregator.graph_data_aggregator import COMPACT_DATA_TYPE
+
+# Bump this whenever the layout changes so that old checkpoints are ignored
+VERSION = 1
+
+
+class SimulationCheckpoint:
+    """Checkpoint of the finished (trial, percent adopt index) tasks"""
+
+    def __init__(self, path: Path, fingerprint: str, task_seed: str) -> None:
+        self.path: Path = path
+        self.fingerprint: str = fingerprint
+        # Replaced by the seed in the checkpoint, if there is one (see load)
+        self.task_seed: str = task_seed
+
+    def load(self) -> dict[tuple[int, int], "COMPACT_DATA_TYPE"]:
+        """Returns the data of every task in the checkpoint, by task
+
+        If the checkpoint doesn't exist yet (or is from an older version),
+        it's started with this run's task seed. Otherwise the task seed of
+        the run that started it is used, so that the remaining tasks get the
+        same random numbers as they would have in that run
+        """
+
+        header, data, end = self._read()
+        if header is None or header["version"] != VERSION:
+            self._write_header()
+            return dict()
+        else:
+            self._validate_header(header)
+            self.task_seed = header["task_seed"]
+            # Drops a record that was partially written, so that new records
+            # are appended after the last whole one
+            os.truncate(self.path, end)
+            return data
+
+    def read(self) -> dict[tuple[int, int], "COMPACT_DATA_TYPE"]:
+        """Returns the data of every task in an existing checkpoint, by task
+
+        Unlike load, never writes to the checkpoint (such as to merge shards)
+        """
+
+        header, data, _end = self._read()
+        if header is None or header["version"] != VERSION:
+            raise ValueError(f"{self.path} isn't a checkpoint of this version")
+        self._validate_header(header)
+        return data
+
+    def _read(
+        self,
+    ) -> tuple[dict[str, Any] | None, dict[tuple[int, int], "COMPACT_DATA_TYPE"], int]:
+        """Returns the header, the data by task, and the end of the last record"""
+
+        data: dict[tuple[int, int], COMPACT_DATA_TYPE] = dict()
+        header = None
+        end = 0
+        if self.path.exists():
+            with self.path.open("rb") as f:
+                try:
+                    header = pickle.load(f)  # noqa: S301
+                    end = f.tell()
+                    while True:
+                        task, compact_data = pickle.load(f)  # noqa: S301
+                        data[task] = compact_data
+                        end = f.tell()
+                # The end of the file, or a record that was partially written
+                except (EOFError, pickle.UnpicklingError):
+                    pass
+        return header, data, end
+
+    def _validate_header(self, header: dict[str, Any]) -> None:
+        """Validates that the checkpoint is from a simulation like this one"""
+
+        if header["fingerprint"] != self.fingerprint:
+            raise ValueError(
+                f"{self.path} is from a simulation with different parameters. "
+                "Please move or delete it"
+            )
+
+    def append(self, task: tuple[int, int], compact_data: "COMPACT_DATA_TYPE") -> None:
+        """Appends the data of a finished task, and syncs it to disk"""
+
+        self._write((task, compact_data), "ab")
+
+    def _write_header(self) -> None:
+        """Starts the checkpoint over with just the header"""
+
+        header = {
+            "version": VERSION,
+            "fingerprint": self.fingerprint,
+            "task_seed": self.task_seed,
+        }
+        self._write(header, "wb")
+
+    def _write(self, obj: Any, mode: str) -> None:
+        """Writes obj to the checkpoint, and syncs it to disk"""
+
+        with self.path.open(mode) as f:
+            pickle.dump(obj, f)
+            f.flush()
+            os.fsync(f.fileno())
@@ -0,0 +1,154 @@
+"""Progress of the tasks of a Simulation
+
+Workers send the time each scenario config took with the data of each task,
+over the same pipe (see Simulation._run_worker), so progress doesn't need any
+files or polling. The parent reports it in the progress bar, and optionally
+in a JSON progress log.
+
+The JSON progress log has one JSON object per line, for each event:
+    start: the number of tasks and workers
+    task_finished: the task, the worker that ran it, the seconds each
+        scenario config took, the number of finished tasks, the ETA, and the
+        task that each worker is running (null if it's idle)
+    worker_died: the worker, the task it was running (null if it was idle),
+        and its exit code
+    end: the seconds per task of each scenario config
+Every event has the time (since the epoch) and the seconds since the start
+"""
+
+import json
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import IO, Any
+
+from tqdm import tqdm
+
+from bgpy.shared.constants import bgpy_logger
+
+
+class SimulationProgress:
+    """Reports the progress of the (trial, percent adopt index) tasks"""
+
+    def __init__(
+        self,
+        *,
+        num_tasks: int,
+        num_workers: int,
+        desc: str,
+        log_path: Path | None = None,
+    ) -> None:
+        self.num_tasks: int = num_tasks
+        self.num_finished_tasks: int = 0
+        # Task that each worker is running (None if it's idle), by worker index
+        self.worker_tasks: dict[int, tuple[int, int] | None] = dict.fromkeys(
+            range(num_workers)
+        )
+        # Total seconds that each scenario config took, by scenario label
+        self.scenario_config_seconds: defaultdict[str, float] = defaultdict(float)
+        self._start_time: float = time.perf_counter()
+        self._pbar: tqdm[Any] = tqdm(total=num_tasks, desc=desc)
+        self._log: IO[str] | None = log_path.open("a") if log_path else None
+        self._log_event("start", num_tasks=num_tasks, num_workers=num_workers)
+
+    def __enter__(self) -> "SimulationProgress":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    @property
+    def elapsed_seconds(self) -> float:
+        return time.perf_counter() - self._start_time
+
+    @property
+    def eta_seconds(self) -> float | None:
+        """Returns the seconds until every task is done, or None if unknown"""
+
+        if not self.num_finished_tasks:
+            return None
+        seconds_per_task = self.elapsed_seconds / self.num_finished_tasks
+        return seconds_per_task * (self.num_tasks - self.num_finished_tasks)
+
+    @property
+    def scenario_config_seconds_per_task(self) -> dict[str, float]:
+        """Returns the mean seconds a task spent on each scenario config
+
+        Every task runs every scenario config, so this is how long each one
+        takes a worker, not the wall time, which is shared between workers
+        """
+
+        return {
+            label: seconds / self.num_finished_tasks
+            for label, seconds in self.scenario_config_seconds.items()
+        }
+
+    def task_started(self, worker_index: int, task: tuple[int, int]) -> None:
+        self.worker_tasks[worker_index] = task
+
+    def task_finished(
+        self,
+        worker_index: int,
+        task: tuple[int, int],
+        scenario_config_seconds: dict[str, float],
+    ) -> None:
+        """Records the seconds each scenario config of the task took"""
+
+        self.worker_tasks[worker_index] = None
+        self.num_finished_tasks += 1
+        for label, seconds in scenario_config_seconds.items():
+            self.scenario_config_seconds[label] += seconds
+
+        self._pbar.set_postfix(
+            {
+                label: f"{seconds:.2f}s"
+                for label, seconds in self.scenario_config_seconds_per_task.items()
+            },
+            refresh=False,
+        )
+        self._pbar.update()
+        self._log_event(
+            "task_finished",
+            task=task,
+            worker=worker_index,
+            scenario_config_seconds=scenario_config_seconds,
+            num_finished_tasks=self.num_finished_tasks,
+            eta_seconds=self.eta_seconds,
+            worker_tasks=self.worker_tasks,
+        )
+
+    def worker_died(
+        self, worker_index: int, task: tuple[int, int] | None, exitcode: int | None
+    ) -> None:
+        """Records a worker that died, and the task it was running (if any)"""
+
+        self.worker_tasks[worker_index] = None
+        self._log_event(
+            "worker_died", worker=worker_index, task=task, exitcode=exitcode
+        )
+
+    def close(self) -> None:
+        """Closes the progress bar and log, and logs the time per scenario config"""
+
+        self._pbar.close()
+        if self.num_finished_tasks:
+            seconds_per_task = self.scenario_config_seconds_per_task
+            self._log_event("end", scenario_config_seconds_per_task=seconds_per_task)
+            for label, seconds in seconds_per_task.items():
+                bgpy_logger.info(f"{label}: {seconds:.2f}s per task")
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+    def _log_event(self, event: str, **kwargs: Any) -> None:
+        """Writes the event to the JSON progress log, if there is one"""
+
+        if self._log is not None:
+            record = {
+                "event": event,
+                "time": time.time(),
+                "elapsed_seconds": self.elapsed_seconds,
+                **kwargs,
+            }
+            self._log.write(json.dumps(record) + "\n")
+            self._log.flush()
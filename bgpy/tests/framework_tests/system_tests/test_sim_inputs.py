@@ -1,9 +1,21 @@
+import json
+import os
+import time
 from pathlib import Path
+from typing import ClassVar
 
 import pytest
+from frozendict import frozendict
 
+from bgpy.as_graphs import SyntheticASGraphConstructor, SyntheticTopology
+from bgpy.shared.enums import ASGroups
 from bgpy.simulation_engine import BGP, ROV
-from bgpy.simulation_framework import ScenarioConfig, Simulation, SubprefixHijack
+from bgpy.simulation_framework import (
+    AccidentalRouteLeak,
+    ScenarioConfig,
+    Simulation,
+    SubprefixHijack,
+)
 
 
 @pytest.mark.slow
@@ -29,3 +41,273 @@ def test_sim_inputs(tmp_path: Path):
         parse_cpus=1,
     )
     sim.run()
+
+
+@pytest.mark.slow
+@pytest.mark.framework
+def test_sim_share_as_graph(tmp_path: Path):
+    """Runs the simulation framework with the graph shared by forked workers"""
+
+    sim = Simulation(
+        percent_adoptions=(0.5,),
+        scenario_configs=(
+            ScenarioConfig(
+                ScenarioCls=SubprefixHijack,
+                AdoptPolicyCls=ROV,
+                BasePolicyCls=BGP,
+                num_attackers=1,
+            ),
+        ),
+        num_trials=2,
+        output_dir=tmp_path / "test_sim_share_as_graph",
+        parse_cpus=2,
+        share_as_graph=True,
+    )
+    sim.run()
+    assert Simulation._shared_as_graph is None
+    assert sim.csv_path.exists()
+
+
+class _CrashingSimulation(Simulation):
+    """Kills the worker running trial 1 the first time it runs it"""
+
+    def _run_task(self, engine, trial, percent_adopt_index):
+        crashed_path = self.output_dir / "crashed"
+        if trial == 1 and not crashed_path.exists():
+            crashed_path.touch()
+            os._exit(1)
+        return super()._run_task(engine, trial, percent_adopt_index)
+
+
+class _ExitingConnection:
+    """Pipe of a worker that exits between tasks
+
+    The worker exits right after it sends the data of (1, 0), and once it has
+    been idle for a bit. Each happens once
+    """
+
+    def __init__(self, conn, output_dir: Path):
+        self.conn = conn
+        self.output_dir: Path = output_dir
+        self.task: tuple[int, int] | None = None
+
+    def recv(self):
+        # Only idle once every task is sent, since the parent sends the next
+        # task as soon as it gets the data of the last
+        if self.task is not None and not self.conn.poll(0.5):
+            self._exit_once("exited_idle")
+        indexed_task = self.conn.recv()
+        if indexed_task is not None:
+            self.task = indexed_task[1]
+        return indexed_task
+
+    def send(self, obj) -> None:
+        self.conn.send(obj)
+        if self.task == (1, 0):
+            self._exit_once("exited_after_send")
+
+    def _exit_once(self, name: str) -> None:
+        exited_path = self.output_dir / name
+        if not exited_path.exists():
+            exited_path.touch()
+            os._exit(1)
+
+
+class _ExitingWorkerSimulation(Simulation):
+    """Kills workers between tasks
+
+    After (1, 0), the worker's next task is sent to a dead worker. The last
+    task (2, 1) is slow, so the other worker dies while it's idle
+    """
+
+    def _run_worker(self, conn):
+        super()._run_worker(_ExitingConnection(conn, self.output_dir))  # type: ignore
+
+    def _run_task(self, engine, trial, percent_adopt_index):
+        if (trial, percent_adopt_index) == (2, 1):
+            time.sleep(2)
+        return super()._run_task(engine, trial, percent_adopt_index)
+
+
+class _FailingSimulation(Simulation):
+    """Raises an error for trial 1"""
+
+    def _run_task(self, engine, trial, percent_adopt_index):
+        if trial == 1:
+            raise ValueError("Failed trial")
+        return super()._run_task(engine, trial, percent_adopt_index)
+
+
+class _InterruptedSimulation(Simulation):
+    """Raises an error for trial 1 the first time it runs it
+
+    Records the tasks that it runs
+    """
+
+    run_tasks: ClassVar[list[tuple[int, int]]] = list()
+
+    def _run_task(self, engine, trial, percent_adopt_index):
+        interrupted_path = self.output_dir / "interrupted"
+        if trial == 1 and not interrupted_path.exists():
+            interrupted_path.touch()
+            raise ValueError("Interrupted")
+        self.run_tasks.append((trial, percent_adopt_index))
+        return super()._run_task(engine, trial, percent_adopt_index)
+
+
+def _get_synthetic_sim(
+    tmp_path: Path,
+    parse_cpus: int,
+    SimulationCls: type[Simulation] = Simulation,
+    **kwargs,
+) -> Simulation:
+    """Returns a small, seeded simulation on a synthetic graph"""
+
+    kwargs.setdefault("output_dir", tmp_path / f"{SimulationCls.__name__}_{parse_cpus}")
+    return SimulationCls(
+        percent_adoptions=(0.1, 0.5),
+        scenario_configs=(
+            ScenarioConfig(
+                ScenarioCls=SubprefixHijack,
+                AdoptPolicyCls=ROV,
+                attacker_subcategory_attr=ASGroups.MULTIHOMED.value,
+            ),
+            # Route leaks can't come from stubs. Since both configs use the
+            # same attackers, they're reused across the percent adoptions
+            ScenarioConfig(
+                ScenarioCls=AccidentalRouteLeak,
+                AdoptPolicyCls=ROV,
+                attacker_subcategory_attr=ASGroups.MULTIHOMED.value,
+                scenario_label="ROV route leak",
+            ),
+        ),
+        num_trials=3,
+        parse_cpus=parse_cpus,
+        python_hash_seed=0,
+        ASGraphConstructorCls=SyntheticASGraphConstructor,
+        as_graph_constructor_kwargs=frozendict(
+            {
+                "as_graph_collector_kwargs": frozendict(
+                    {
+                        "cache_dir": tmp_path,
+                        "topology": SyntheticTopology(num_ases=1_000),
+                    }
+                ),
+            }
+        ),
+        **kwargs,
+    )
+
+
+@pytest.mark.slow
+@pytest.mark.framework
+def test_sim_parse_cpus_deterministic(tmp_path: Path, monkeypatch):
+    """Tests that seeded simulations write the same data for any number of CPUs
+
+    Every (trial, percent adoption) task is seeded on its own, so it doesn't
+    matter which worker runs it. A worker that dies only loses its task,
+    which is retried on a new worker, which the progress log records. A
+    worker that dies between tasks (or while idle) doesn't lose any
+    """
+
+    monkeypatch.setenv("PYTHONHASHSEED", "0")
+    csvs = list()
+    for parse_cpus, SimulationCls in (
+        (1, Simulation),
+        (2, Simulation),
+        (2, _ExitingWorkerSimulation),
+        (2, _CrashingSimulation),
+    ):
+        progress_log_path = tmp_path / "progress.jsonl"
+        progress_log_path.unlink(missing_ok=True)
+        sim = _get_synthetic_sim(
+            tmp_path, parse_cpus, SimulationCls, progress_log_path=progress_log_path
+        )
+        sim.run(GraphFactoryCls=None)
+        csvs.append(sim.csv_path.read_text())
+    assert (sim.output_dir / "crashed").exists()
+    exiting_output_dir = tmp_path / "_ExitingWorkerSimulation_2"
+    assert (exiting_output_dir / "exited_after_send").exists()
+    assert (exiting_output_dir / "exited_idle").exists()
+    assert csvs[0] == csvs[1] == csvs[2] == csvs[3]
+
+    # The progress log of the run with the crash
+    events = [json.loads(x) for x in progress_log_path.read_text().splitlines()]
+    assert [x["event"] for x in events].count("task_finished") == 6
+    assert [x["task"] for x in events if x["event"] == "worker_died"] == [[1, 0]]
+    assert events[-1]["event"] == "end"
+    assert set(events[-1]["scenario_config_seconds_per_task"]) == {
+        x.scenario_label for x in sim.scenario_configs
+    }
+
+
+@pytest.mark.slow
+@pytest.mark.framework
+def test_sim_worker_error(tmp_path: Path, monkeypatch):
+    """Tests that errors in workers are raised in the parent"""
+
+    monkeypatch.setenv("PYTHONHASHSEED", "0")
+    sim = _get_synthetic_sim(tmp_path, 2, _FailingSimulation)
+    with pytest.raises(RuntimeError, match=r"task .* \(1, \d\)(.|\n)*Failed trial"):
+        sim.run(GraphFactoryCls=None)
+
+
+@pytest.mark.slow
+@pytest.mark.framework
+def test_sim_checkpoint_resume(tmp_path: Path, monkeypatch):
+    """Tests that an interrupted run resumes from its checkpoint
+
+    The resumed run only runs the tasks that weren't checkpointed, and writes
+    the same data as a run that wasn't interrupted
+    """
+
+    monkeypatch.setenv("PYTHONHASHSEED", "0")
+    sim = _get_synthetic_sim(tmp_path, 1)
+    sim.run(GraphFactoryCls=None)
+
+    output_dir = tmp_path / "resumed"
+    interrupted_sim = _get_synthetic_sim(
+        tmp_path, 1, _InterruptedSimulation, output_dir=output_dir, checkpoint=True
+    )
+    with pytest.raises(ValueError, match="Interrupted"):
+        interrupted_sim.run(GraphFactoryCls=None)
+    assert len(list(output_dir.glob("checkpoint_*"))) == 1
+
+    _InterruptedSimulation.run_tasks.clear()
+    resumed_sim = _get_synthetic_sim(
+        tmp_path, 1, _InterruptedSimulation, output_dir=output_dir, checkpoint=True
+    )
+    resumed_sim.run(GraphFactoryCls=None)
+    assert _InterruptedSimulation.run_tasks == [(1, 0), (1, 1), (2, 0), (2, 1)]
+    assert resumed_sim.csv_path.read_text() == sim.csv_path.read_text()
+    # Removed once the data is written
+    assert not list(output_dir.glob("checkpoint_*"))
+
+
+@pytest.mark.slow
+@pytest.mark.framework
+def test_sim_shards_merge(tmp_path: Path, monkeypatch):
+    """Tests that merged shards write the same data as a run that isn't sharded"""
+
+    monkeypatch.setenv("PYTHONHASHSEED", "0")
+    sim = _get_synthetic_sim(tmp_path, 1)
+    sim.run(GraphFactoryCls=None)
+
+    output_dir = tmp_path / "shards"
+    for shard_index, parse_cpus in ((0, 1), (1, 2), (2, 1)):
+        _get_synthetic_sim(
+            tmp_path, parse_cpus, output_dir=output_dir, shard=(shard_index, 3)
+        ).run(GraphFactoryCls=None)
+    shard_paths = tuple(sorted(output_dir.glob("shard_*")))
+    assert len(shard_paths) == 3
+
+    with pytest.raises(ValueError, match="missing 2 of the 6 tasks"):
+        _get_synthetic_sim(
+            tmp_path, 1, output_dir=output_dir, merge_shard_paths=shard_paths[1:]
+        ).run(GraphFactoryCls=None)
+
+    merged_sim = _get_synthetic_sim(
+        tmp_path, 1, output_dir=output_dir, merge_shard_paths=shard_paths
+    )
+    merged_sim.run(GraphFactoryCls=None)
+    assert merged_sim.csv_path.read_text() == sim.csv_path.read_text()
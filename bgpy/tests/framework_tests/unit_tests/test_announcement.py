@@ -0,0 +1,49 @@
+from dataclasses import dataclass
+
+import pytest
+
+from bgpy.shared.enums import Relationships
+from bgpy.simulation_engine import Announcement
+
+
+@dataclass(slots=True, frozen=True)
+class SlotsAnn(Announcement):
+    extra: int = 0
+
+
+@dataclass(frozen=True)
+class NoSlotsAnn(Announcement):
+    extra: int = 0
+
+
+@pytest.mark.framework
+@pytest.mark.unit_tests
+class TestAnnouncement:
+    @pytest.mark.parametrize("AnnCls", [Announcement, SlotsAnn, NoSlotsAnn])
+    def test_unchecked_copies_match_copy(self, AnnCls):
+        """Tests that the unchecked copies match the checked copy"""
+
+        ann = AnnCls(prefix="1.2.0.0/16", as_path=(1,), timestamp=1)
+        processed = ann.copy_processed((2, 1), Relationships.CUSTOMERS)
+        assert type(processed) is AnnCls
+        assert processed == ann.copy(
+            {
+                "as_path": (2, 1),
+                "recv_relationship": Relationships.CUSTOMERS,
+                "seed_asn": None,
+            }
+        )
+        assert processed.copy_next_hop(2) == processed.copy({"next_hop_asn": 2})
+        assert ann.copy_bgpsec(3, (1,)) == ann.copy(
+            {"bgpsec_next_asn": 3, "bgpsec_as_path": (1,)}
+        )
+        assert ann.unchecked_copy({"withdraw": True}) == ann.copy({"withdraw": True})
+        # The original ann is unchanged
+        assert ann == AnnCls(prefix="1.2.0.0/16", as_path=(1,), timestamp=1)
+
+    def test_unchecked_copy_invalid_field(self):
+        """Tests that unknown fields still raise"""
+
+        ann = Announcement(prefix="1.2.0.0/16", as_path=(1,))
+        with pytest.raises(TypeError):
+            ann.unchecked_copy({"not_a_field": 1})
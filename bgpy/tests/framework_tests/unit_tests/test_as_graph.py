@@ -0,0 +1,365 @@
+import bz2
+import sys
+from datetime import datetime
+from itertools import pairwise
+from typing import Any
+
+import pytest
+from frozendict import frozendict
+
+from bgpy.as_graphs import (
+    AS,
+    ASGraph,
+    ASGraphInfo,
+    ASGraphInfoDiff,
+    CAIDAASGraphCollector,
+    CAIDAASGraphConstructor,
+    PeerLink,
+    SyntheticASGraphConstructor,
+    SyntheticTopology,
+)
+from bgpy.as_graphs import CustomerProviderLink as CPLink
+from bgpy.shared.enums import Relationships
+from bgpy.shared.exceptions import CustomerProviderCycleError
+from bgpy.tests.engine_tests.engine_test_configs.examples.as_graph_info_000 import (
+    as_graph_info_000,
+)
+
+
+@pytest.fixture
+def as_graph() -> ASGraph:
+    return ASGraph(as_graph_info_000)
+
+
+@pytest.mark.framework
+@pytest.mark.unit_tests
+class TestASGraph:
+    def test_csr_matches_relationship_tuples(self, as_graph):
+        """Tests that the CSR arrays agree with the AS objects"""
+
+        csr = as_graph.csr
+        assert len(csr) == len(as_graph)
+        for as_obj in as_graph:
+            assert csr.asns[as_obj.index] == as_obj.asn
+            assert csr.asn_to_index[as_obj.asn] == as_obj.index
+            for rel_attr in ("peers", "providers", "customers"):
+                csr_asns = [csr.asns[i] for i in getattr(csr, rel_attr)(as_obj.index)]
+                assert csr_asns == [x.asn for x in getattr(as_obj, rel_attr)]
+
+    def test_as_derived_attrs(self, as_graph):
+        """Tests the attributes set from the relationships, and that ASes have
+        nothing stored outside of their slots
+        """
+
+        yaml_as_graph = ASGraph.loads_yaml(as_graph.dumps_yaml())
+        for graph in (as_graph, yaml_as_graph):
+            for as_obj in graph:
+                neighbors = as_obj.customers + as_obj.peers + as_obj.providers
+                assert as_obj.neighbors == neighbors
+                assert as_obj.neighbor_asns == {x.asn for x in neighbors}
+                assert as_obj.stub == (len(neighbors) == 1)
+                assert as_obj.multihomed == (
+                    not as_obj.customers and len(neighbors) > 1
+                )
+                assert as_obj.transit == (bool(as_obj.customers) and len(neighbors) > 1)
+                assert not as_obj.__dict__
+
+    def test_csr_rank_ranges(self, as_graph):
+        """Tests that propagation ranks are contiguous ranges of indices"""
+
+        csr = as_graph.csr
+        for rank, rank_range in zip(
+            as_graph.propagation_ranks, csr.propagation_rank_ranges, strict=True
+        ):
+            assert [x.index for x in rank] == list(rank_range)
+        # Customers must always come before their providers
+        for as_obj in as_graph:
+            assert all(x.index < as_obj.index for x in as_obj.customers)
+
+    def test_binary_cache(self, tmp_path, monkeypatch):
+        """Tests that the binary cache loads the same graph it was built from"""
+
+        collector_kwargs = frozendict(
+            {"dl_time": datetime(2024, 1, 1), "cache_dir": tmp_path}
+        )
+        dl_path = CAIDAASGraphCollector(**collector_kwargs).cache_path
+        dl_path.write_text(
+            "# input clique: 1 2\n"
+            "# IXP ASes: 7\n"
+            "1|2|0|bgp\n"
+            "1|3|-1|bgp\n"
+            "2|4|-1|bgp\n"
+            "3|5|-1|bgp\n"
+            "4|5|-1|bgp\n"
+            "3|4|0|bgp\n"
+            "5|6|-1|bgp\n"
+            "7|6|0|bgp\n"
+        )
+        constructor_kwargs: dict[str, Any] = {
+            "as_graph_collector_kwargs": collector_kwargs,
+            "as_graph_kwargs": frozendict({"store_customer_cone_asns": True}),
+        }
+        built = CAIDAASGraphConstructor(**constructor_kwargs).run()
+        (cache_path,) = tmp_path.glob("*.asgraph")
+
+        # Loading from the cache must not parse the downloaded file
+        def fail(*args, **kwargs):
+            raise AssertionError("Should have loaded from the binary cache")
+
+        with monkeypatch.context() as m:
+            m.setattr(CAIDAASGraphConstructor, "_get_as_graph_info", fail)
+            loaded = CAIDAASGraphConstructor(**constructor_kwargs).run()
+        assert loaded == built
+        assert [x.asn for x in loaded] == [x.asn for x in built]
+        assert [x.db_row for x in loaded] == [x.db_row for x in built]
+        assert loaded.csr == built.csr
+        assert loaded.ixp_asns == built.ixp_asns == frozenset({7})
+
+        # Different graph kwargs must not use the same cache
+        CAIDAASGraphConstructor(as_graph_collector_kwargs=collector_kwargs).run()
+        assert len(list(tmp_path.glob("*.asgraph"))) == 2
+
+        # Corrupt caches are rebuilt, including ones cut off in the section table
+        cache = cache_path.read_bytes()
+        for corrupt_cache in (b"garbage", cache[:40]):
+            cache_path.write_bytes(corrupt_cache)
+            assert CAIDAASGraphConstructor(**constructor_kwargs).run() == built
+            assert cache_path.read_bytes() == cache
+
+        # Failing to write the cache doesn't fail the run, nor leave temp files
+        def fail_replace(*args, **kwargs):
+            raise OSError("No space left on device")
+
+        cache_path.unlink()
+        with monkeypatch.context() as m:
+            m.setattr(type(cache_path), "replace", fail_replace)
+            assert CAIDAASGraphConstructor(**constructor_kwargs).run() == built
+        assert not cache_path.exists()
+        assert not list(tmp_path.glob("*.tmp"))
+
+    def test_caida_bz2_local_mirror(self, tmp_path):
+        """Tests parsing the .bz2 archive in a local mirror, like the text"""
+
+        text = (
+            "# source:toposcope\n"
+            "# input clique: 1 2\n"
+            "# IXP ASes: 7\n"
+            "1|2|0|bgp\n"
+            "1|3|-1|bgp\n"
+            "1|3|-1|mlp\n"
+            "2|4|-1|bgp\r\n"
+            "\n"
+            "4|5|-1|bgp\n"
+            "4|3|0|bgp\n"
+            "3|4|0|bgp\n"
+            "7|6|0|bgp"
+        )
+        mirror = tmp_path / "mirror"
+        mirror.mkdir()
+        (mirror / "20231201.as-rel2.txt.bz2").write_bytes(bz2.compress(b""))
+        (mirror / "20240101.as-rel2.txt.bz2").write_bytes(bz2.compress(text.encode()))
+        collector_kwargs = {"dl_time": datetime(2024, 1, 15), "cache_dir": tmp_path}
+        constructor = CAIDAASGraphConstructor(
+            as_graph_collector_kwargs=frozendict(
+                {**collector_kwargs, "local_path": mirror}
+            ),
+        )
+        as_graph = constructor.run()
+
+        as_graph_info = constructor._get_as_graph_info(
+            constructor.as_graph_collector.run()
+        )
+        assert as_graph_info.customer_provider_links == frozenset(
+            CPLink(customer_asn=customer_asn, provider_asn=provider_asn)
+            for provider_asn, customer_asn in ((1, 3), (2, 4), (4, 5))
+        )
+        assert as_graph_info.peer_links == frozenset(
+            PeerLink(*asns) for asns in ((1, 2), (3, 4), (6, 7))
+        )
+        assert as_graph_info.input_clique_asns == frozenset({1, 2})
+        assert as_graph_info.ixp_asns == frozenset({7})
+
+        # Same graph as from the decompressed text
+        dl_path = CAIDAASGraphCollector(**collector_kwargs).cache_path
+        dl_path.write_text(text)
+        text_graph = CAIDAASGraphConstructor(
+            as_graph_collector_kwargs=frozendict(collector_kwargs), binary_cache=False
+        ).run()
+        assert [x.db_row for x in as_graph] == [x.db_row for x in text_graph]
+
+    def test_synthetic_topology(self, tmp_path):
+        """Tests that synthetic topologies are reproducible and CAIDA-like"""
+
+        topology = SyntheticTopology(num_ases=3_000, seed=1)
+        as_graph_info = topology.get_as_graph_info()
+        # ASGraphInfo.__eq__ only compares ASNs, so compare the links
+        same_seed_info = SyntheticTopology(num_ases=3_000, seed=1).get_as_graph_info()
+        other_seed_info = SyntheticTopology(num_ases=3_000, seed=2).get_as_graph_info()
+        assert as_graph_info.links == same_seed_info.links
+        assert as_graph_info.ixp_asns == same_seed_info.ixp_asns
+        assert as_graph_info.links != other_seed_info.links
+
+        # Building the graph also checks that there are no cycles
+        as_graph = ASGraph(as_graph_info)
+        assert len(as_graph) == 3_000
+        input_clique = [x for x in as_graph if x.input_clique]
+        assert len(input_clique) == topology.num_input_clique_ases
+        for as_obj in input_clique:
+            assert not as_obj.providers
+            assert {x.asn for x in input_clique} - as_obj.peer_asns == {as_obj.asn}
+        ixps = [x for x in as_graph if x.ixp]
+        assert len(ixps) == topology.num_ixps
+        assert all(len(x.peers) == topology.ixp_members for x in ixps)
+        assert sum(x.stub for x in as_graph) > len(as_graph) / 10
+        assert sum(x.multihomed for x in as_graph) > len(as_graph) / 10
+        # Power-law customer degrees: a few ASes with most of the customers
+        num_customers = sorted(len(x.customers) for x in as_graph)
+        assert num_customers[len(num_customers) // 2] == 0
+        assert num_customers[-1] > 100
+
+        # Leaving out stubs regenerates the topology without them
+        constructor = SyntheticASGraphConstructor(
+            as_graph_collector_kwargs=frozendict(
+                {"cache_dir": tmp_path, "topology": topology}
+            ),
+            stubs=False,
+        )
+        no_stubs_graph = constructor.run()
+        assert no_stubs_graph.as_dict.keys() == {x.asn for x in as_graph if not x.stub}
+        assert len(list(tmp_path.glob("*.asgraph"))) == 1
+        assert constructor.run() == no_stubs_graph
+
+        with pytest.raises(ValueError, match="too small"):
+            SyntheticTopology(num_ases=10, num_input_clique_ases=20)
+
+    def test_propagation_ranks_deep_chain(self):
+        """Tests ranks for a customer chain deeper than the recursion limit"""
+
+        depth = sys.getrecursionlimit() * 2
+        links = frozenset(
+            CPLink(customer_asn=asn, provider_asn=asn + 1) for asn in range(1, depth)
+        )
+        as_graph = ASGraph(ASGraphInfo(customer_provider_links=links))
+        assert [x.propagation_rank for x in as_graph] == list(range(depth))
+
+    def test_propagation_ranks_cycle(self):
+        """Tests that customer provider cycles are reported with their ASNs"""
+
+        links = frozenset(
+            [
+                CPLink(customer_asn=1, provider_asn=2),
+                CPLink(customer_asn=2, provider_asn=3),
+                CPLink(customer_asn=3, provider_asn=4),
+                CPLink(customer_asn=4, provider_asn=2),
+                CPLink(customer_asn=4, provider_asn=5),
+            ]
+        )
+        with pytest.raises(CustomerProviderCycleError, match="2 -> 3 -> 4 -> 2"):
+            ASGraph(ASGraphInfo(customer_provider_links=links))
+
+    def test_update(self):
+        """Tests that updating a graph with a diff is the same as rebuilding it"""
+
+        as_graph_info = SyntheticTopology(num_ases=1_000, seed=3).get_as_graph_info()
+        as_graph = ASGraph(as_graph_info, store_customer_cone_asns=True)
+        cp_links = sorted(as_graph_info.customer_provider_links, key=lambda x: x.asns)
+        peer_links = sorted(as_graph_info.peer_links, key=lambda x: x.asns)
+        # A peer link that becomes a customer provider link (customers have
+        # lower CSR ids than their providers, so this can't make a cycle)
+        customer_asn, provider_asn = sorted(
+            peer_links[0].asns, key=as_graph.csr.asn_to_index.__getitem__
+        )
+        new_as_graph_info = ASGraphInfo(
+            customer_provider_links=frozenset(
+                [
+                    *cp_links[20:],
+                    CPLink(customer_asn=customer_asn, provider_asn=provider_asn),
+                    CPLink(customer_asn=10_001, provider_asn=cp_links[0].provider_asn),
+                ]
+            ),
+            peer_links=frozenset(peer_links[1:-20]),
+            ixp_asns=as_graph_info.ixp_asns,
+            input_clique_asns=as_graph_info.input_clique_asns | {10_002},
+        )
+
+        for old_info, new_info in (
+            (as_graph_info, new_as_graph_info),
+            (new_as_graph_info, as_graph_info),
+        ):
+            as_graph.update(old_info.get_diff(new_info))
+            new_as_graph = ASGraph(new_info, store_customer_cone_asns=True)
+            assert as_graph == new_as_graph
+            assert [[x.asn for x in rank] for rank in as_graph.propagation_ranks] == [
+                [x.asn for x in rank] for rank in new_as_graph.propagation_ranks
+            ]
+            assert as_graph.csr == new_as_graph.csr
+            assert as_graph.cones.customer_cones == new_as_graph.cones.customer_cones
+            assert as_graph.asn_groups == new_as_graph.asn_groups
+            assert [x.db_row for x in as_graph] == [
+                new_as_graph.as_dict[x.asn].db_row for x in as_graph
+            ]
+
+    def test_update_errors(self, as_graph):
+        """Tests that diffs that can't be applied leave the graph as it was"""
+
+        # 1 is a customer of 8, which is a customer of 11
+        with pytest.raises(CustomerProviderCycleError, match="1 -> 8 -> 11 -> 1"):
+            as_graph.update(
+                ASGraphInfoDiff(
+                    added_customer_provider_links=frozenset(
+                        [CPLink(customer_asn=11, provider_asn=1)]
+                    )
+                )
+            )
+        with pytest.raises(ValueError, match="isn't in the providers"):
+            as_graph.update(
+                ASGraphInfoDiff(
+                    removed_customer_provider_links=frozenset(
+                        [CPLink(customer_asn=5, provider_asn=1)]
+                    )
+                )
+            )
+        assert as_graph == ASGraph(as_graph_info_000)
+
+    @pytest.mark.parametrize("rel", [Relationships.CUSTOMERS, Relationships.PROVIDERS])
+    def test_cones(self, rel):
+        """Tests cone queries against cones found by walking the AS objects"""
+
+        def get_cone(as_obj: AS) -> frozenset[int]:
+            if rel == Relationships.CUSTOMERS and as_obj.stub:
+                return frozenset()
+            cone: set[int] = set()
+            stack = [as_obj]
+            while stack:
+                for neighbor in getattr(stack.pop(), rel.name.lower()):
+                    if neighbor.asn not in cone:
+                        cone.add(neighbor.asn)
+                        stack.append(neighbor)
+            return frozenset(cone)
+
+        stored_graph = ASGraph(
+            as_graph_info_000,
+            store_customer_cone_asns=True,
+            store_provider_cone_asns=True,
+        )
+        # Cones that aren't stored are computed one at a time
+        for as_graph in (stored_graph, ASGraph(as_graph_info_000)):
+            cones = as_graph.cones
+            expected = {x.asn: get_cone(x) for x in as_graph}
+            for asn, cone in expected.items():
+                assert cones.asns(asn, rel) == cone
+                assert cones.size(asn, rel) == len(cone)
+                for other_asn in expected:
+                    assert cones.contains(asn, other_asn, rel) == (other_asn in cone)
+            asns = sorted(expected)
+            for asn1, asn2 in pairwise(asns):
+                cone = expected[asn1] & expected[asn2]
+                assert cones.intersection((asn1, asn2), rel) == cone
+                assert cones.intersection_size((asn1, asn2), rel) == len(cone)
+
+        # The AS attrs read from the stored cones
+        cone_attr = rel.name.lower()[:-1] + "_cone"
+        for as_obj in stored_graph:
+            cone = get_cone(as_obj)
+            assert getattr(as_obj, f"{cone_attr}_asns") == cone
+            assert getattr(as_obj, f"{cone_attr}_size") == len(cone)
@@ -0,0 +1,43 @@
+import pytest
+
+from bgpy.simulation_engine import ASPath
+
+
+@pytest.fixture
+def as_path() -> ASPath:
+    return ASPath(1, (2, 3)).prepend(4).prepend(5)
+
+
+@pytest.mark.framework
+@pytest.mark.unit_tests
+class TestASPath:
+    def test_matches_tuple(self, as_path):
+        """Tests that the ASPath acts like the tuple of the same path"""
+
+        expected = (5, 4, 1, 2, 3)
+        assert as_path == expected
+        assert hash(as_path) == hash(expected)
+        assert tuple(as_path) == expected
+        assert len(as_path) == len(expected)
+        assert as_path.origin == 3
+        assert as_path[::-1] == expected[::-1]
+        assert as_path[1:] == expected[1:]
+        for i in range(-len(expected), len(expected)):
+            assert as_path[i] == expected[i]
+        with pytest.raises(IndexError):
+            as_path[len(expected)]
+
+    def test_contains(self, as_path):
+        """Tests membership, including ASNs that collide in the mask"""
+
+        for asn in (1, 2, 3, 4, 5):
+            assert asn in as_path
+        for asn in (0, 6, 1 + 64, 5 + 128):
+            assert asn not in as_path
+
+    def test_shares_tail(self, as_path):
+        """Tests that prepending doesn't copy the path"""
+
+        longer_path = as_path.prepend(6)
+        assert longer_path.tail is as_path
+        assert longer_path == (6, *as_path)
@@ -0,0 +1,48 @@
+from pathlib import Path
+
+import pytest
+
+from bgpy.simulation_framework import SimulationCheckpoint
+
+
+@pytest.mark.framework
+@pytest.mark.unit_tests
+class TestSimulationCheckpoint:
+    def test_resume(self, tmp_path: Path):
+        """Tests that a checkpoint resumes with its tasks and task seed"""
+
+        path = tmp_path / "checkpoint.pickle"
+        checkpoint = SimulationCheckpoint(path, "fingerprint", "1")
+        assert checkpoint.load() == dict()
+        checkpoint.append((0, 0), [(0, 0, 0, 0.5, (1.0, 2.0))])
+        checkpoint.append((0, 1), [])
+
+        resumed_checkpoint = SimulationCheckpoint(path, "fingerprint", "2")
+        assert resumed_checkpoint.load() == {
+            (0, 0): [(0, 0, 0, 0.5, (1.0, 2.0))],
+            (0, 1): [],
+        }
+        assert resumed_checkpoint.task_seed == "1"
+
+    def test_partial_record(self, tmp_path: Path):
+        """Tests that a record that was partially written is dropped"""
+
+        path = tmp_path / "checkpoint.pickle"
+        checkpoint = SimulationCheckpoint(path, "fingerprint", "1")
+        checkpoint.load()
+        checkpoint.append((0, 0), [])
+        size = path.stat().st_size
+        checkpoint.append((0, 1), [(0, 0, 0, 0.5, (1.0,))])
+        with path.open("r+b") as f:
+            f.truncate(path.stat().st_size - 3)
+
+        assert SimulationCheckpoint(path, "fingerprint", "1").load() == {(0, 0): []}
+        assert path.stat().st_size == size
+
+    def test_fingerprint_mismatch(self, tmp_path: Path):
+        """Tests that a checkpoint of other parameters isn't used"""
+
+        path = tmp_path / "checkpoint.pickle"
+        SimulationCheckpoint(path, "fingerprint", "1").load()
+        with pytest.raises(ValueError, match="different parameters"):
+            SimulationCheckpoint(path, "other fingerprint", "1").load()
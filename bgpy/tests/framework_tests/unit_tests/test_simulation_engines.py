@@ -0,0 +1,402 @@
+from collections.abc import Callable
+from functools import partial
+from typing import ClassVar
+
+import pytest
+from frozendict import frozendict
+
+from bgpy.as_graphs import ASGraph, ASGraphInfo, PeerLink
+from bgpy.as_graphs import CustomerProviderLink as CPLink
+from bgpy.shared.enums import ASNs, Relationships
+from bgpy.simulation_engine import (
+    BGP,
+    ROV,
+    Announcement,
+    ArraySimulationEngine,
+    ASPath,
+    BaseSimulationEngine,
+    RoSTFull,
+    SimulationEngine,
+    StreamingSimulationEngine,
+    ThreadedSimulationEngine,
+)
+from bgpy.simulation_framework import (
+    ForgedOriginPrefixHijack,
+    PrefixHijack,
+    ScenarioConfig,
+    SubprefixHijack,
+    ValidPrefix,
+)
+from bgpy.simulation_framework.as_graph_analyzers import ASGraphAnalyzer
+from bgpy.tests.engine_tests.engine_test_configs import engine_test_configs
+from bgpy.tests.engine_tests.engine_test_configs.examples.as_graph_info_000 import (
+    as_graph_info_000,
+)
+from bgpy.tests.engine_tests.utils import EngineTestConfig
+
+
+def _run_engine(
+    conf: EngineTestConfig, SimulationEngineCls: Callable[..., BaseSimulationEngine]
+) -> BaseSimulationEngine:
+    """Runs the engine test config with a different engine"""
+
+    as_graph = conf.ASGraphCls(
+        as_graph_info=conf.as_graph_info,
+        BasePolicyCls=conf.scenario_config.BasePolicyCls,
+        store_provider_cone_size=conf.requires_provider_cones,
+        store_provider_cone_asns=conf.requires_provider_cones,
+    )
+    engine = SimulationEngineCls(as_graph)
+    scenario = conf.scenario_config.ScenarioCls(
+        scenario_config=conf.scenario_config, engine=engine
+    )
+    scenario.setup_engine(engine)
+    for round_ in range(conf.scenario_config.propagation_rounds):
+        engine.run(propagation_round=round_, scenario=scenario)
+        for func in (scenario.pre_aggregation_hook, scenario.post_propagation_hook):
+            func(engine=engine, propagation_round=round_, trial=0, percent_adopt=0)
+    return engine
+
+
+class _LoggingBGP(BGP):
+    """Like a downstream policy that overrides BGP's methods"""
+
+    name = "LoggingBGP (test)"
+    processed: ClassVar[list[tuple[int, Relationships]]] = list()
+
+    def process_incoming_anns(self, *, from_rel, **kwargs) -> None:
+        self.processed.append((self.as_.asn, from_rel))
+        super().process_incoming_anns(from_rel=from_rel, **kwargs)
+
+    def _valid_ann(self, ann, recv_rel) -> bool:
+        return super()._valid_ann(ann, recv_rel)
+
+
+class _IdleSafeLoggingBGP(_LoggingBGP):
+    """Like a downstream policy that opts back in to skip_when_idle"""
+
+    name = "IdleSafeLoggingBGP (test)"
+    skip_when_idle: bool = True
+
+
+class _Untouchable:
+    """Fails the test if anything about it is checked"""
+
+    def __getattr__(self, name):
+        raise AssertionError(f"Idle AS's {name} was checked")
+
+    def __bool__(self):
+        raise AssertionError("Idle AS was checked")
+
+    def __len__(self):
+        raise AssertionError("Idle AS was checked")
+
+
+@pytest.mark.framework
+@pytest.mark.unit_tests
+class TestSimulationEngines:
+    @pytest.mark.parametrize(
+        "SimulationEngineCls",
+        [
+            ArraySimulationEngine,
+            StreamingSimulationEngine,
+            # Small chunks so that the threads are used even on small graphs
+            partial(
+                ThreadedSimulationEngine,
+                max_workers=4,
+                min_chunk_size=1,
+                serial_with_gil=False,
+            ),
+        ],
+        ids=["Array", "Streaming", "Threaded"],
+    )
+    @pytest.mark.parametrize("conf", engine_test_configs, ids=lambda x: x.name)
+    def test_matches_simulation_engine(self, conf, SimulationEngineCls):
+        """Tests that other engines produce the same RIBs as the SimulationEngine"""
+
+        expected = _run_engine(conf, SimulationEngine)
+        assert _run_engine(conf, SimulationEngineCls) == expected
+
+    @pytest.mark.parametrize("conf", engine_test_configs, ids=lambda x: x.name)
+    def test_shared_as_paths(self, conf, monkeypatch):
+        """Tests that shared AS paths produce the same RIBs as tuples"""
+
+        expected = _run_engine(conf, SimulationEngine)
+        monkeypatch.setattr(Announcement, "shared_as_paths", True)
+        engine = _run_engine(conf, SimulationEngine)
+        assert engine == expected
+        for as_obj in engine.as_graph:
+            for ann in as_obj.policy.local_rib.values():
+                assert ann.seed_asn is not None or isinstance(ann.as_path, ASPath)
+
+    @pytest.mark.parametrize("conf", engine_test_configs, ids=lambda x: x.name)
+    def test_fold_stubs(self, conf):
+        """Tests that folding stubs doesn't change any outcomes"""
+
+        outcomes = list()
+        for fold_stubs in (False, True):
+            engine = _run_engine(conf, partial(SimulationEngine, fold_stubs=fold_stubs))
+            scenario = conf.scenario_config.ScenarioCls(
+                scenario_config=conf.scenario_config, engine=engine
+            )
+            analyzer = ASGraphAnalyzer(
+                engine=engine, scenario=scenario, control_plane_tracking=True
+            )
+            outcomes.append(analyzer.analyze())
+
+            # Folded stubs are only hidden from their providers
+            folded_stub_provider_asns = dict(engine.as_graph.folded_stub_provider_asns)
+            for stub_asn, provider_asn in folded_stub_provider_asns.items():
+                provider = engine.as_graph.as_dict[provider_asn]
+                assert stub_asn not in [x.asn for x in provider.customers]
+                assert not engine.as_graph.as_dict[stub_asn].policy.local_rib
+            engine.as_graph.unfold_stubs()
+            for stub_asn, provider_asn in folded_stub_provider_asns.items():
+                provider = engine.as_graph.as_dict[provider_asn]
+                assert stub_asn in [x.asn for x in provider.customers]
+        assert outcomes[0] == outcomes[1]
+
+    @pytest.mark.parametrize(
+        "ScenarioCls", [PrefixHijack, SubprefixHijack, ForgedOriginPrefixHijack]
+    )
+    def test_compress_leaves(self, ScenarioCls):
+        """Tests that compressing leaves (and folding stubs) changes no outcomes"""
+
+        # Leaves with the same providers and peers, one of which is an ROV leaf,
+        # and stubs with the same provider
+        leaf_asns, stub_asns = (20, 21, 22, 23), (24, 25, 26)
+        as_graph_info = ASGraphInfo(
+            customer_provider_links=as_graph_info_000.customer_provider_links.union(
+                [
+                    CPLink(provider_asn=provider_asn, customer_asn=asn)
+                    for provider_asn in (8, 9)
+                    for asn in leaf_asns
+                ],
+                [CPLink(provider_asn=5, customer_asn=asn) for asn in stub_asns],
+            ),
+            peer_links=as_graph_info_000.peer_links.union(
+                [PeerLink(10, asn) for asn in leaf_asns]
+            ),
+        )
+        conf = EngineTestConfig(
+            name=f"compress_leaves_{ScenarioCls.__name__}",
+            desc="Leaves that get the same anns",
+            scenario_config=ScenarioConfig(
+                ScenarioCls=ScenarioCls,
+                BasePolicyCls=BGP,
+                override_attacker_asns=frozenset({ASNs.ATTACKER.value}),
+                override_victim_asns=frozenset({ASNs.VICTIM.value}),
+                hardcoded_asn_cls_dict=frozendict({9: ROV, 22: ROV}),
+            ),
+            as_graph_info=as_graph_info,
+        )
+
+        outcomes = list()
+        for engine_kwargs in (
+            {},
+            {"compress_leaves": True},
+            {"compress_leaves": True, "fold_stubs": True},
+        ):
+            engine = _run_engine(conf, partial(SimulationEngine, **engine_kwargs))
+            scenario = ScenarioCls(scenario_config=conf.scenario_config, engine=engine)
+            analyzer = ASGraphAnalyzer(
+                engine=engine, scenario=scenario, control_plane_tracking=True
+            )
+            outcomes.append(analyzer.analyze())
+
+            # Members are hidden from all of their neighbors
+            as_graph = engine.as_graph
+            member_representative_asns = dict(
+                as_graph.compressed_leaf_representative_asns
+            )
+            if engine_kwargs.get("fold_stubs"):
+                assert member_representative_asns == {21: 20, 23: 20}
+            elif engine_kwargs:
+                assert member_representative_asns == {21: 20, 23: 20, 25: 24, 26: 24}
+            for member_asn in member_representative_asns:
+                member = as_graph.as_dict[member_asn]
+                assert not member.policy.local_rib
+                for neighbor in member.neighbors:
+                    assert member_asn not in [
+                        x.asn for x in neighbor.peers + neighbor.customers
+                    ]
+            as_graph.unfold_stubs()
+            as_graph.uncompress_leaves()
+            assert not as_graph.compressed_leaf_representative_asns
+            for member_asn in member_representative_asns:
+                member = as_graph.as_dict[member_asn]
+                for neighbor in member.neighbors:
+                    assert member_asn in [
+                        x.asn for x in neighbor.peers + neighbor.customers
+                    ]
+        assert outcomes[0] == outcomes[1] == outcomes[2]
+
+    @pytest.mark.parametrize("threaded", [False, True])
+    def test_skips_idle_ases(self, threaded, monkeypatch):
+        """Tests that ASes with nothing to process or send are never visited"""
+
+        # A part of the graph that the victim's anns never reach
+        idle_asns = frozenset({100, 101, 102})
+        as_graph_info = ASGraphInfo(
+            customer_provider_links=as_graph_info_000.customer_provider_links.union(
+                [CPLink(provider_asn=100, customer_asn=101)]
+            ),
+            peer_links=as_graph_info_000.peer_links.union([PeerLink(101, 102)]),
+        )
+        conf = EngineTestConfig(
+            name=f"skips_idle_ases_{threaded}",
+            desc="ASes that never get anns",
+            scenario_config=ScenarioConfig(
+                ScenarioCls=ValidPrefix,
+                BasePolicyCls=BGP,
+                override_victim_asns=frozenset({ASNs.VICTIM.value}),
+            ),
+            as_graph_info=as_graph_info,
+        )
+
+        visited: dict[str, set[int]] = dict()
+
+        def visit(name: str, func: Callable[..., None]) -> Callable[..., None]:
+            def wrapper(self, *args, **kwargs):
+                visited.setdefault(name, set()).add(self.as_.asn)
+                return func(self, *args, **kwargs)
+
+            return wrapper
+
+        for name in (
+            "process_incoming_anns",
+            "propagate_to_providers",
+            "propagate_to_peers",
+            "propagate_to_customers",
+        ):
+            monkeypatch.setattr(BGP, name, visit(name, getattr(BGP, name)))
+
+        SimulationEngineCls: Callable[..., BaseSimulationEngine] = SimulationEngine
+        if threaded:
+            SimulationEngineCls = partial(
+                ThreadedSimulationEngine,
+                max_workers=4,
+                min_chunk_size=1,
+                serial_with_gil=False,
+            )
+        as_graph = conf.ASGraphCls(as_graph_info=conf.as_graph_info)
+        engine = SimulationEngineCls(as_graph)
+        scenario = ValidPrefix(scenario_config=conf.scenario_config, engine=engine)
+        scenario.setup_engine(engine)
+        # The engine mustn't even check whether idle ASes have anns
+        for asn in idle_asns:
+            policy = as_graph.as_dict[asn].policy
+            policy.recv_q = policy.local_rib = _Untouchable()
+        engine.run(propagation_round=0, scenario=scenario)
+
+        reached_asns = {
+            x.asn for x in as_graph if x.asn not in idle_asns and x.policy.local_rib
+        }
+        assert ASNs.VICTIM.value in reached_asns
+        # Only ASes that received anns are processed, and only ASes with anns
+        # send them
+        assert visited["process_incoming_anns"] == reached_asns - {ASNs.VICTIM.value}
+        for name, asns in visited.items():
+            assert asns <= reached_asns, name
+
+    def test_overriding_policy_opts_out(self):
+        """Tests that overriding BGP's methods opts out of the skips they allow"""
+
+        assert not _LoggingBGP.skip_when_idle
+        assert not _LoggingBGP.prefilter_loops
+        assert _IdleSafeLoggingBGP.skip_when_idle
+        assert not _IdleSafeLoggingBGP.prefilter_loops
+
+        # Opted out ASes are processed in every step, even with an empty recv_q
+        for PolicyCls in (_LoggingBGP, _IdleSafeLoggingBGP):
+            as_graph = ASGraph(as_graph_info_000, BasePolicyCls=PolicyCls)
+            engine = SimulationEngine(as_graph)
+            scenario_config = ScenarioConfig(
+                ScenarioCls=ValidPrefix,
+                BasePolicyCls=PolicyCls,
+                override_victim_asns=frozenset({ASNs.VICTIM.value}),
+            )
+            scenario = ValidPrefix(scenario_config=scenario_config, engine=engine)
+            scenario.setup_engine(engine)
+            PolicyCls.processed.clear()
+            engine.run(propagation_round=0, scenario=scenario)
+            peers_processed = {
+                asn for asn, rel in PolicyCls.processed if rel == Relationships.PEERS
+            }
+            all_asns = {x.asn for x in as_graph}
+            if PolicyCls.skip_when_idle:
+                assert peers_processed < all_asns
+            else:
+                assert peers_processed == all_asns
+
+    def test_setup_reuses_policies(self):
+        """Tests that a second setup reuses policies and clears their RIBs"""
+
+        conf = engine_test_configs[0]
+        engine = _run_engine(conf, SimulationEngine)
+        policies = [as_obj.policy for as_obj in engine.as_graph]
+        scenario = conf.scenario_config.ScenarioCls(
+            scenario_config=conf.scenario_config, engine=engine
+        )
+        scenario.setup_engine(engine)
+        for as_obj, policy in zip(engine.as_graph, policies, strict=True):
+            assert as_obj.policy is policy
+            seeds = [x for x in scenario.announcements if x.seed_asn == as_obj.asn]
+            assert list(policy.local_rib.values()) == seeds
+            assert not policy.recv_q
+
+    @pytest.mark.parametrize(
+        "engine_kwargs",
+        [{}, {"fold_stubs": True, "compress_leaves": True}],
+        ids=["default", "fold_stubs_compress_leaves"],
+    )
+    @pytest.mark.parametrize("conf", engine_test_configs, ids=lambda x: x.name)
+    def test_snapshot_restore(self, conf, engine_kwargs):
+        """Tests that restoring a snapshot reproduces the engine's RIBs
+
+        The snapshot is restored after the engine is set up for a different
+        scenario, with different policies, folded stubs, and compressed leaves
+        """
+
+        SimulationEngineCls = partial(SimulationEngine, **engine_kwargs)
+        expected = _run_engine(conf, SimulationEngineCls)
+        expected_outcomes = self._analyze(conf, expected)
+        expected_rost_repository = RoSTFull.rost_trusted_repository.copy()
+
+        snapshot = expected.snapshot()
+        engine = _run_engine(conf, SimulationEngineCls)
+        other_scenario_config = ScenarioConfig(
+            ScenarioCls=ValidPrefix,
+            BasePolicyCls=BGP,
+            override_attacker_asns=frozenset(),
+            override_victim_asns=conf.scenario_config.override_victim_asns,
+            override_adopting_asns=frozenset(),
+        )
+        # Restore more than once to make sure that the snapshot is unchanged
+        for _ in range(2):
+            ValidPrefix(
+                scenario_config=other_scenario_config, engine=engine
+            ).setup_engine(engine)
+            # As other scenarios with RoST would
+            RoSTFull.rost_trusted_repository.clear()
+            engine.restore(snapshot)
+            assert engine == expected
+            assert engine.ready_to_run_round == expected.ready_to_run_round
+            assert self._analyze(conf, engine) == expected_outcomes
+            if any(isinstance(x.policy, RoSTFull) for x in engine.as_graph):
+                assert (
+                    RoSTFull.rost_trusted_repository._withdrawal_as_path_root
+                    == expected_rost_repository._withdrawal_as_path_root
+                )
+
+    def _analyze(
+        self, conf: EngineTestConfig, engine: BaseSimulationEngine
+    ) -> dict[int, dict[int, int]]:
+        """Returns the outcomes of the engine test config's scenario"""
+
+        scenario = conf.scenario_config.ScenarioCls(
+            scenario_config=conf.scenario_config, engine=engine
+        )
+        return ASGraphAnalyzer(
+            engine=engine, scenario=scenario, control_plane_tracking=True
+        ).analyze()
@@ -0,0 +1,71 @@
+"""Times the graph build, engine and analysis on synthetic graphs of each size
+
+Unlike speed_test.py, nothing is downloaded, so the results are reproducible
+(and can be run offline). The simulations' graphs are cached in output_dir
+(keyed by topology), so on reruns the simulate time doesn't include building
+them
+"""
+
+import sys
+import time
+from pathlib import Path
+
+from frozendict import frozendict
+
+from bgpy.as_graphs import ASGraph, SyntheticASGraphConstructor, SyntheticTopology
+from bgpy.simulation_engine import ROV
+from bgpy.simulation_framework import (
+    ScenarioConfig,
+    Simulation,
+    SubprefixHijack,
+)
+
+OUTPUT_DIR = Path("~/Desktop/synthetic_scaling_benchmark").expanduser()
+
+
+def main(
+    sizes: tuple[int, ...] = (1_000, 10_000, 100_000),
+    output_dir: Path = OUTPUT_DIR,
+) -> None:
+    """Prints the times for each size"""
+
+    cache_dir = output_dir / "graphs"
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    for num_ases in sizes:
+        topology = SyntheticTopology(num_ases=num_ases)
+        start = time.perf_counter()
+        as_graph_info = topology.get_as_graph_info()
+        generated = time.perf_counter()
+        ASGraph(as_graph_info)
+        built = time.perf_counter()
+
+        sim = Simulation(
+            percent_adoptions=(0.1, 0.5),
+            scenario_configs=(
+                ScenarioConfig(ScenarioCls=SubprefixHijack, AdoptPolicyCls=ROV),
+            ),
+            output_dir=output_dir / str(num_ases),
+            num_trials=2,
+            parse_cpus=1,
+            ASGraphConstructorCls=SyntheticASGraphConstructor,
+            as_graph_constructor_kwargs=frozendict(
+                {
+                    "as_graph_collector_kwargs": frozendict(
+                        {"cache_dir": cache_dir, "topology": topology}
+                    ),
+                }
+            ),
+        )
+        sim.run(GraphFactoryCls=None)
+        simulated = time.perf_counter()
+        print(
+            f"{num_ases} ASes: "
+            f"generate {generated - start:.2f}s, "
+            f"build {built - generated:.2f}s, "
+            # On the first run, includes building the graph for the binary cache
+            f"simulate {simulated - built:.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    main(tuple(int(x) for x in sys.argv[1:]) or (1_000, 10_000, 100_000))